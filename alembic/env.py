@@ -4,13 +4,17 @@ from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 
 from alembic import context
-from app.core.db import Base
+from app.core.config import settings
+from app.core.db import Base, import_models
 
+import_models()
 target_metadata = Base.metadata
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
+# 접속 정보는 앱과 같은 곳(Settings / .env / 환경변수)에서. ini 의 % 는 보간 문자라 이스케이프
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -0,0 +1,41 @@
+"""Add image_assets table and posting_images.thumbnail_url
+
+Revision ID: 3f2a9c1d7b10
+Revises: cfbabb655873
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c1d7b10'
+down_revision: Union[str, Sequence[str], None] = 'cfbabb655873'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('image_assets',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('url', sa.String(length=500), nullable=False),
+    sa.Column('blob_name', sa.String(length=500), nullable=False),
+    sa.Column('content_type', sa.String(length=100), nullable=True),
+    sa.Column('variants', sa.JSON(), nullable=False),
+    sa.Column('thumbnail_url', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_image_assets_url'), 'image_assets', ['url'], unique=True)
+    op.add_column('posting_images', sa.Column('thumbnail_url', sa.String(length=500), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('posting_images', 'thumbnail_url')
+    op.drop_index(op.f('ix_image_assets_url'), table_name='image_assets')
+    op.drop_table('image_assets')
@@ -0,0 +1,30 @@
+"""Add image_assets.sha256 for content-addressed uploads
+
+Revision ID: 8d41e6b2a5c3
+Revises: 3f2a9c1d7b10
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41e6b2a5c3'
+down_revision: Union[str, Sequence[str], None] = '3f2a9c1d7b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('image_assets', sa.Column('sha256', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_image_assets_sha256'), 'image_assets', ['sha256'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_image_assets_sha256'), table_name='image_assets')
+    op.drop_column('image_assets', 'sha256')
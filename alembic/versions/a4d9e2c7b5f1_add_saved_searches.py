@@ -0,0 +1,40 @@
+"""Add saved_searches table
+
+Revision ID: a4d9e2c7b5f1
+Revises: f2b8c4d1e7a3
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d9e2c7b5f1'
+down_revision: Union[str, Sequence[str], None] = 'f2b8c4d1e7a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'saved_searches',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('keyword', sa.String(length=50), nullable=True),
+        sa.Column('category', sa.String(length=50), nullable=True),
+        sa.Column('max_price', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.userId'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_saved_searches_user_id'), 'saved_searches', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_saved_searches_user_id'), table_name='saved_searches')
+    op.drop_table('saved_searches')
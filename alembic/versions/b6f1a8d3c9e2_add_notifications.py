@@ -0,0 +1,44 @@
+"""Add notifications table and favorites.posting_id index
+
+Revision ID: b6f1a8d3c9e2
+Revises: a4d9e2c7b5f1
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6f1a8d3c9e2'
+down_revision: Union[str, Sequence[str], None] = 'a4d9e2c7b5f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'notifications',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('type', sa.String(length=30), nullable=False),
+        sa.Column('posting_id', sa.Integer(), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('is_read', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.userId'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['posting_id'], ['postings.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_notifications_user_id_id', 'notifications', ['user_id', 'id'], unique=False)
+    op.create_index(op.f('ix_favorites_posting_id'), 'favorites', ['posting_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_favorites_posting_id'), table_name='favorites')
+    op.drop_index('ix_notifications_user_id_id', table_name='notifications')
+    op.drop_table('notifications')
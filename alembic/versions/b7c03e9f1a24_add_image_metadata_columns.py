@@ -0,0 +1,37 @@
+"""Add image metadata (size, dominant color, blurhash) columns
+
+Revision ID: b7c03e9f1a24
+Revises: 8d41e6b2a5c3
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c03e9f1a24'
+down_revision: Union[str, Sequence[str], None] = '8d41e6b2a5c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('image_assets', 'posting_images')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.add_column(table, sa.Column('width', sa.Integer(), nullable=True))
+        op.add_column(table, sa.Column('height', sa.Integer(), nullable=True))
+        op.add_column(table, sa.Column('byte_size', sa.Integer(), nullable=True))
+        op.add_column(table, sa.Column('dominant_color', sa.String(length=7), nullable=True))
+        op.add_column(table, sa.Column('blurhash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        for col in ('blurhash', 'dominant_color', 'byte_size', 'height', 'width'):
+            op.drop_column(table, col)
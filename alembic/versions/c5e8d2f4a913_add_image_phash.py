@@ -0,0 +1,30 @@
+"""Add perceptual hash (dHash) column to image tables
+
+Revision ID: c5e8d2f4a913
+Revises: b7c03e9f1a24
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8d2f4a913'
+down_revision: Union[str, Sequence[str], None] = 'b7c03e9f1a24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('image_assets', sa.Column('phash', sa.String(length=16), nullable=True))
+    op.add_column('posting_images', sa.Column('phash', sa.String(length=16), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('posting_images', 'phash')
+    op.drop_column('image_assets', 'phash')
@@ -0,0 +1,30 @@
+"""Add image embedding columns for visual search
+
+Revision ID: e1a7f3b9c2d6
+Revises: c5e8d2f4a913
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a7f3b9c2d6'
+down_revision: Union[str, Sequence[str], None] = 'c5e8d2f4a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('image_assets', sa.Column('embedding', sa.LargeBinary(), nullable=True))
+    op.add_column('image_assets', sa.Column('embedding_version', sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('image_assets', 'embedding_version')
+    op.drop_column('image_assets', 'embedding')
@@ -0,0 +1,39 @@
+"""Add pg_trgm GIN index on postings.title for fuzzy search
+
+Revision ID: f2b8c4d1e7a3
+Revises: e1a7f3b9c2d6
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8c4d1e7a3'
+down_revision: Union[str, Sequence[str], None] = 'e1a7f3b9c2d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # PostgreSQL 전용 (SQLite 는 앱 메모리 trigram 색인 사용)
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_postings_title_trgm',
+        'postings',
+        ['title'],
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_postings_title_trgm', table_name='postings')
@@ -1,16 +1,18 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError, ExpiredSignatureError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.core.db import get_db
+from app.core.db import get_db, get_async_db
 from app.models.user import User
 
 from typing import Optional
 
-print("### IMPORT auth.py OK")
-
 bearer = HTTPBearer(auto_error=False)
 
 
@@ -26,14 +28,11 @@ def _user_pk_col():
         raise AttributeError("User 모델에 PK 컬럼(user_id, userId, id)이 없습니다.")
 
 
-def get_current_user_optional(
-    creds: Optional[HTTPAuthorizationCredentials] = Depends(bearer),
-    db: Session = Depends(get_db),
-) -> Optional[User]:
+def _optional_sub(creds: Optional[HTTPAuthorizationCredentials]) -> Optional[int]:
     """
     Authorization 헤더가 없으면 None 반환.
     Authorization 헤더가 있지만 invalid/expired 하면 401 발생.
-    유효하면 User 객체 반환.
+    유효하면 user_id 반환.
     """
 
     # 1) 헤더 자체가 없으면 완전 anonymous
@@ -57,21 +56,11 @@ def get_current_user_optional(
         raise HTTPException(status_code=401, detail="TOKEN_EXPIRED")
     except JWTError:
         raise HTTPException(status_code=401, detail="INVALID_TOKEN")
+    return int(sub)
 
-    # 4) DB 조회
-    user = db.query(User).filter(User.user_id == int(sub)).first()
 
-    if not user:
-        raise HTTPException(status_code=401, detail="USER_NOT_FOUND")
-
-    return user
-
-
-def get_current_user(
-    creds: HTTPAuthorizationCredentials = Depends(bearer),
-    db: Session = Depends(get_db),
-) -> User:
-    """JWT 토큰 인증 후 현재 사용자 객체 반환"""
+def _required_sub(creds: Optional[HTTPAuthorizationCredentials]) -> int:
+    """JWT 토큰 검증 후 user_id 반환 (없거나 잘못되면 401)"""
     if not creds or (creds.scheme or "").lower() != "bearer":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -100,15 +89,94 @@ def get_current_user(
             detail="invalid_token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return int(sub)
+
+
+def _user_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="invalid_token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def get_current_user_optional(
+    creds: Optional[HTTPAuthorizationCredentials] = Depends(bearer),
+    db: Session = Depends(get_db),
+) -> Optional[User]:
+    """토큰 없으면 None, 있으면 검증 후 User (invalid/expired 면 401)"""
+    user_id = _optional_sub(creds)
+    if user_id is None:
+        return None
+
+    # 4) DB 조회
+    user = db.query(User).filter(User.user_id == user_id).first()
+
+    if not user:
+        raise HTTPException(status_code=401, detail="USER_NOT_FOUND")
+
+    return user
+
+
+def get_current_user(
+    creds: HTTPAuthorizationCredentials = Depends(bearer),
+    db: Session = Depends(get_db),
+) -> User:
+    """JWT 토큰 인증 후 현재 사용자 객체 반환"""
+    user_id = _required_sub(creds)
 
     # ✅ user_id 기준으로 사용자 조회
     pk_col = _user_pk_col()
-    user = db.query(User).filter(pk_col == int(sub)).first()
+    user = db.query(User).filter(pk_col == user_id).first()
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="invalid_token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _user_not_found()
 
     return user
+
+
+# ---------- async 라우터용 (get_async_db 세션 공유) ----------
+async def get_current_user_optional_async(
+    creds: Optional[HTTPAuthorizationCredentials] = Depends(bearer),
+    db: AsyncSession = Depends(get_async_db),
+) -> Optional[User]:
+    user_id = _optional_sub(creds)
+    if user_id is None:
+        return None
+    user = await db.scalar(select(User).where(User.user_id == user_id))
+    if not user:
+        raise HTTPException(status_code=401, detail="USER_NOT_FOUND")
+    return user
+
+
+async def get_current_user_async(
+    creds: HTTPAuthorizationCredentials = Depends(bearer),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    user_id = _required_sub(creds)
+    user = await db.scalar(select(User).where(_user_pk_col() == user_id))
+    if not user:
+        raise _user_not_found()
+    return user
+
+
+# ---------- 운영용 엔드포인트 (사용자 JWT 와 별개인 고정 토큰) ----------
+def _token_matches(given: Optional[str], expected: Optional[str]) -> bool:
+    return bool(expected) and bool(given) and hmac.compare_digest(given, expected)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    # ADMIN_TOKEN 을 안 정했으면 관리자 API 는 아예 닫힘
+    if not _token_matches(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="forbidden")
+
+
+def require_metrics_access(
+    x_admin_token: Optional[str] = Header(None),
+    creds: Optional[HTTPAuthorizationCredentials] = Depends(bearer),
+) -> None:
+    """/metrics, /api/health/saturation: X-Admin-Token 또는 Authorization: Bearer <METRICS_TOKEN> (Prometheus bearer_token)"""
+    if _token_matches(x_admin_token, settings.ADMIN_TOKEN):
+        return
+    if creds is not None and _token_matches(creds.credentials, settings.METRICS_TOKEN):
+        return
+    raise HTTPException(status_code=403, detail="forbidden")
@@ -0,0 +1,158 @@
+# app/core/bulkhead.py
+"""
+라우터 묶음별 동시 처리 한도 (bulkhead).
+
+경로 prefix 로 요청을 묶음(chat / images / postings / default)에 나누고, 묶음마다 anyio CapacityLimiter 로
+동시에 처리 중인 요청 수를 제한함. 자리가 BULKHEAD_MAX_WAIT_SECONDS 안에 안 나면 503.
+한도는 DB 커넥션 풀 크기(DB_POOL_SIZE + DB_MAX_OVERFLOW)를 BULKHEAD_SHARES 비율로 나눈 값이고
+요청 하나는 엔진마다 커넥션을 많아야 하나 쓰므로, 한도 합 ≤ 풀 크기면 묶음끼리 커넥션을 뺏을 수 없음
+(앱 시작 때 check_pool_partition 으로 확인).
+웹소켓과 /api/health 는 대상 아님.
+"""
+import json
+import time
+from typing import Dict, Optional
+
+import anyio
+import anyio.to_thread
+
+from app.core.config import settings
+
+# 앞에서부터 처음 맞는 prefix 의 묶음 (더 구체적인 경로를 먼저)
+ROUTE_GROUPS = (
+    ("/api/health", None),
+    ("/api/postings/search-by-image", "images"),
+    ("/api/image", "images"),
+    ("/api/predict", "images"),
+    ("/api/postings", "postings"),
+    ("/api/chat", "chat"),
+)
+
+
+def group_for(path: str) -> Optional[str]:
+    for prefix, group in ROUTE_GROUPS:
+        if path == prefix or path.startswith(prefix + "/"):
+            return group
+    return "default"
+
+
+class Bulkhead:
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        # 이벤트 루프 안에서 처음 쓸 때 생성 (import 시점에는 루프가 없음)
+        self._limiter: Optional[anyio.CapacityLimiter] = None
+
+        self.admitted = 0
+        self.rejected = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+
+    @property
+    def limiter(self) -> anyio.CapacityLimiter:
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(self.limit)
+        return self._limiter
+
+    def stats(self) -> dict:
+        limiter = self._limiter
+        in_use = limiter.borrowed_tokens if limiter else 0
+        waiting = limiter.statistics().tasks_waiting if limiter else 0
+        return {
+            "limit": self.limit,
+            "inUse": in_use,
+            "waiting": waiting,
+            "saturation": round(in_use / self.limit, 3) if self.limit else 0.0,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avgWaitMs": round(self.wait_ms_total / self.admitted, 3) if self.admitted else 0.0,
+            "maxWaitMs": round(self.wait_ms_max, 3),
+        }
+
+
+def pool_capacity() -> int:
+    return settings.DB_POOL_SIZE + max(settings.DB_MAX_OVERFLOW, 0)
+
+
+def bulkhead_limits() -> Dict[str, int]:
+    capacity = pool_capacity()
+    return {name: max(1, int(share * capacity)) for name, share in settings.BULKHEAD_SHARES.items()}
+
+
+def check_pool_partition() -> None:
+    """묶음 한도 합이 커넥션 풀보다 크면 한 묶음이 다른 묶음 커넥션까지 쓸 수 있음 → 시작 실패"""
+    capacity = pool_capacity()
+    total = sum(b.limit for b in bulkheads.values())
+    if total > capacity:
+        raise RuntimeError(
+            f"bulkhead limits {dict((n, b.limit) for n, b in bulkheads.items())} sum to {total}, "
+            f"more than the DB pool capacity {capacity} (DB_POOL_SIZE + DB_MAX_OVERFLOW); raise the pool size or lower BULKHEAD_SHARES"
+        )
+
+
+bulkheads: Dict[str, Bulkhead] = {name: Bulkhead(name, limit) for name, limit in bulkhead_limits().items()}
+
+
+def configure_threadpool() -> None:
+    """sync 라우터/run_in_threadpool 이 쓰는 anyio 기본 스레드 수 (앱 시작 시 호출)"""
+    anyio.to_thread.current_default_thread_limiter().total = settings.THREADPOOL_SIZE
+
+
+def threadpool_stats() -> dict:
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    return {
+        "limit": limiter.total,
+        "inUse": limiter.borrowed_tokens,
+        "waiting": limiter.statistics().tasks_waiting,
+    }
+
+
+async def _reject(send) -> None:
+    body = json.dumps({"detail": "SERVICE_BUSY"}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", b"1"),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class BulkheadMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        group = group_for(scope["path"])
+        bulkhead = bulkheads.get(group) if group else None
+        if bulkhead is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = bulkhead.limiter
+        # 같은 task 에서 여러 요청을 처리하는 서버도 있으므로 요청마다 따로 빌림
+        token = object()
+        started = time.perf_counter()
+        acquired = False
+        with anyio.move_on_after(settings.BULKHEAD_MAX_WAIT_SECONDS):
+            await limiter.acquire_on_behalf_of(token)
+            acquired = True
+        if not acquired:
+            bulkhead.rejected += 1
+            await _reject(send)
+            return
+
+        waited = (time.perf_counter() - started) * 1000
+        bulkhead.admitted += 1
+        bulkhead.wait_ms_total += waited
+        bulkhead.wait_ms_max = max(bulkhead.wait_ms_max, waited)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release_on_behalf_of(token)
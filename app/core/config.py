@@ -1,4 +1,5 @@
 # app/core/config.py
+from typing import Dict, List, Optional
 
 try:
     from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -8,6 +9,61 @@ except ImportError:
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./app.db"
+    # async 라우터용 URL (비우면 DATABASE_URL 에서 드라이버만 aiosqlite/asyncpg 로 바꿔 씀)
+    DATABASE_ASYNC_URL: Optional[str] = None
+    # 읽기 전용 복제본 URL 목록 (JSON 배열, 비우면 전부 DATABASE_URL 로). GET/HEAD 요청만 복제본에서 읽음
+    DATABASE_REPLICA_URLS: List[str] = []
+    # 쓰기 요청 뒤 이 시간(초) 동안은 그 클라이언트의 GET 도 primary 에서 읽음 (복제 지연 동안 자기 글이 안 보이는 것 방지)
+    DB_REPLICA_STICKY_SECONDS: int = 10
+    # 앱 시작 때 Base.metadata.create_all 실행 여부 (비우면 SQLite 파일일 때만 = 로컬 개발용, 운영 스키마는 alembic)
+    DB_CREATE_ALL: Optional[bool] = None
+    # 앱 시작 때 DB 접속 정보/버전, 라우트 목록을 로그로 남김 (python -m app.core.diagnostics 로도 확인 가능)
+    STARTUP_DIAGNOSTICS: bool = False
+
+    # 커넥션 풀 (sync / async 엔진 각각에 적용): 기본 크기, 초과 허용 수, 빈 커넥션 대기(초), 재연결 주기(초), 사용 전 ping
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # PostgreSQL 쿼리 하나 최대 실행 시간(ms, 0 이면 제한 없음)
+    DB_STATEMENT_TIMEOUT_MS: int = 15000
+
+    # SQLite 파일 DB 연결마다 거는 PRAGMA: 저널 모드, 동기화 수준, mmap 크기(MB), 페이지 캐시(MB), 잠금 대기(ms)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE_MB: int = 256
+    SQLITE_CACHE_SIZE_MB: int = 64
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    # SQLite 일 때 채팅 웹소켓/가격 인하 알림/직접 업로드 마무리 쓰기를 전용 스레드 하나에서 순서대로 처리
+    # (이 경로들끼리는 잠금 경쟁 없음. REST AsyncSession 쓰기는 해당 없음 → busy_timeout 으로 대기)
+    SQLITE_SINGLE_WRITER: bool = True
+
+    # 라우터 묶음별 DB 커넥션 몫 (app/core/bulkhead.py). 묶음 동시 처리 한도 = 몫 × (DB_POOL_SIZE + DB_MAX_OVERFLOW), 최소 1.
+    # 한도 합이 풀 크기를 넘으면 시작 실패 → 한 묶음이 몰려도 다른 묶음 커넥션은 남음 (합 1 미만 나머지는 웹소켓/주기 작업 몫)
+    BULKHEAD_SHARES: Dict[str, float] = {"postings": 0.4, "chat": 0.25, "images": 0.1, "default": 0.15}
+    # 자리 기다리는 최대 시간(초, 넘으면 503)
+    BULKHEAD_MAX_WAIT_SECONDS: float = 2.0
+    # sync 라우터/run_in_threadpool 용 스레드 수
+    THREADPOOL_SIZE: int = 40
+
+    # 라우트별 응답 시간/상태 코드/DB 쿼리 수 수집 (/metrics) / 응답 시간 히스토그램 경계(초)
+    METRICS_ENABLED: bool = True
+    METRICS_LATENCY_BUCKETS: List[float] = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+    # 한 요청 안에서 같은 모양 쿼리가 이 횟수 이상이면 N+1 의심 경고 로그 (0 이면 끔, 개발 환경에서 5 정도. METRICS_ENABLED 필요)
+    QUERY_REPEAT_WARN_THRESHOLD: int = 0
+    # 이 시간(ms) 이상 걸린 쿼리 기록 (0 이면 끔) / 실행 계획도 남길지 / 같은 모양 쿼리는 이 간격(초)에 한 번만 로그+EXPLAIN
+    SLOW_QUERY_MS: int = 500
+    SLOW_QUERY_EXPLAIN: bool = True
+    SLOW_QUERY_SAMPLE_SECONDS: float = 60.0
+    # 느린 쿼리 JSON 로그 파일 (비우면 파일에는 안 씀) / 파일 하나 최대 크기 / 남길 이전 파일 수
+    SLOW_QUERY_LOG_PATH: str = "./logs/slow_queries.jsonl"
+    SLOW_QUERY_LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    SLOW_QUERY_LOG_BACKUPS: int = 5
+    # /api/admin/* 호출 시 X-Admin-Token 헤더로 보낼 값 (비우면 관리자 API 전부 403)
+    ADMIN_TOKEN: Optional[str] = None
+    # /metrics, /api/health/saturation 수집용 토큰 (Authorization: Bearer). 비우면 X-Admin-Token 으로만 열림
+    METRICS_TOKEN: Optional[str] = None
 
     JWT_SECRET: str = "change-this-secret"
     JWT_ACCESS_SECRET: str = "change-this-secret"
@@ -26,6 +82,88 @@ class Settings(BaseSettings):
     # ✅ 오타 수정 + 기본값 부여
     AZURE_STORAGE_CONNECTION_STRING: str = ""
     AZURE_CONTAINER_NAME: str = ""
+    AZURE_POOL_SIZE: int = 20
+
+    # 이미지 저장소: "azure" | "local" (비워두면 Azure 접속 정보 유무로 자동 선택)
+    STORAGE_BACKEND: str = ""
+    LOCAL_STORAGE_DIR: str = "./media"
+    LOCAL_STORAGE_URL_PREFIX: str = "/media"
+    PUBLIC_BASE_URL: str = "http://localhost:8000"
+
+    # 이미지 업로드: 최대 크기 / 스트리밍 chunk 크기 (bytes)
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    # 직접 업로드(SAS) URL 유효 시간 (초)
+    DIRECT_UPLOAD_EXPIRE_SECONDS: int = 600
+    # 프로세스 내 sha256 → url 캐시 개수
+    UPLOAD_HASH_INDEX_SIZE: int = 10000
+
+    # 업로드 시 만들 WebP 파생본 가로폭 (가장 작은 것이 목록 썸네일)
+    IMAGE_DERIVATIVE_WIDTHS: list[int] = [200, 600, 1200]
+    # 이미지 처리 프로세스 수 (0 이면 CPU 코어 수)
+    IMAGE_WORKERS: int = 0
+
+    # /api/predict: 모델 러너 ("sample" 또는 "module:Class"), 마이크로 배치 크기/대기 시간
+    PREDICT_RUNNER: str = "sample"
+    PREDICT_MAX_BATCH: int = 16
+    PREDICT_MAX_WAIT_MS: float = 10.0
+    # 예측 결과 캐시 (메모리 LRU 개수, 비워두지 않으면 sqlite 파일로도 저장)
+    PREDICT_CACHE_SIZE: int = 2048
+    PREDICT_CACHE_PATH: str = ""
+
+    # 가격대 추정: 판매완료 글 가격 분위수, 갱신 주기(초), N번마다 전체 재적재, 최소 표본 수
+    PRICE_QUANTILE_LOW: float = 0.25
+    PRICE_QUANTILE_HIGH: float = 0.75
+    PRICE_REFRESH_SECONDS: int = 300
+    PRICE_FULL_REFRESH_EVERY: int = 12
+    PRICE_MIN_SAMPLES: int = 3
+
+    # 중복 게시물 탐지: "off" | "flag" (응답에 duplicateOf 표시) | "reject" (409)
+    DUPLICATE_POLICY: str = "flag"
+    # dHash 해밍 거리 이하이면 같은 사진으로 봄
+    DUPLICATE_MAX_DISTANCE: int = 4
+    DUPLICATE_REBUILD_SECONDS: int = 3600
+
+    # 비슷한 사진 검색: 임베딩 추출기 ("color-layout" 또는 "module:Class"), 벡터 파일 위치, 재구축 주기(초)
+    EMBEDDING_EXTRACTOR: str = "color-layout"
+    VISUAL_INDEX_DIR: str = "./data/visual_index"
+    VISUAL_REBUILD_SECONDS: int = 1800
+    # 벡터가 이 개수 이상이면 IVF(클러스터 분할)로 일부 클러스터만 탐색
+    VISUAL_IVF_MIN_ROWS: int = 50000
+    VISUAL_IVF_NPROBE: int = 8
+    # 재구축 때마다 임베딩 없는 기존 이미지를 이 개수만큼 채움
+    VISUAL_BACKFILL_BATCH: int = 200
+
+    # 비슷한 게시물(TF-IDF): 변경 반영 주기(초), 이웃 캐시 개수, 카테고리 delta 가 이보다 크면 행렬 재생성
+    RELATED_REFRESH_SECONDS: int = 300
+    RELATED_CACHE_SIZE: int = 10000
+    RELATED_DELTA_LIMIT: int = 200
+
+    # 검색 자동완성: 재구축 주기(초), 노드당 후보 수, 최소 게시물 수, trie 메모리 한도(MB)
+    SUGGEST_REBUILD_SECONDS: int = 600
+    SUGGEST_TOP_K: int = 10
+    SUGGEST_MIN_COUNT: int = 1
+    SUGGEST_MEMORY_MB: int = 32
+
+    # 오타 허용 검색: keyword 결과가 없을 때 제목 trigram 유사도 하한 / 최대 결과 수 / 메모리 색인 갱신 주기(초)
+    FUZZY_MIN_SIMILARITY: float = 0.5
+    FUZZY_MAX_RESULTS: int = 200
+    FUZZY_REFRESH_SECONDS: int = 300
+
+    # 저장 검색: 사용자당 최대 개수 / 매칭 오토마톤 전체 재구축 주기(초, 삭제된 노드 정리용. 다른 워커의 추가/삭제는 알림 때 DB 로 확인)
+    SAVED_SEARCH_MAX_PER_USER: int = 20
+    SAVED_SEARCH_REBUILD_SECONDS: int = 3600
+
+    # 찜 가격 인하 알림: 한 번에 처리할 찜 사용자 수 / 초당 최대 알림 수
+    PRICE_DROP_BATCH_SIZE: int = 500
+    PRICE_DROP_RATE_PER_SEC: float = 2000.0
+
+    # 카테고리별 목록 캐시: (카테고리, 정렬)마다 들고 있을 상위 게시물 수 / 개수 재집계·캐시 초기화 주기(초)
+    FEED_CACHE_DEPTH: int = 200
+    FEED_REBUILD_SECONDS: int = 600
+    # 목록 캐시는 워커 프로세스마다 따로라 다른 워커의 글 추가/수정은 rebuild 전까지 안 보임.
+    # 워커를 여럿 띄우면 이 주기(초)마다 DB 의 게시물 수/최근 수정 시각을 확인해서 바뀌었으면 rebuild (0 = 확인 안 함, 워커 1개)
+    FEED_CACHE_SYNC_SECONDS: float = 0
 
     if SettingsConfigDict:
         model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
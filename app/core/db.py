@@ -1,15 +1,238 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import random
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.sql.dml import UpdateBase
+from starlette.requests import HTTPConnection
 from app.core.config import settings
+from app.core.query_stats import instrument_engine
+
+def pool_options(url: str) -> dict:
+    """Settings 의 풀 크기/대기/재연결/ping (메모리 SQLite 는 커넥션 하나짜리 풀이라 제외)"""
+    u = make_url(url)
+    if u.get_backend_name() == "sqlite" and u.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _connect_args(url: str) -> dict:
+    u = make_url(url)
+    backend = u.get_backend_name()
+    if backend == "sqlite":
+        return {"check_same_thread": False} if u.get_driver_name() == "pysqlite" else {}
+    if backend == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS:
+        # 드라이버마다 서버 설정 넘기는 방법이 다름
+        if u.get_driver_name() == "asyncpg":
+            return {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+        return {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return {}
+
+
+def is_sqlite_file(url: str) -> bool:
+    u = make_url(url)
+    return u.get_backend_name() == "sqlite" and u.database not in (None, "", ":memory:")
+
+
+def apply_sqlite_pragmas(eng) -> None:
+    """
+    SQLite 파일 DB 면 새 연결마다 PRAGMA 설정 (sync Engine 또는 AsyncEngine.sync_engine).
+    WAL: 읽기와 쓰기가 서로 막지 않음 / NORMAL: WAL 에서는 전원 꺼짐 때만 마지막 커밋이 빠질 수 있음
+    busy_timeout: 다른 쓰기가 끝날 때까지 바로 "database is locked" 내지 않고 기다림
+    """
+    if not is_sqlite_file(str(eng.url)):
+        return
+    pragmas = [
+        f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+        f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE_MB) * 1024 * 1024}",
+        # 음수는 KiB 단위
+        f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_MB) * 1024}",
+    ]
+
+    @event.listens_for(eng, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+connect_args = _connect_args(settings.DATABASE_URL)
+engine = create_engine(
+    settings.DATABASE_URL, echo=False, future=True, connect_args=connect_args, **pool_options(settings.DATABASE_URL)
+)
 
-connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
-engine = create_engine(settings.DATABASE_URL, echo=False, future=True, connect_args=connect_args)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+class RoutingSession(Session):
+    """
+    info["replica"] 에 엔진이 있으면 SELECT 는 그 복제본으로, flush/INSERT/UPDATE/DELETE 는 primary 로.
+    한 번 쓰고 나면 그 세션은 끝날 때까지 primary 에서 읽음 (자기가 쓴 값을 바로 다시 읽는 경우)
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if replica is not None:
+            if self._flushing or isinstance(clause, UpdateBase):
+                self.info.pop("replica", None)
+            else:
+                return replica
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+@contextmanager
+def read_primary(db: Session):
+    """블록 안의 SELECT 는 복제본 대신 primary 에서 (여러 요청이 같이 쓰는 캐시를 채울 때 등)"""
+    replica = db.info.pop("replica", None)
+    try:
+        yield db
+    finally:
+        if replica is not None:
+            db.info["replica"] = replica
+
+
+apply_sqlite_pragmas(engine)
+instrument_engine(engine)
+SessionLocal = sessionmaker(bind=engine, class_=RoutingSession, autoflush=False, autocommit=False, future=True)
+replica_engines = [
+    create_engine(url, echo=False, future=True, connect_args=_connect_args(url), **pool_options(url))
+    for url in settings.DATABASE_REPLICA_URLS
+]
+for _eng in replica_engines:
+    apply_sqlite_pragmas(_eng)
+    instrument_engine(_eng)
 Base = declarative_base()
 
-def get_db():
+
+def import_models() -> None:
+    """Base.metadata 에 모든 테이블이 올라가도록 모델 모듈 로드 (앱, alembic, 진단 스크립트 공용)"""
+    import app.models.user  # noqa: F401
+    import app.models.posting  # noqa: F401
+    import app.models.favorite  # noqa: F401
+    import app.models.consent  # noqa: F401
+    import app.models.email_verification  # noqa: F401
+    import app.models.chat  # noqa: F401
+    import app.models.image_asset  # noqa: F401
+    import app.models.saved_search  # noqa: F401
+    import app.models.notification  # noqa: F401
+
+
+def async_database_url(url: str) -> str:
+    """동기 드라이버 URL → async 드라이버 URL (sqlite → aiosqlite, postgresql → asyncpg)"""
+    u = make_url(url)
+    backend = u.get_backend_name()
+    driver = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}.get(backend)
+    if driver is None:
+        return url
+    query = dict(u.query)
+    # asyncpg 는 libpq 의 sslmode 대신 ssl 파라미터를 받음
+    if backend == "postgresql" and "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return u.set(drivername=f"{backend}+{driver}", query=query).render_as_string(hide_password=False)
+
+
+# REST 라우터용 async 엔진/세션 (동시성은 스레드 수가 아니라 커넥션 풀 크기로 제한됨)
+# commit 후에도 응답 만들 때 속성을 다시 읽지 않도록 expire_on_commit=False
+_async_url = settings.DATABASE_ASYNC_URL or async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    _async_url, echo=False, connect_args=_connect_args(_async_url), **pool_options(_async_url)
+)
+# aiosqlite 연결도 connect 이벤트는 sync_engine 쪽에서 받음
+apply_sqlite_pragmas(async_engine.sync_engine)
+instrument_engine(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, sync_session_class=RoutingSession, autoflush=False, expire_on_commit=False
+)
+async_replica_engines = [
+    create_async_engine(u, echo=False, connect_args=_connect_args(u), **pool_options(u))
+    for u in (async_database_url(url) for url in settings.DATABASE_REPLICA_URLS)
+]
+for _eng in async_replica_engines:
+    apply_sqlite_pragmas(_eng.sync_engine)
+    instrument_engine(_eng.sync_engine)
+
+STICKY_COOKIE = "pl_primary"
+
+
+def reads_from_replica(conn: HTTPConnection) -> bool:
+    """복제본이 있고, GET/HEAD 이고, 최근에 쓰기 요청을 보낸 클라이언트가 아닐 때만"""
+    return (
+        bool(settings.DATABASE_REPLICA_URLS)
+        and conn.scope["type"] == "http"
+        and conn.scope["method"] in ("GET", "HEAD")
+        and STICKY_COOKIE not in conn.cookies
+    )
+
+
+def pool_stats(eng) -> dict:
+    pool = eng.pool
+    if not hasattr(pool, "checkedout"):
+        return {"class": type(pool).__name__}
+    capacity = pool.size() + max(settings.DB_MAX_OVERFLOW, 0)
+    return {
+        "class": type(pool).__name__,
+        "size": pool.size(),
+        "capacity": capacity,
+        "checkedOut": pool.checkedout(),
+        "checkedIn": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "saturation": round(pool.checkedout() / capacity, 3) if capacity else 0.0,
+    }
+
+def get_db(conn: HTTPConnection):
     db = SessionLocal()
+    if reads_from_replica(conn):
+        db.info["replica"] = random.choice(replica_engines)
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db(conn: HTTPConnection):
+    async with AsyncSessionLocal() as db:
+        if reads_from_replica(conn):
+            # AsyncSession 안쪽 sync Session 이 get_bind 를 부르므로 sync_engine 을 넣음
+            db.sync_session.info["replica"] = random.choice(async_replica_engines).sync_engine
+        yield db
+
+
+class StickyPrimaryMiddleware:
+    """
+    쓰기 요청(POST/PUT/PATCH/DELETE)이 성공하면 DB_REPLICA_STICKY_SECONDS 동안 살아 있는 쿠키를 붙임.
+    그 쿠키가 있는 동안 같은 클라이언트의 GET 은 primary 에서 읽음 (복제 지연 동안 자기 글/수정이 안 보이는 것 방지)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in ("GET", "HEAD", "OPTIONS")
+            or not settings.DATABASE_REPLICA_URLS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # 프론트가 다른 도메인이라 https 에서는 SameSite=None 이어야 쿠키가 같이 옴
+        attrs = "SameSite=None; Secure" if scope.get("scheme") == "https" else "SameSite=Lax"
+        cookie = f"{STICKY_COOKIE}=1; Max-Age={settings.DB_REPLICA_STICKY_SECONDS}; Path=/; HttpOnly; {attrs}"
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message = {**message, "headers": [*message.get("headers", []), (b"set-cookie", cookie.encode("latin-1"))]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
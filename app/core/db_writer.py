@@ -0,0 +1,79 @@
+# app/core/db_writer.py
+"""
+SQLite 단일 writer 큐.
+
+SQLite 는 파일 하나에 쓰기 잠금이 하나라서, 여러 스레드가 동시에 쓰면 busy_timeout 동안 서로 기다리다
+"database is locked" 가 날 수 있음. 쓰기 작업을 전용 스레드 하나에 넣어 순서대로 처리하면
+쓰기끼리는 잠금을 다툴 일이 없고 (WAL 이라 읽기는 그대로 병렬), 이벤트 루프도 막지 않음.
+SQLite 가 아니거나 SQLITE_SINGLE_WRITER=False 면 그냥 스레드풀에서 실행.
+
+여기를 거치는 쓰기: 채팅 웹소켓(메시지 저장/읽음), 가격 인하 알림 insert, 직접 업로드 마무리.
+REST 라우터의 AsyncSession 쓰기와 주기 작업은 거치지 않음 (각자 커넥션에서 busy_timeout 으로 기다림)
+→ 잠금 경쟁이 큰(자주/한꺼번에 쓰는) 경로만 여기로 옮기는 중
+
+    msg = await db_writer.run(lambda db: save_message(db, ...))
+
+fn 은 writer 전용 세션을 받아 commit 까지 하고, 돌려준 ORM 객체는 세션이 닫힌 뒤에도
+이미 읽어 둔 속성만 쓸 것 (commit 뒤에는 refresh 해 둘 것)
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import SessionLocal, engine, is_sqlite_file
+
+T = TypeVar("T")
+
+
+class DbWriter:
+    def __init__(self, serialized: bool):
+        self.serialized = serialized
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._done = 0
+        self._failed = 0
+
+    def _run(self, fn: Callable[[Session], T]) -> T:
+        db = SessionLocal()
+        try:
+            return fn(db)
+        except Exception:
+            db.rollback()
+            self._failed += 1
+            raise
+        finally:
+            db.close()
+            self._done += 1
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+            return self._executor
+
+    async def run(self, fn: Callable[[Session], T]) -> T:
+        if not self.serialized:
+            return await run_in_threadpool(self._run, fn)
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), self._run, fn)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        return {"serialized": self.serialized, "pending": self._pending, "done": self._done, "failed": self._failed}
+
+
+db_writer = DbWriter(serialized=settings.SQLITE_SINGLE_WRITER and is_sqlite_file(str(engine.url)))
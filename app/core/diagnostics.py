@@ -0,0 +1,116 @@
+# app/core/diagnostics.py
+"""
+시작 진단 (예전에 main.py import 때마다 print 하던 것들).
+
+    python -m app.core.diagnostics               # DB 접속/버전, 라우트 목록, app.main import 시간
+    python -m app.core.diagnostics --import-time # import 시간만 (오래 걸리는 모듈 상위 N 개)
+
+STARTUP_DIAGNOSTICS=true 면 앱 lifespan 에서 DB/라우트 정보를 로그로 남김
+"""
+import argparse
+import json
+import logging
+import subprocess
+import sys
+import time
+from typing import List
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+
+def db_report(eng) -> dict:
+    backend = eng.url.get_backend_name()
+    out = {"url": eng.url.render_as_string(hide_password=True), "backend": backend}
+    started = time.perf_counter()
+    try:
+        with eng.connect() as conn:
+            if backend == "sqlite":
+                out["databases"] = [list(r) for r in conn.execute(text("PRAGMA database_list")).all()]
+                out["journalMode"] = conn.execute(text("PRAGMA journal_mode")).scalar_one()
+            elif backend == "postgresql":
+                out["version"] = conn.execute(text("select version()")).scalar_one()
+                out["user"] = conn.execute(text("select current_user")).scalar_one()
+                out["database"] = conn.execute(text("select current_database()")).scalar_one()
+        out["ok"] = True
+    except Exception as e:
+        out["ok"] = False
+        out["error"] = repr(e)
+    out["connectMs"] = round((time.perf_counter() - started) * 1000, 1)
+    return out
+
+
+def route_table(app) -> List[dict]:
+    return [
+        {"methods": sorted(getattr(r, "methods", None) or []), "path": getattr(r, "path", None)}
+        for r in app.routes
+    ]
+
+
+def log_startup_report(app) -> None:
+    from app.core.db import engine
+
+    report = db_report(engine)
+    if report["ok"]:
+        logger.info("db: %s", report)
+    else:
+        logger.warning("db connection failed: %s", report)
+    for r in route_table(app):
+        logger.info("route %s %s", ",".join(r["methods"]), r["path"])
+
+
+def measure_import(module: str = "app.main", top: int = 15) -> dict:
+    """
+    새 인터프리터에서 module 을 import 하는 데 걸린 시간 (-X importtime).
+    self 시간이 긴 모듈 상위 top 개도 같이 (us → ms)
+    """
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    rows = []
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        self_us, cumulative_us, name = int(parts[0]), int(parts[1]), parts[2].rstrip()
+        if name.strip() == module:
+            total_us = cumulative_us
+        rows.append((self_us, cumulative_us, name.strip()))
+    rows.sort(reverse=True)
+    return {
+        "module": module,
+        "ok": proc.returncode == 0,
+        "importMs": round(total_us / 1000, 1),
+        "processWallMs": round(wall_ms, 1),
+        "slowest": [{"module": n, "selfMs": round(s / 1000, 1), "cumulativeMs": round(c / 1000, 1)} for s, c, n in rows[:top]],
+        "error": proc.stderr.strip().splitlines()[-1] if proc.returncode != 0 and proc.stderr.strip() else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pre-loved API 시작 진단")
+    parser.add_argument("--import-time", action="store_true", help="app.main import 시간만 측정")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    report = {"import": measure_import("app.main", args.top)}
+    if not args.import_time:
+        from app.core.db import engine
+        from app.main import app
+
+        report["db"] = db_report(engine)
+        report["routes"] = route_table(app)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
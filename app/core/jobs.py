@@ -0,0 +1,68 @@
+# app/core/jobs.py
+"""
+주기 작업 등록/실행.
+
+서비스 모듈이 register_job() 으로 (이름, 주기, 동기 함수) 를 등록해 두면
+앱 시작 시 start_jobs() 가 각각 asyncio task 로 돌린다.
+함수는 스레드풀에서 실행되고, 인자로 자기 전용 DB 세션을 받는다.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Callable, List
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    name: str
+    interval: float
+    fn: Callable[[Session], object]
+    run_at_startup: bool = True
+
+
+_jobs: List[Job] = []
+
+
+def register_job(name: str, interval: float, fn: Callable[[Session], object], run_at_startup: bool = True) -> None:
+    if any(j.name == name for j in _jobs):
+        return
+    _jobs.append(Job(name, interval, fn, run_at_startup))
+
+
+def _run_once(job: Job) -> None:
+    db = SessionLocal()
+    try:
+        job.fn(db)
+    finally:
+        db.close()
+
+
+async def _loop(job: Job) -> None:
+    first = True
+    while True:
+        if not (first and job.run_at_startup):
+            await asyncio.sleep(job.interval)
+        first = False
+        try:
+            await run_in_threadpool(_run_once, job)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("job failed: %s", job.name)
+
+
+def start_jobs() -> List[asyncio.Task]:
+    return [asyncio.create_task(_loop(job), name=f"job:{job.name}") for job in _jobs]
+
+
+async def stop_jobs(tasks: List[asyncio.Task]) -> None:
+    for t in tasks:
+        t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,182 @@
+# app/core/metrics.py
+"""
+요청 지표 수집 + Prometheus 텍스트 포맷 (/metrics, X-Admin-Token 또는 Bearer METRICS_TOKEN 필요).
+
+- 라우트(경로 템플릿, 예: /api/postings/{posting_id})별 응답 시간 히스토그램 / 상태 코드별 요청 수
+- 라우트별 DB 쿼리 수/시간 (app/core/query_stats.py)
+- 라우트 묶음(bulkhead 와 같은 묶음)별 처리 중 요청 수, 웹소켓 엔드포인트별 연결 수
+
+hot path 에서는 dict 조회와 정수 덧셈만 함 (이벤트 루프 스레드에서만 갱신 → 락 없음).
+라우트를 못 찾은 요청(404 등)은 path 대신 "unmatched" 로 묶어서 라벨 개수가 늘지 않게 함
+"""
+import time
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+from app.core import query_stats
+from app.core.bulkhead import group_for
+from app.core.config import settings
+
+UNMATCHED = "unmatched"
+
+
+class _RouteStats:
+    __slots__ = ("buckets", "count", "sum", "queries", "db_seconds")
+
+    def __init__(self, n_buckets: int):
+        self.buckets = [0] * (n_buckets + 1)  # 마지막 칸 = +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+class Metrics:
+    def __init__(self, buckets: List[float]):
+        self.bounds = sorted(buckets)
+        self.routes: Dict[Tuple[str, str], _RouteStats] = {}
+        self.statuses: Dict[Tuple[str, str, int], int] = {}
+        self.in_flight: Dict[str, int] = {}
+        self.websockets: Dict[str, int] = {}
+        self.websockets_total: Dict[str, int] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float, queries: int, db_seconds: float) -> None:
+        key = (method, route)
+        stats = self.routes.get(key)
+        if stats is None:
+            stats = self.routes[key] = _RouteStats(len(self.bounds))
+        stats.buckets[bisect_left(self.bounds, seconds)] += 1
+        stats.count += 1
+        stats.sum += seconds
+        stats.queries += queries
+        stats.db_seconds += db_seconds
+        skey = (method, route, status)
+        self.statuses[skey] = self.statuses.get(skey, 0) + 1
+
+    def render(self) -> str:
+        lines: List[str] = []
+        add = lines.append
+
+        add("# HELP http_request_duration_seconds HTTP 요청 처리 시간 (응답 본문 전송 완료까지)")
+        add("# TYPE http_request_duration_seconds histogram")
+        for (method, route), s in sorted(self.routes.items()):
+            labels = f'method="{method}",route="{_esc(route)}"'
+            acc = 0
+            for bound, n in zip(self.bounds, s.buckets):
+                acc += n
+                add(f'http_request_duration_seconds_bucket{{{labels},le="{bound:g}"}} {acc}')
+            add(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {s.count}')
+            add(f"http_request_duration_seconds_sum{{{labels}}} {s.sum:.6f}")
+            add(f"http_request_duration_seconds_count{{{labels}}} {s.count}")
+
+        add("# HELP http_requests_total 상태 코드별 HTTP 요청 수")
+        add("# TYPE http_requests_total counter")
+        for (method, route, status), n in sorted(self.statuses.items()):
+            add(f'http_requests_total{{method="{method}",route="{_esc(route)}",status="{status}"}} {n}')
+
+        add("# HELP http_requests_in_flight 처리 중인 HTTP 요청 수 (라우터 묶음별)")
+        add("# TYPE http_requests_in_flight gauge")
+        for group, n in sorted(self.in_flight.items()):
+            add(f'http_requests_in_flight{{group="{group}"}} {n}')
+
+        add("# HELP http_request_db_queries_total 요청 처리 중 실행한 DB 쿼리 수")
+        add("# TYPE http_request_db_queries_total counter")
+        for (method, route), s in sorted(self.routes.items()):
+            add(f'http_request_db_queries_total{{method="{method}",route="{_esc(route)}"}} {s.queries}')
+        add("# HELP http_request_db_seconds_total 요청 처리 중 DB 쿼리에 쓴 시간")
+        add("# TYPE http_request_db_seconds_total counter")
+        for (method, route), s in sorted(self.routes.items()):
+            add(f'http_request_db_seconds_total{{method="{method}",route="{_esc(route)}"}} {s.db_seconds:.6f}')
+
+        add("# HELP db_queries_total 전체 DB 쿼리 수 (주기 작업/웹소켓 포함)")
+        add("# TYPE db_queries_total counter")
+        add(f"db_queries_total {query_stats.totals.queries}")
+        add("# HELP db_query_seconds_total 전체 DB 쿼리 시간")
+        add("# TYPE db_query_seconds_total counter")
+        add(f"db_query_seconds_total {query_stats.totals.seconds:.6f}")
+
+        add("# HELP websocket_connections 열려 있는 웹소켓 연결 수")
+        add("# TYPE websocket_connections gauge")
+        for route, n in sorted(self.websockets.items()):
+            add(f'websocket_connections{{route="{_esc(route)}"}} {n}')
+        add("# HELP websocket_connections_total 수락한 웹소켓 연결 수")
+        add("# TYPE websocket_connections_total counter")
+        for route, n in sorted(self.websockets_total.items()):
+            add(f'websocket_connections_total{{route="{_esc(route)}"}} {n}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _esc(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _route_of(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED
+
+
+metrics = Metrics(settings.METRICS_LATENCY_BUCKETS)
+
+
+class MetricsMiddleware:
+    """순수 ASGI 미들웨어 (BaseHTTPMiddleware 는 요청마다 task 를 하나 더 만들어서 안 씀)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        if scope["type"] == "http":
+            await self._http(scope, receive, send)
+        elif scope["type"] == "websocket":
+            await self._websocket(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    async def _http(self, scope, receive, send):
+        group = group_for(scope["path"]) or "health"
+        in_flight = metrics.in_flight
+        in_flight[group] = in_flight.get(group, 0) + 1
+        started = time.perf_counter()
+        status = 500
+        finished = None
+
+        async def send_wrapper(message):
+            nonlocal status, finished
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                # BackgroundTasks 는 응답을 다 보낸 뒤 돌기 때문에 여기까지만 잼
+                finished = time.perf_counter()
+            await send(message)
+
+        token = query_stats.start_request(scope=scope)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = _route_of(scope)
+            stats = query_stats.end_request(token, scope["method"], route)
+            in_flight[group] -= 1
+            elapsed = (finished or time.perf_counter()) - started
+            metrics.observe(scope["method"], route, status, elapsed, stats.queries, stats.seconds)
+
+    async def _websocket(self, scope, receive, send):
+        route = None
+
+        async def send_wrapper(message):
+            nonlocal route
+            if message["type"] == "websocket.accept" and route is None:
+                # accept 는 라우팅이 끝난 뒤라 scope["route"] 가 있음
+                route = _route_of(scope)
+                metrics.websockets[route] = metrics.websockets.get(route, 0) + 1
+                metrics.websockets_total[route] = metrics.websockets_total.get(route, 0) + 1
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if route is not None:
+                metrics.websockets[route] -= 1
@@ -0,0 +1,132 @@
+# app/core/query_stats.py
+"""
+DB 쿼리 수/시간 집계 (SQLAlchemy cursor 이벤트).
+
+- 전체 누적: 주기 작업/웹소켓까지 포함한 모든 쿼리
+- 요청별: 미들웨어가 요청마다 QueryStats 를 contextvar 에 넣어 두면 그 요청 안에서 실행된 쿼리가 거기에 더해짐
+  (run_in_threadpool/run_sync 도 context 를 복사해서 넘기므로 같은 객체에 쌓임)
+- N+1 감지: QUERY_REPEAT_WARN_THRESHOLD > 0 이면 요청 안에서 같은 모양(파라미터만 다른) 쿼리가
+  그 횟수 이상 나올 때 경고 로그. 쿼리 문자열을 모아야 해서 개발 환경에서만 켤 것
+- SLOW_QUERY_MS 이상 걸린 쿼리는 app/core/slow_query.py 로 넘김 (요청 scope 도 같이 → 라우트 기록)
+"""
+import logging
+import re
+import threading
+import time
+from contextvars import ContextVar, Token
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.slow_query import slow_query_log
+
+logger = logging.getLogger(__name__)
+
+# IN (?, ?, ?) 처럼 개수만 다른 자리표시자 목록은 하나로
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|\$\d+|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|\$\d+|:\w+))*\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    return _SPACES.sub(" ", _PLACEHOLDER_LIST.sub("(?)", statement)).strip()
+
+
+class QueryStats:
+    __slots__ = ("queries", "seconds", "shapes", "scope")
+
+    def __init__(self, track_shapes: bool = False, scope: Optional[dict] = None):
+        self.queries = 0
+        self.seconds = 0.0
+        self.scope = scope
+        # 쿼리 모양 → 횟수 (track_shapes 일 때만)
+        self.shapes: Optional[Dict[str, int]] = {} if track_shapes else None
+
+    def repeated(self, threshold: int) -> List[tuple]:
+        """[(모양, 횟수)] threshold 번 이상 나온 것, 많은 순"""
+        if not self.shapes:
+            return []
+        return sorted(((s, n) for s, n in self.shapes.items() if n >= threshold), key=lambda x: -x[1])
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+# 요청이 끝날 때마다 (method, route, stats) 로 불림 (app/testing/query_budget.py 가 씀)
+_observers: List[Callable[[str, str, QueryStats], None]] = []
+
+
+def start_request(track_shapes: Optional[bool] = None, scope: Optional[dict] = None) -> Token:
+    if track_shapes is None:
+        track_shapes = settings.QUERY_REPEAT_WARN_THRESHOLD > 0 or bool(_observers)
+    return _current.set(QueryStats(track_shapes, scope))
+
+
+def end_request(token: Token, method: str = "", route: str = "") -> QueryStats:
+    stats = _current.get()
+    _current.reset(token)
+    threshold = settings.QUERY_REPEAT_WARN_THRESHOLD
+    if threshold > 0:
+        for shape, n in stats.repeated(threshold):
+            logger.warning("possible N+1: %s %s ran %d times: %s", method, route, n, shape[:500])
+    for observer in list(_observers):
+        observer(method, route, stats)
+    return stats
+
+
+def add_observer(fn: Callable[[str, str, QueryStats], None]) -> None:
+    _observers.append(fn)
+
+
+def remove_observer(fn: Callable[[str, str, QueryStats], None]) -> None:
+    if fn in _observers:
+        _observers.remove(fn)
+
+
+def current() -> Optional[QueryStats]:
+    return _current.get()
+
+
+class _Totals:
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+        # 주기 작업 스레드와 이벤트 루프가 같이 더함
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self.queries += 1
+            self.seconds += seconds
+
+
+totals = _Totals()
+
+
+def instrument_engine(eng) -> None:
+    """sync Engine 또는 AsyncEngine.sync_engine 에 쿼리 시간 측정 이벤트 연결"""
+
+    @event.listens_for(eng, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(eng, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        totals.add(elapsed)
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.seconds += elapsed
+            if stats.shapes is not None:
+                shape = statement_shape(statement)
+                stats.shapes[shape] = stats.shapes.get(shape, 0) + 1
+        if settings.SLOW_QUERY_MS > 0 and elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            try:
+                slow_query_log.record(
+                    conn, cursor, statement, parameters, executemany, elapsed, stats.scope if stats else None
+                )
+            except Exception:
+                logger.exception("slow query log failed")
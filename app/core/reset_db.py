@@ -1,8 +1,9 @@
-from app.core.db import Base, engine
+from app.core.db import Base, engine, import_models
 
 # 한번만 실행하는 스크립트
 def reset_db():
     print("데이터베이스 초기화 중...")
+    import_models()
     Base.metadata.drop_all(bind=engine, checkfirst=True)
     Base.metadata.create_all(bind=engine)
     print("초기화 완료!")
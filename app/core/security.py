@@ -3,9 +3,11 @@ from jose import jwt, JWTError
 from passlib.hash import argon2
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.core.config import settings
-from app.core.db import get_db
+from app.core.db import get_db, get_async_db
 from app.models.user import User
 
 def hash_password(plain: str) -> str:
@@ -38,7 +40,7 @@ def decode_refresh_token(token: str) -> dict:
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+def _token_user_id(token: str) -> int:
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="TOKEN_REQUIRED", headers={"WWW-Authenticate": "Bearer"})
     payload = decode_access_token(token)
@@ -46,10 +48,20 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     if not sub:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="INVALID_TOKEN_PAYLOAD")
     try:
-        user_id = int(sub)
+        return int(sub)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="INVALID_SUB")
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+    user_id = _token_user_id(token)
     user = db.query(User).filter(User.user_id == user_id).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="USER_NOT_FOUND")
     return user
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> User:
+    user_id = _token_user_id(token)
+    user = await db.scalar(select(User).where(User.user_id == user_id))
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="USER_NOT_FOUND")
+    return user
@@ -0,0 +1,221 @@
+# app/core/slow_query.py
+"""
+느린 쿼리 기록 (SLOW_QUERY_MS 이상 걸린 쿼리).
+
+- 같은 모양(fingerprint) 쿼리는 횟수/총 시간/최대 시간만 계속 더하고,
+  로그 + 실행 계획은 SLOW_QUERY_SAMPLE_SECONDS 에 한 번만 남김 (같은 쿼리가 몰려도 EXPLAIN 폭주 없음)
+- 실행 계획: PostgreSQL 은 EXPLAIN (ANALYZE off), SQLite 는 EXPLAIN QUERY PLAN.
+  같은 DBAPI 커넥션에서 커서를 새로 열어 실행 (SQLAlchemy 이벤트를 다시 타지 않음).
+  PostgreSQL 은 EXPLAIN 이 실패해도 요청 트랜잭션이 깨지지 않게 savepoint 안에서
+- 바인딩 값은 숫자/None/bool 만 남기고 문자열/바이트는 길이만, 이름이 민감해 보이면 통째로 가림
+- SLOW_QUERY_LOG_PATH 로 JSON 한 줄씩 (RotatingFileHandler), 상위 목록은 /api/admin/slow-queries
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SENSITIVE = re.compile(r"pass|token|secret|email|hash|code", re.IGNORECASE)
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE", "INSERT")
+
+
+def _redact_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return f"<str len={len(value)}>"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"<bytes len={len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def redact_params(parameters: Any) -> Any:
+    if isinstance(parameters, dict):
+        return {k: "***" if _SENSITIVE.search(str(k)) else _redact_value(v) for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact_value(v) for v in parameters]
+    return _redact_value(parameters)
+
+
+def _route_label(scope: Optional[dict]) -> str:
+    if not scope:
+        return ""
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    return f"{scope.get('method', scope.get('type', '')).upper()} {path}".strip()
+
+
+class _Offender:
+    __slots__ = ("fingerprint", "statement", "count", "total_ms", "max_ms", "last_seen", "last_sampled", "route", "plan")
+
+    def __init__(self, fingerprint: str, statement: str):
+        self.fingerprint = fingerprint
+        self.statement = statement
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_seen = 0.0
+        self.last_sampled = 0.0
+        self.route = ""
+        self.plan: Optional[List[str]] = None
+
+    def as_dict(self) -> dict:
+        return {
+            "fingerprint": self.fingerprint,
+            "statement": self.statement[:2000],
+            "count": self.count,
+            "totalMs": round(self.total_ms, 1),
+            "avgMs": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "maxMs": round(self.max_ms, 1),
+            "lastSeen": datetime.fromtimestamp(self.last_seen, timezone.utc).isoformat() if self.last_seen else None,
+            "route": self.route,
+            "plan": self.plan,
+        }
+
+
+class SlowQueryLog:
+    # 메모리에 들고 있는 fingerprint 수 상한 (넘으면 총 시간이 가장 작은 것부터 버림)
+    MAX_OFFENDERS = 500
+
+    def __init__(self):
+        self._offenders: Dict[str, _Offender] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._file_logger: Optional[logging.Logger] = None
+
+    def _writer(self) -> Optional[logging.Logger]:
+        if not settings.SLOW_QUERY_LOG_PATH:
+            return None
+        if self._file_logger is None:
+            with self._lock:
+                if self._file_logger is None:
+                    directory = os.path.dirname(settings.SLOW_QUERY_LOG_PATH)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    handler = RotatingFileHandler(
+                        settings.SLOW_QUERY_LOG_PATH,
+                        maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES,
+                        backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+                        encoding="utf-8",
+                    )
+                    handler.setFormatter(logging.Formatter("%(message)s"))
+                    file_logger = logging.getLogger("app.slow_query.file")
+                    file_logger.setLevel(logging.INFO)
+                    file_logger.propagate = False
+                    file_logger.addHandler(handler)
+                    self._file_logger = file_logger
+        return self._file_logger
+
+    def record(self, conn, cursor, statement: str, parameters, executemany: bool, elapsed: float,
+               scope: Optional[dict]) -> None:
+        # EXPLAIN 실행 중에 다시 들어오는 경우 (커서 이벤트를 타는 드라이버 대비)
+        if getattr(self._local, "busy", False):
+            return
+        from app.core.query_stats import statement_shape
+
+        elapsed_ms = elapsed * 1000
+        shape = statement_shape(statement)
+        fingerprint = hashlib.sha1(shape.encode("utf-8")).hexdigest()[:16]
+        now = time.time()
+        route = _route_label(scope)
+
+        with self._lock:
+            off = self._offenders.get(fingerprint)
+            if off is None:
+                if len(self._offenders) >= self.MAX_OFFENDERS:
+                    smallest = min(self._offenders.values(), key=lambda o: o.total_ms)
+                    del self._offenders[smallest.fingerprint]
+                off = self._offenders[fingerprint] = _Offender(fingerprint, shape)
+            off.count += 1
+            off.total_ms += elapsed_ms
+            off.max_ms = max(off.max_ms, elapsed_ms)
+            off.last_seen = now
+            if route:
+                off.route = route
+            sample = now - off.last_sampled >= settings.SLOW_QUERY_SAMPLE_SECONDS
+            if sample:
+                off.last_sampled = now
+
+        if not sample:
+            return
+
+        plan = None
+        if settings.SLOW_QUERY_EXPLAIN and not executemany:
+            self._local.busy = True
+            try:
+                plan = self._explain(conn, statement, parameters)
+            finally:
+                self._local.busy = False
+            off.plan = plan
+
+        entry = {
+            "ts": datetime.fromtimestamp(now, timezone.utc).isoformat(),
+            "fingerprint": fingerprint,
+            "elapsedMs": round(elapsed_ms, 1),
+            "route": route,
+            "statement": statement[:4000],
+            "params": redact_params(parameters) if not executemany else f"<executemany x{len(parameters)}>",
+            "plan": plan,
+            "dialect": conn.dialect.name,
+        }
+        logger.warning("slow query %.1fms %s %s", elapsed_ms, route, shape[:300])
+        writer = self._writer()
+        if writer is not None:
+            writer.info(json.dumps(entry, ensure_ascii=False, default=str))
+
+    def _explain(self, conn, statement: str, parameters) -> Optional[List[str]]:
+        if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+            return None
+        dialect = conn.dialect.name
+        if dialect == "sqlite":
+            prefix = "EXPLAIN QUERY PLAN "
+        elif dialect == "postgresql":
+            prefix = "EXPLAIN (ANALYZE off) "
+        else:
+            return None
+
+        dbapi_conn = conn.connection.dbapi_connection
+        cur = dbapi_conn.cursor()
+        savepoint = dialect == "postgresql"
+        try:
+            if savepoint:
+                cur.execute("SAVEPOINT slow_query_explain")
+            try:
+                cur.execute(prefix + statement, parameters)
+                rows = cur.fetchall()
+            except Exception as e:
+                if savepoint:
+                    cur.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                return [f"EXPLAIN failed: {e!r}"[:500]]
+            if savepoint:
+                cur.execute("RELEASE SAVEPOINT slow_query_explain")
+        except Exception:
+            logger.exception("slow query explain failed")
+            return None
+        finally:
+            cur.close()
+        # SQLite: (id, parent, notused, detail) / PostgreSQL: (QUERY PLAN 한 줄,)
+        return [str(r[-1]) for r in rows]
+
+    def top(self, limit: int = 20, order: str = "total") -> List[dict]:
+        key = {"total": lambda o: o.total_ms, "max": lambda o: o.max_ms, "count": lambda o: o.count}[order]
+        with self._lock:
+            offenders = sorted(self._offenders.values(), key=key, reverse=True)[:limit]
+            return [o.as_dict() for o in offenders]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._offenders.clear()
+
+
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,50 @@
+# app/core/sqlite_replica.py
+"""
+로컬에서 읽기 복제본 흉내내기: SQLite primary 파일을 interval 초마다 복제본 파일로 통째로 복사.
+복사 사이 시간이 복제 지연 역할 → 쓰고 바로 GET 했을 때 primary 로 가는지(쿠키) 확인용.
+
+    DATABASE_URL=sqlite:///./app.db
+    DATABASE_REPLICA_URLS='["sqlite:///./app_replica.db"]'
+    python -m app.core.sqlite_replica --primary ./app.db --replica ./app_replica.db --interval 2
+"""
+import argparse
+import logging
+import sqlite3
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def copy_once(primary: str, replica: str) -> None:
+    # backup API 는 primary 에 쓰기가 진행 중이어도 일관된 스냅샷을 만듦
+    src = sqlite3.connect(primary)
+    dst = sqlite3.connect(replica)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite primary → replica 주기 복사")
+    parser.add_argument("--primary", default="./app.db")
+    parser.add_argument("--replica", default="./app_replica.db")
+    parser.add_argument("--interval", type=float, default=2.0, help="복사 주기(초) = 흉내낼 복제 지연")
+    parser.add_argument("--once", action="store_true", help="한 번만 복사하고 끝냄")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    while True:
+        try:
+            copy_once(args.primary, args.replica)
+            logger.info("copied %s -> %s", args.primary, args.replica)
+        except sqlite3.Error:
+            logger.exception("replica copy failed")
+        if args.once:
+            return
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
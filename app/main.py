@@ -1,56 +1,32 @@
 # app/main.py
+import os
+from contextlib import asynccontextmanager
+from functools import partial
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import text
-from app.core.db import Base, engine
-from app.core.config import settings
-from app.routers import chat_ws, chat_list_ws 
-
-app = FastAPI(title="Pre-loved API")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",
-        "http://127.0.0.1:3000",
-        "https://chalddack.vercel.app",  # ✅ 프론트 배포 주소 추가
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+from fastapi.openapi.utils import get_openapi
+from fastapi.staticfiles import StaticFiles
+from app.core.db import (
+    Base,
+    StickyPrimaryMiddleware,
+    async_engine,
+    async_replica_engines,
+    engine,
+    import_models,
+    is_sqlite_file,
+    replica_engines,
 )
-
-
-from app.models.user import User
-from app.models.posting import Posting, PostingImage
-from app.models.favorite import Favorite
-from app.models.consent import UserConsent
-from app.models.email_verification import EmailVerification
-from app.models.chat import ChatRoom, ChatMessage, ChatRead
-
-print("### DB URL =", settings.DATABASE_URL)
-print("### tables BEFORE:", list(Base.metadata.tables.keys()))
-Base.metadata.create_all(bind=engine)
-print("### tables AFTER :", list(Base.metadata.tables.keys()))
-
-backend = engine.url.get_backend_name()
-try:
-    with engine.connect() as conn:
-        if backend == "sqlite":
-            rows = conn.execute(text("PRAGMA database_list;")).all()
-            print("### SQLite DB connected ✅", rows)
-        elif backend == "postgresql":
-            ver = conn.execute(text("select version()")).scalar_one()
-            who = conn.execute(text("select current_user")).scalar_one()
-            dbn = conn.execute(text("select current_database()")).scalar_one()
-            print("### PostgreSQL connected ✅")
-            print("    version:", ver)
-            print("    user:", who)
-            print("    database:", dbn)
-        else:
-            print("### DB backend detected:", backend)
-except Exception as e:
-    print("### ⚠️ DB connection failed:", e)
+from app.core.config import settings
+from app.core.jobs import start_jobs, stop_jobs
+from app.core.bulkhead import BulkheadMiddleware, check_pool_partition, configure_threadpool
+from app.core.db_writer import db_writer
+from app.core.diagnostics import log_startup_report
+from app.core.metrics import MetricsMiddleware
+from app.services.ai import close_prediction_service
+from app.services.images import shutdown_image_pool
+from app.services.price_watch import price_drop_fanout
+from app.services.storage import storage_backend_name
 
 from app.routers.health import router as health_router
 from app.routers.auth import router as auth_router
@@ -59,8 +35,11 @@ from app.routers.postings import router as postings_router
 from app.routers.favorites import router as favorites_router
 from app.routers.predict import router as predict_router
 from app.routers.image import router as image_router
-from app.routers import chat
-from app.routers import chat_rest
+from app.routers.saved_searches import router as saved_searches_router
+from app.routers.notifications import router as notifications_router
+from app.routers.metrics import router as metrics_router
+from app.routers.admin import router as admin_router
+from app.routers import chat, chat_rest, chat_ws, chat_list_ws
 
 routers = [
     health_router,
@@ -70,24 +49,92 @@ routers = [
     favorites_router,
     predict_router,
     image_router,
+    saved_searches_router,
+    notifications_router,
     chat.router,
     chat_rest.router,
     chat_ws.router,
     chat_list_ws.router,
+    metrics_router,
+    admin_router,
 ]
 
-for r in routers:
-    app.include_router(r)
 
-print("### ROUTES (method, path)")
-for r in app.routes:
-    try:
-        print("   ", getattr(r, "methods", None), getattr(r, "path", None))
-    except Exception:
-        pass
+def _create_all_enabled() -> bool:
+    # 따로 안 정하면 SQLite 파일(로컬 개발)일 때만. 운영 DB 스키마는 alembic upgrade 로
+    if settings.DB_CREATE_ALL is not None:
+        return settings.DB_CREATE_ALL
+    return is_sqlite_file(settings.DATABASE_URL)
 
-from fastapi.openapi.utils import get_openapi
-def custom_openapi():
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if storage_backend_name() == "local":
+        os.makedirs(settings.LOCAL_STORAGE_DIR, exist_ok=True)
+    if _create_all_enabled():
+        await run_in_threadpool(Base.metadata.create_all, bind=engine)
+    if settings.STARTUP_DIAGNOSTICS:
+        await run_in_threadpool(log_startup_report, app)
+    check_pool_partition()
+    configure_threadpool()
+    # 주기 작업 (가격 분위수 갱신 등) 시작/정리
+    tasks = start_jobs()
+    yield
+    await stop_jobs(tasks)
+    await price_drop_fanout.close()
+    await close_prediction_service()
+    shutdown_image_pool()
+    db_writer.shutdown()
+    for eng in [async_engine, *async_replica_engines]:
+        await eng.dispose()
+    for eng in [engine, *replica_engines]:
+        eng.dispose()
+
+
+def create_app() -> FastAPI:
+    """
+    import 만으로는 DB 접속/테이블 생성/외부 클라이언트 생성 안 함 (전부 lifespan 이나 첫 사용 때).
+    워커가 뜨는 데 걸리는 시간은 python -m app.core.diagnostics --import-time 으로 확인
+    """
+    import_models()
+    app = FastAPI(title="Pre-loved API", lifespan=lifespan)
+
+    # 라우터 묶음별 동시 처리 한도 (CORS 안쪽: 503 응답에도 CORS 헤더가 붙도록 나중에 추가되는 CORS 가 바깥)
+    app.add_middleware(BulkheadMiddleware)
+    # 쓰기 요청 뒤 잠깐 동안은 같은 클라이언트의 GET 도 primary 에서 읽게 쿠키 표시 (복제본 설정 없으면 그냥 통과)
+    app.add_middleware(StickyPrimaryMiddleware)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[
+            "http://localhost:3000",
+            "http://127.0.0.1:3000",
+            "https://chalddack.vercel.app",  # ✅ 프론트 배포 주소 추가
+        ],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    # 라우트별 응답 시간/DB 쿼리 수 (가장 바깥: bulkhead 503 과 CORS 처리 시간까지 포함)
+    app.add_middleware(MetricsMiddleware)
+
+    for r in routers:
+        app.include_router(r)
+
+    # 로컬 저장소일 때만 업로드 파일을 정적 라우트로 서빙
+    if storage_backend_name() == "local":
+        # 디렉터리는 lifespan 에서 만듦 (import 시점에는 파일시스템을 건드리지 않음)
+        app.mount(
+            settings.LOCAL_STORAGE_URL_PREFIX,
+            StaticFiles(directory=settings.LOCAL_STORAGE_DIR, check_dir=False),
+            name="media",
+        )
+
+    app.openapi = partial(custom_openapi, app)
+    return app
+
+
+def custom_openapi(app: FastAPI):
     if app.openapi_schema:
         return app.openapi_schema
     schema = get_openapi(
@@ -110,4 +157,5 @@ def custom_openapi():
     app.openapi_schema = schema
     return app.openapi_schema
 
-app.openapi = custom_openapi
+
+app = create_app()
@@ -9,6 +9,7 @@ class Favorite(Base):
     user_id = Column(Integer, ForeignKey("users.userId", ondelete="CASCADE"), primary_key=True)
 
     # postings의 실제 PK는 "id" (Integer)
-    posting_id = Column(Integer, ForeignKey("postings.id", ondelete="CASCADE"), primary_key=True)
+    # PK 는 (user_id, posting_id) 순서라 게시물 기준 조회(가격 알림 대상)용 인덱스 따로
+    posting_id = Column(Integer, ForeignKey("postings.id", ondelete="CASCADE"), primary_key=True, index=True)
 
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
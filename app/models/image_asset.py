@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, LargeBinary, func
+from app.core.db import Base
+
+class ImageAsset(Base):
+    """업로드된 이미지 원본 + 파생본(썸네일 등) 기록. PostingImage.url 로 조회함"""
+    __tablename__ = "image_assets"
+
+    id = Column(Integer, primary_key=True)
+    url = Column(String(500), nullable=False, unique=True, index=True)
+    blob_name = Column(String(500), nullable=False)
+    # 내용 SHA-256 (hex). 같은 내용은 한 번만 저장
+    sha256 = Column(String(64), nullable=True, unique=True, index=True)
+    content_type = Column(String(100), nullable=True)
+
+    # {"200": url, "600": url, "1200": url}
+    variants = Column(JSON, nullable=False, default=dict)
+    thumbnail_url = Column(String(500), nullable=True)
+
+    # 업로드 시 계산한 메타데이터 (클라이언트가 이미지 받기 전에 자리/플레이스홀더 잡을 때 사용)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    byte_size = Column(Integer, nullable=True)
+    dominant_color = Column(String(7), nullable=True)  # "#rrggbb"
+    blurhash = Column(String(64), nullable=True)
+    # 64bit dHash (hex 16자리). 같은 사진 재업로드 탐지용
+    phash = Column(String(16), nullable=True)
+    # 비슷한 사진 검색용 임베딩 (float16 bytes) + 추출기 버전
+    embedding = Column(LargeBinary, nullable=True)
+    embedding_version = Column(String(32), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
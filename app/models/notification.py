@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, JSON, Index, func
+from app.core.db import Base
+
+class Notification(Base):
+    """알림함 (웹소켓에 연결 안 돼 있던 사용자도 나중에 /api/notifications 로 확인)"""
+    __tablename__ = "notifications"
+    __table_args__ = (Index("ix_notifications_user_id_id", "user_id", "id"),)
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.userId", ondelete="CASCADE"), nullable=False)
+
+    # "price_drop" 등
+    type = Column(String(30), nullable=False)
+    posting_id = Column(Integer, ForeignKey("postings.id", ondelete="CASCADE"), nullable=True)
+    payload = Column(JSON, nullable=False, default=dict)
+    is_read = Column(Boolean, nullable=False, default=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
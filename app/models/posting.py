@@ -39,5 +39,16 @@ class PostingImage(Base):
     posting_id = Column(Integer, ForeignKey("postings.id", ondelete="CASCADE"), nullable=False, index=True)
 
     url = Column(String(500), nullable=False)
+    # 목록용 작은 WebP (업로드 때 만든 파생본, 없으면 원본 url 사용)
+    thumbnail_url = Column(String(500), nullable=True)
+
+    # 업로드 시 계산한 메타데이터 (클라이언트가 이미지 받기 전에 자리/플레이스홀더 잡을 때 사용)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    byte_size = Column(Integer, nullable=True)
+    dominant_color = Column(String(7), nullable=True)  # "#rrggbb"
+    blurhash = Column(String(64), nullable=True)
+    # 64bit dHash (hex 16자리). 같은 사진 재업로드 탐지용
+    phash = Column(String(16), nullable=True)
 
     posting = relationship("Posting", back_populates="images")
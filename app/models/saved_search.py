@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, func
+from app.core.db import Base
+
+class SavedSearch(Base):
+    """저장한 검색 조건 (새 게시물이 맞으면 /ws/chat-list 로 알림)"""
+    __tablename__ = "saved_searches"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.userId", ondelete="CASCADE"), nullable=False, index=True)
+
+    # 셋 다 선택 (단, keyword / category 중 하나는 있어야 함)
+    keyword = Column(String(50), nullable=True)
+    category = Column(String(50), nullable=True)
+    max_price = Column(Integer, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
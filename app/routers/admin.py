@@ -0,0 +1,28 @@
+# app/routers/admin.py
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+
+from app.core.auth import require_admin
+from app.core.config import settings
+from app.core.slow_query import slow_query_log
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+
+@router.get("/slow-queries", dependencies=[Depends(require_admin)])
+async def slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    order: Literal["total", "max", "count"] = Query("total"),
+):
+    """느린 쿼리 상위 목록 (fingerprint 별 횟수/총 시간/최대 시간, 마지막 실행 계획)"""
+    return {
+        "thresholdMs": settings.SLOW_QUERY_MS,
+        "data": slow_query_log.top(limit, order),
+    }
+
+
+@router.delete("/slow-queries", dependencies=[Depends(require_admin)])
+async def reset_slow_queries():
+    slow_query_log.reset()
+    return {"ok": True}
@@ -2,15 +2,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from pydantic import BaseModel
 from typing import Optional, List, Literal
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, desc, func, select
 from datetime import timezone
 
-from app.core.db import get_db
-from app.core.auth import get_current_user
+from app.core.db import get_async_db
+from app.core.auth import get_current_user_async
 from app.models.user import User
 from app.models.posting import Posting
 from app.models.chat import ChatRoom, ChatMessage, ChatRead
+from app.services.feed_cache import feed_cache
 from app.schemas.chat import ChatListOut, ChatListItemOut, ChatLastMessageOut
 
 # ✅ /api/chat prefix
@@ -32,21 +33,19 @@ class CreateChatOut(BaseModel):
 # ✅ POST /api/chat
 
 @router.post("", response_model=CreateChatOut, status_code=status.HTTP_201_CREATED)
-def create_chat(
+async def create_chat(
     req: CreateChatIn,
-    db: Session = Depends(get_db),
-    me: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    me: User = Depends(get_current_user_async),
 ):
-    posting = db.query(Posting).filter(Posting.id == req.postingId).first()
+    posting = await db.scalar(select(Posting).where(Posting.id == req.postingId))
     if not posting:
         raise HTTPException(status_code=404, detail="posting_not_found")
     if posting.seller_id == me.user_id:
         raise HTTPException(status_code=400, detail="cannot_chat_with_self")
 
-    exists = (
-        db.query(ChatRoom)
-        .filter(ChatRoom.posting_id == posting.id, ChatRoom.buyer_id == me.user_id)
-        .first()
+    exists = await db.scalar(
+        select(ChatRoom).where(ChatRoom.posting_id == posting.id, ChatRoom.buyer_id == me.user_id).limit(1)
     )
     if exists:
         raise HTTPException(status_code=409, detail="chat_already_exists")
@@ -62,9 +61,10 @@ def create_chat(
     # 🔥 여기서 chatCount +1
     posting.chat_count = (posting.chat_count or 0) + 1
 
-    db.commit()
-    db.refresh(room)
-    db.refresh(posting)
+    await db.commit()
+    await db.refresh(room)
+    await db.refresh(posting)
+    feed_cache.update(posting)
 
     return CreateChatOut(
         chatId=room.id,
@@ -77,14 +77,14 @@ def create_chat(
 
 # ✅ GET /api/chat/me
 @router.get("/me", response_model=ChatListOut)
-def get_my_chats(
+async def get_my_chats(
     role: Optional[Literal["buyer", "seller"]] = Query(None),
     status_param: Optional[str] = Query(None, alias="status"),
-    db: Session = Depends(get_db),
-    me: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    me: User = Depends(get_current_user_async),
 ):
     # 내가 buyer이거나 seller인 방들
-    q = db.query(ChatRoom).filter(
+    q = select(ChatRoom).where(
         or_(
             ChatRoom.buyer_id == me.user_id,
             ChatRoom.seller_id == me.user_id,
@@ -93,21 +93,47 @@ def get_my_chats(
 
     # role 필터
     if role == "buyer":
-        q = q.filter(ChatRoom.buyer_id == me.user_id)
+        q = q.where(ChatRoom.buyer_id == me.user_id)
     elif role == "seller":
-        q = q.filter(ChatRoom.seller_id == me.user_id)
+        q = q.where(ChatRoom.seller_id == me.user_id)
 
     # status 필터
     if status_param:
-        q = q.filter(ChatRoom.status == status_param)
+        q = q.where(ChatRoom.status == status_param)
 
-    rooms: List[ChatRoom] = q.order_by(desc(ChatRoom.created_at)).all()
+    rooms: List[ChatRoom] = (await db.execute(q.order_by(desc(ChatRoom.created_at)))).scalars().all()
+    if not rooms:
+        return ChatListOut(chats=[])
+
+    # 방마다 따로 조회하지 않고 게시물/상대방/마지막 메시지/내 읽음 위치를 한 번씩 모아서 가져옴
+    room_ids = [room.id for room in rooms]
+    other_ids = {room.seller_id if room.buyer_id == me.user_id else room.buyer_id for room in rooms}
+    titles = dict(
+        (await db.execute(select(Posting.id, Posting.title).where(Posting.id.in_({r.posting_id for r in rooms})))).all()
+    )
+    others = {
+        u.user_id: u for u in (await db.execute(select(User).where(User.user_id.in_(other_ids)))).scalars().all()
+    }
+
+    # ✅ 마지막 메시지: room_id 별 text/image 중 가장 큰 id
+    last_ids = (
+        select(func.max(ChatMessage.id))
+        .where(ChatMessage.room_id.in_(room_ids), ChatMessage.type.in_(["text", "image"]))
+        .group_by(ChatMessage.room_id)
+    )
+    last_msgs = {
+        m.room_id: m for m in (await db.execute(select(ChatMessage).where(ChatMessage.id.in_(last_ids)))).scalars().all()
+    }
+    my_reads = dict(
+        (await db.execute(
+            select(ChatRead.room_id, ChatRead.last_read_message_id)
+            .where(ChatRead.room_id.in_(room_ids), ChatRead.user_id == me.user_id)
+        )).all()
+    )
 
     items: List[ChatListItemOut] = []
 
     for room in rooms:
-        posting = db.query(Posting).get(room.posting_id)
-
         # 내 role / 상대방 계산
         if room.buyer_id == me.user_id:
             my_role: Literal["buyer", "seller"] = "buyer"
@@ -116,18 +142,8 @@ def get_my_chats(
             my_role = "seller"
             other_id = room.buyer_id
 
-        other = db.query(User).get(other_id)
-
-        # ✅ 마지막 메시지: room_id 기준으로 조회
-        last_msg: Optional[ChatMessage] = (
-            db.query(ChatMessage)
-            .filter(
-                ChatMessage.room_id == room.id,
-                ChatMessage.type.in_(["text", "image"]),
-            )
-            .order_by(desc(ChatMessage.id))
-            .first()
-        )
+        other = others.get(other_id)
+        last_msg: Optional[ChatMessage] = last_msgs.get(room.id)
 
         # 기본값: 메시지가 없을 때
         if last_msg is None:
@@ -140,17 +156,8 @@ def get_my_chats(
                 isRead=True,
             )
         else:
-            read_row: Optional[ChatRead] = (
-                db.query(ChatRead)
-                .filter(
-                    ChatRead.room_id == room.id,
-                    ChatRead.user_id == me.user_id,
-                    ChatRead.last_read_message_id >= last_msg.id,
-                )
-                .first()
-            )
-
-            last_is_read = read_row is not None
+            last_read_id = my_reads.get(room.id)
+            last_is_read = last_read_id is not None and last_read_id >= last_msg.id
 
             last_msg_out = ChatLastMessageOut(
                 messageId=last_msg.id,
@@ -161,16 +168,12 @@ def get_my_chats(
                 isRead=last_is_read,
             )
 
-
-
-
-
         status_value = room.status or "ACTIVE"
 
         item = ChatListItemOut(
             chatId=room.id,
             postingId=room.posting_id,
-            postingTitle=posting.title if posting else "",
+            postingTitle=titles.get(room.posting_id, ""),
             role=my_role,
             lastMessage=last_msg_out,
             createdAt=room.created_at,
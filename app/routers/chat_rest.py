@@ -2,14 +2,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
 from pydantic import BaseModel
 from typing import Optional, List
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
 
-from app.core.db import get_db
-from app.core.auth import get_current_user
+from app.core.db import get_async_db
+from app.core.auth import get_current_user_async
 from app.models.user import User
 from app.models.posting import Posting
 from app.models.chat import ChatRoom, ChatMessage, ChatRead
+from app.services.feed_cache import feed_cache
 from app.routers import chat_ws
 
 router = APIRouter(prefix="/api/chat", tags=["Chat REST"])
@@ -60,12 +62,12 @@ class DealStatusOut(BaseModel):
 # app/routers/chat_rest.py
 
 @router.post("", response_model=CreateChatOut)
-def create_chat(
+async def create_chat(
     body: CreateChatIn,
-    db: Session = Depends(get_db),
-    me: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    me: User = Depends(get_current_user_async),
 ):
-    posting = db.query(Posting).filter(Posting.id == body.postingId).first()
+    posting = await db.scalar(select(Posting).where(Posting.id == body.postingId))
     if not posting:
         raise HTTPException(status_code=404, detail="posting_not_found")
 
@@ -82,9 +84,10 @@ def create_chat(
     # 🔥 여기서 chatCount +1
     posting.chat_count = (posting.chat_count or 0) + 1
 
-    db.commit()
-    db.refresh(room)
-    db.refresh(posting)
+    await db.commit()
+    await db.refresh(room)
+    await db.refresh(posting)
+    feed_cache.update(posting)
 
     return CreateChatOut(
         chatId=room.id,
@@ -97,27 +100,34 @@ def create_chat(
 
 
 @router.get("/{chat_id}", response_model=MessagesOut)
-def list_messages(
+async def list_messages(
     chat_id: int = Path(...),
     cursor: Optional[int] = Query(None),
     size: Optional[int] = Query(20),
-    db: Session = Depends(get_db),
-    me: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    me: User = Depends(get_current_user_async),
 ):
-    room = db.query(ChatRoom).filter(ChatRoom.id == chat_id).first()
+    room = await db.get(ChatRoom, chat_id)
     if not room:
         raise HTTPException(status_code=404, detail="chat_not_found")
     if me.user_id not in (room.buyer_id, room.seller_id):
         raise HTTPException(status_code=403, detail="forbidden")
 
-    q = db.query(ChatMessage).filter(ChatMessage.room_id == chat_id)
+    q = select(ChatMessage).where(ChatMessage.room_id == chat_id)
     if cursor:
-        q = q.filter(ChatMessage.id < cursor)
-    rows = q.order_by(ChatMessage.id.desc()).limit(size + 1).all()
+        q = q.where(ChatMessage.id < cursor)
+    rows = (await db.execute(q.order_by(ChatMessage.id.desc()).limit(size + 1))).scalars().all()
 
     has_next = len(rows) > size
     rows = rows[:size]
 
+    # 방 참여자별 읽은 위치 (참여자가 둘이라 많아야 두 줄) → 메시지마다 따로 세지 않음
+    reads = (
+        await db.execute(
+            select(ChatRead.user_id, ChatRead.last_read_message_id).where(ChatRead.room_id == chat_id)
+        )
+    ).all()
+
     messages: List[MessageItem] = []
     for m in rows:
         if m.type.upper() == "SYSTEM":
@@ -125,15 +135,11 @@ def list_messages(
             read = True  # 시스템 메시지는 항상 읽은 걸로
         else:
             is_mine = (m.sender_id == me.user_id)
-            # ChatRead에 메시지가 있으면 읽은거임
-            read = (
-                db.query(ChatRead)
-                .filter(
-                    ChatRead.room_id == m.room_id,
-                    ChatRead.user_id != m.sender_id,
-                    ChatRead.last_read_message_id >= m.id,
-                )
-                .count() > 0
+            # 보낸 사람 말고 다른 참여자의 읽은 위치가 이 메시지 이상이면 읽은거임
+            # (ChatRead 만 있고 아직 아무것도 안 읽었으면 last_read 가 NULL)
+            read = any(
+                uid != m.sender_id and last_read is not None and last_read >= m.id
+                for uid, last_read in reads
             )
 
         messages.append(
@@ -153,18 +159,17 @@ def list_messages(
     # 상대방 ID 계산
     other_user_id = room.seller_id if me.user_id == room.buyer_id else room.buyer_id
 
-    last_read_row = (
-        db.query(ChatRead.last_read_message_id)
+    last_read_id = await db.scalar(
+        select(ChatRead.last_read_message_id)
         .join(ChatMessage, ChatRead.last_read_message_id == ChatMessage.id)
-        .filter(
+        .where(
             ChatMessage.room_id == chat_id,        # 이 방에서
             ChatRead.user_id == other_user_id,     # 상대방이 읽은 메시지들 중
             ChatMessage.sender_id == me.user_id,   # 그 중에서 "내가 보낸" 메시지
         )
         .order_by(ChatRead.last_read_message_id.desc())      # 가장 큰 id = 마지막으로 읽은 메시지
-        .first()
+        .limit(1)
     )
-    last_read_id = last_read_row[0] if last_read_row else None
 
     return MessagesOut(
         messages=messages,
@@ -180,11 +185,11 @@ def list_messages(
 async def update_deal_status(
     chat_id: int = Path(..., description="대상 채팅방 ID"),
     body: UpdateDealStatusIn = ...,
-    db: Session = Depends(get_db),
-    me: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    me: User = Depends(get_current_user_async),
 ):
     # 이하 내용은 네가 올린 그대로 (거래 상태 변경 + system 메시지 + broadcast_deal_update)
-    room = db.query(ChatRoom).filter(ChatRoom.id == chat_id).first()
+    room = await db.get(ChatRoom, chat_id)
     if not room:
         raise HTTPException(status_code=404, detail="chat_not_found")
 
@@ -204,7 +209,7 @@ async def update_deal_status(
     if prev_status == new_status:
         raise HTTPException(status_code=400, detail="same_status")
 
-    posting = db.query(Posting).filter(Posting.id == room.posting_id).first()
+    posting = await db.get(Posting, room.posting_id)
     if not posting:
         raise HTTPException(status_code=404, detail="posting_not_found")
 
@@ -218,8 +223,8 @@ async def update_deal_status(
         if posting.status == "RESERVED":
             posting.status = "SOLD"
 
-        seller = db.query(User).filter(User.user_id == room.seller_id).first()
-        buyer = db.query(User).filter(User.user_id == room.buyer_id).first()
+        seller = await db.get(User, room.seller_id)
+        buyer = await db.get(User, room.buyer_id)
         if seller is not None:
             seller.sell_count = (seller.sell_count or 0) + 1
         if buyer is not None:
@@ -228,9 +233,9 @@ async def update_deal_status(
     room.status = new_status
     changed_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
-    db.commit()
-    db.refresh(room)
-    db.refresh(posting)
+    await db.commit()
+    await db.refresh(room)
+    await db.refresh(posting)
 
     nick = me.nickname or "사용자"
 
@@ -250,8 +255,8 @@ async def update_deal_status(
         content=msg_text,
     )
     db.add(system_msg)
-    db.commit()
-    db.refresh(system_msg)
+    await db.commit()
+    await db.refresh(system_msg)
 
     await chat_ws.broadcast_deal_update(
         chat_id=room.id,
@@ -2,9 +2,10 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
-from typing import Dict, Set, Optional
+from typing import Dict, Set, Optional, Tuple
 from jose import jwt, JWTError
 from app.core.db import get_db
+from app.core.db_writer import db_writer
 from app.core.config import settings
 from app.routers.chat_list_ws import (
     broadcast_chat_list_update,
@@ -53,6 +54,66 @@ async def broadcast(chat_id: int, data: dict, exclude: Optional[WebSocket] = Non
 
 
 
+def _save_message(db: Session, chat_id: int, user_id: int, msg_type: str, content: str) -> Tuple[bool, ChatMessage]:
+    """(이 방의 첫 메시지였는지, 저장된 메시지)"""
+    # 🔥 이 방에 기존 메시지가 있었는지 확인 (첫 메시지 여부)
+    has_any_message = (
+        db.query(ChatMessage.id)
+        .filter(ChatMessage.room_id == chat_id)
+        .first()
+        is not None
+    )
+
+    msg = ChatMessage(
+        room_id=chat_id,
+        sender_id=user_id,
+        type=msg_type,
+        content=content,
+    )
+    db.add(msg)
+    db.commit()
+    db.refresh(msg)
+    return has_any_message, msg
+
+
+def _mark_read(db: Session, chat_id: int, user_id: int, message_id: int) -> bool:
+    """읽음 위치 갱신. 메시지가 이 방에 없으면 False"""
+    msg = (
+        db.query(ChatMessage.id)
+        .filter(
+            ChatMessage.id == message_id,
+            ChatMessage.room_id == chat_id,
+        )
+        .first()
+    )
+    if not msg:
+        return False
+
+    read = (
+        db.query(ChatRead)
+        .filter(
+            ChatRead.room_id == chat_id,
+            ChatRead.user_id == user_id,
+        )
+        .first()
+    )
+
+    if read is None:
+        read = ChatRead(
+            room_id=chat_id,
+            user_id=user_id,
+            last_read_message_id=message_id,
+        )
+        db.add(read)
+    else:
+        # 읽은 메시지가 지워지면 (ON DELETE SET NULL) NULL 일 수 있음
+        if read.last_read_message_id is None or message_id > read.last_read_message_id:
+            read.last_read_message_id = message_id
+
+    db.commit()
+    return True
+
+
 @router.websocket("/ws/chat/{chat_id}")
 async def websocket_chat(websocket: WebSocket, chat_id: int, db: Session = Depends(get_db)):
     # 1) 토큰 검증 (쿼리 파라미터)
@@ -78,6 +139,9 @@ async def websocket_chat(websocket: WebSocket, chat_id: int, db: Session = Depen
 
     try:
         while True:
+            # 다음 메시지를 기다리는 동안 풀 커넥션을 쥐고 있지 않도록 세션 정리
+            # (room 은 위에서 읽어 둔 값 그대로 씀)
+            db.close()
             data = await websocket.receive_json()
             ev = data.get("event")
 
@@ -93,25 +157,11 @@ async def websocket_chat(websocket: WebSocket, chat_id: int, db: Session = Depen
                     await websocket.send_json(ErrorOut(code=4003, message="invalid_payload").dict())
                     continue
 
-                # 🔥 이 방에 기존 메시지가 있었는지 확인 (첫 메시지 여부)
-                has_any_message = (
-                    db.query(ChatMessage.id)
-                    .filter(ChatMessage.room_id == chat_id)
-                    .first()
-                    is not None
+                # DB 저장 (SQLite 면 writer 스레드 하나에서 순서대로)
+                has_any_message, msg = await db_writer.run(
+                    lambda wdb: _save_message(wdb, chat_id, user_id, parsed.type, parsed.content)
                 )
 
-                # DB 저장
-                msg = ChatMessage(
-                    room_id=chat_id,
-                    sender_id=user_id,
-                    type=parsed.type,
-                    content=parsed.content,
-                )
-                db.add(msg)
-                db.commit()
-                db.refresh(msg)
-
                 # 채팅방 내부 브로드캐스트 (보낸 본인 제외)
                 out = ReceiveMessageOut(
                     messageId=msg.id,
@@ -133,40 +183,11 @@ async def websocket_chat(websocket: WebSocket, chat_id: int, db: Session = Depen
             elif ev == "read_message":
                 parsed = ReadMessageIn(**data)
 
-                msg = (
-                    db.query(ChatMessage)
-                    .filter(
-                        ChatMessage.id == parsed.messageId,
-                        ChatMessage.room_id == chat_id,
-                    )
-                    .first()
-                )
-                if not msg:
+                found = await db_writer.run(lambda wdb: _mark_read(wdb, chat_id, user_id, parsed.messageId))
+                if not found:
                     await websocket.send_json(ErrorOut(code=4004, message="message_not_found").dict())
                     continue
 
-                read = (
-                    db.query(ChatRead)
-                    .filter(
-                        ChatRead.room_id == chat_id,
-                        ChatRead.user_id == user_id,
-                    )
-                    .first()
-                )
-
-                if read is None:
-                    read = ChatRead(
-                        room_id=chat_id,
-                        user_id=user_id,
-                        last_read_message_id=parsed.messageId,
-                    )
-                    db.add(read)
-                else:
-                    if parsed.messageId > read.last_read_message_id:
-                        read.last_read_message_id = parsed.messageId
-
-                db.commit()
-
                 payload = {
                     "type": "read",
                     "readerId": user_id,
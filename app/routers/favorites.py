@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.core.db import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from app.core.db import get_async_db
 from app.models.favorite import Favorite
 from app.models.posting import Posting
 from app.models.user import User
-from app.core.auth import get_current_user
+from app.core.auth import get_current_user_async
+from app.services.feed_cache import feed_cache
 from pydantic import BaseModel
 from datetime import datetime, timezone
 
@@ -25,20 +26,20 @@ class FavoriteToggleOut(BaseModel):
     likeCount: int
 
 @router.put("/{posting_id}/favorite", response_model=FavoriteToggleOut)
-def toggle_favorite(
+async def toggle_favorite(
     posting_id: int,
     body: FavoriteToggleIn,
-    db: Session = Depends(get_db),
-    me: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    me: User = Depends(get_current_user_async),
 ):
-    p = db.get(Posting, posting_id)
+    p = await db.get(Posting, posting_id)
     if not p:
         raise HTTPException(404, "게시물 없음")
 
-    fav = db.query(Favorite).filter(
+    fav = await db.scalar(select(Favorite).where(
         Favorite.user_id == me.user_id,
         Favorite.posting_id == p.id
-    ).first()
+    ))
 
     # 변경 수행
     if body.favorite:
@@ -48,21 +49,22 @@ def toggle_favorite(
             p.like_count += 1
     else:
         if fav:
-            db.delete(fav)
+            await db.delete(fav)
             p.like_count = max(0, p.like_count - 1)
 
     # ✅ 여기 추가: 세션에 쌓인 변경 내용을 DB에 flush
-    db.flush()
+    await db.flush()
 
     # ✅ 하드 동기화 (이제 방금 변경이 카운트에 반영됨)
-    hard = db.query(func.count(Favorite.user_id))\
-             .filter(Favorite.posting_id == p.id)\
-             .scalar()
+    hard = await db.scalar(
+        select(func.count(Favorite.user_id)).where(Favorite.posting_id == p.id)
+    )
     if p.like_count != hard:
         p.like_count = hard
 
-    db.commit()
-    db.refresh(p)
+    await db.commit()
+    await db.refresh(p)
+    feed_cache.update(p)
 
     msg = "즐겨찾기가 등록되었습니다." if body.favorite else "즐겨찾기가 취소되었습니다."
     now = datetime.utcnow().replace(tzinfo=timezone.utc).isoformat().replace("+00:00", "Z")
@@ -1,8 +1,24 @@
 # app/routers/health.py
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from app.core.auth import require_metrics_access
+from app.core.bulkhead import bulkheads, threadpool_stats
+from app.core.db import engine, async_engine, pool_stats
+from app.core.db_writer import db_writer
 
 router = APIRouter(prefix="/api", tags=["health"])
 
 @router.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@router.get("/health/saturation", dependencies=[Depends(require_metrics_access)])
+async def saturation():
+    """라우터 묶음별 동시 처리 한도 사용량 / DB 커넥션 풀 / 스레드풀 / SQLite writer 큐 사용량"""
+    return {
+        "bulkheads": {name: b.stats() for name, b in bulkheads.items()},
+        "pools": {"sync": pool_stats(engine), "async": pool_stats(async_engine.sync_engine)},
+        "threadpool": threadpool_stats(),
+        "writer": db_writer.stats(),
+    }
@@ -1,17 +1,160 @@
-from fastapi import APIRouter, UploadFile, File
-from app.services.upload_to_azure import upload_to_azure
+from typing import Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, UploadFile, File, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from jose import JWTError
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from app.core.auth import get_current_user
+from app.core.config import settings
+from app.core.db import get_db
+from app.models.user import User
+from app.services.storage import UploadTooLargeError, get_storage
+from app.services.uploads import (
+    store_upload,
+    find_asset_by_hash,
+    start_direct_upload,
+    decode_upload_token,
+    complete_direct_upload,
+    finalize_direct_upload,
+    find_asset_by_blob,
+)
 
 router = APIRouter(prefix="/api", tags=["image"])
 
+
+class UploadUrlIn(BaseModel):
+    filename: Optional[str] = None
+    contentType: Optional[str] = None
+    # 클라이언트가 미리 계산한 SHA-256 (있으면 이미 올라온 사진인지 먼저 확인)
+    sha256: Optional[str] = None
+
+
+class UploadCompleteIn(BaseModel):
+    uploadToken: str
+
+
+def _asset_out(asset) -> dict:
+    return {
+        "imageUrl": asset.url,
+        "thumbnailUrl": asset.thumbnail_url,
+        "variants": asset.variants,
+        "width": asset.width,
+        "height": asset.height,
+        "byteSize": asset.byte_size,
+        "dominantColor": asset.dominant_color,
+        "blurhash": asset.blurhash,
+    }
+
+
 @router.post("/image")
-async def upload_image(image: UploadFile = File(...)):
+async def upload_image(image: UploadFile = File(...), db: Session = Depends(get_db)):
     if not image.filename:
-        return {"error": "File name is missing."}, 400
+        raise HTTPException(status_code=400, detail="FILE_NAME_MISSING")
+
+    # 크기를 이미 알면 업로드 시작 전에 바로 거절
+    if image.size is not None and image.size > settings.UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="FILE_TOO_LARGE")
+
+    try:
+        asset = await store_upload(image, db=db)
+    except UploadTooLargeError:
+        raise HTTPException(status_code=413, detail="FILE_TOO_LARGE")
+
+    return _asset_out(asset)
+
+
+# ---------- 직접 업로드: URL 발급 ----------
+@router.post("/image/upload-url")
+def create_upload_url(
+    body: UploadUrlIn,
+    db: Session = Depends(get_db),
+    me: User = Depends(get_current_user),
+):
+    """
+    이미지 bytes 가 API 서버를 거치지 않도록 저장소 직접 업로드 URL 발급.
+    클라이언트는 uploadUrl 로 PUT 한 뒤 /api/image/complete 에 uploadToken 을 보냄.
+    """
+    if body.sha256:
+        existing = find_asset_by_hash(db, body.sha256.lower())
+        if existing is not None:
+            return {"uploadUrl": None, **_asset_out(existing)}
+
+    return start_direct_upload(me.user_id, body.filename, body.contentType)
+
+
+# ---------- 직접 업로드: 완료 콜백 ----------
+@router.post("/image/complete")
+def complete_upload(
+    body: UploadCompleteIn,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    me: User = Depends(get_current_user),
+):
+    try:
+        claims = decode_upload_token(body.uploadToken)
+    except JWTError:
+        raise HTTPException(status_code=400, detail="INVALID_UPLOAD_TOKEN")
+    if claims.get("sub") != str(me.user_id):
+        raise HTTPException(status_code=403, detail="forbidden")
+
+    # 같은 토큰으로 다시 부르면 그대로 응답 (파생본을 지우고 다시 만들지 않음)
+    existing = find_asset_by_blob(db, claims["blob"])
+    if existing is not None:
+        return _asset_out(existing)
+
+    try:
+        asset = complete_direct_upload(db, claims)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="UPLOAD_NOT_FOUND")
+    except UploadTooLargeError:
+        raise HTTPException(status_code=413, detail="FILE_TOO_LARGE")
+
+    # 해시/썸네일은 응답 후 백그라운드에서 (그 전까지 thumbnailUrl 은 null)
+    background_tasks.add_task(finalize_direct_upload, asset.id)
+    return _asset_out(asset)
+
+
+# ---------- 로컬 저장소용 직접 업로드 대상 (Azure 는 SAS URL 로 바로 올라감) ----------
+class _RequestBodyReader:
+    """request.stream() 을 storage.put_stream 이 쓰는 read(n) 형태로 감싸기"""
+
+    def __init__(self, request: Request):
+        self._chunks = request.stream().__aiter__()
+        self._buf = b""
+        self._done = False
 
-    blob_name = image.filename
+    async def read(self, size: int) -> bytes:
+        while not self._done and len(self._buf) < size:
+            try:
+                self._buf += await self._chunks.__anext__()
+            except StopAsyncIteration:
+                self._done = True
+        out, self._buf = self._buf[:size], self._buf[size:]
+        return out
 
-    contents = await image.read()
 
-    image_url = upload_to_azure(data=contents, blob_name=blob_name, content_type=image.content_type)
+@router.put("/image/direct/{blob_name:path}", status_code=201)
+async def direct_upload_local(
+    blob_name: str,
+    request: Request,
+    token: str = Query(...),
+    db: Session = Depends(get_db),
+):
+    storage = get_storage()
+    if storage.name != "local":
+        raise HTTPException(status_code=404, detail="Not Found")
+    try:
+        claims = await run_in_threadpool(decode_upload_token, token)
+    except JWTError:
+        raise HTTPException(status_code=403, detail="INVALID_UPLOAD_TOKEN")
+    if claims["blob"] != blob_name:
+        raise HTTPException(status_code=403, detail="INVALID_UPLOAD_TOKEN")
+    # 토큰은 한 번만: /complete 로 등록된 뒤에는 원본을 덮어쓸 수 없음
+    if await run_in_threadpool(find_asset_by_blob, db, blob_name) is not None:
+        raise HTTPException(status_code=409, detail="UPLOAD_ALREADY_COMPLETED")
 
-    return {"imageUrl" : image_url}
\ No newline at end of file
+    try:
+        await storage.put_stream(_RequestBodyReader(request), blob_name, content_type=claims.get("ct"))
+    except UploadTooLargeError:
+        raise HTTPException(status_code=413, detail="FILE_TOO_LARGE")
+    return {"blobName": blob_name}
@@ -0,0 +1,32 @@
+# app/routers/metrics.py
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.core.auth import require_metrics_access
+from app.core.bulkhead import bulkheads
+from app.core.db import async_engine, engine, pool_stats
+from app.core.metrics import metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+def _saturation_lines() -> str:
+    """/api/health/saturation 의 숫자들을 gauge 로"""
+    lines = [
+        "# HELP bulkhead_in_use 라우터 묶음별 사용 중인 자리",
+        "# TYPE bulkhead_in_use gauge",
+    ]
+    lines += [f'bulkhead_in_use{{group="{name}"}} {b.stats()["inUse"]}' for name, b in bulkheads.items()]
+    lines += ["# HELP bulkhead_rejected_total 라우터 묶음별 503 으로 거절한 요청 수", "# TYPE bulkhead_rejected_total counter"]
+    lines += [f'bulkhead_rejected_total{{group="{name}"}} {b.rejected}' for name, b in bulkheads.items()]
+    lines += ["# HELP db_pool_checked_out 사용 중인 DB 커넥션 수", "# TYPE db_pool_checked_out gauge"]
+    for name, eng in (("sync", engine), ("async", async_engine.sync_engine)):
+        stats = pool_stats(eng)
+        if "checkedOut" in stats:
+            lines.append(f'db_pool_checked_out{{pool="{name}"}} {stats["checkedOut"]}')
+    return "\n".join(lines) + "\n"
+
+
+@router.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_access)])
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render() + _saturation_lines(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,85 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from sqlalchemy import select, func, update
+from sqlalchemy.orm import Session
+
+from app.core.db import get_db
+from app.core.auth import get_current_user
+from app.models.user import User
+from app.models.notification import Notification
+from app.schemas.notification import NotificationOut, NotificationPageOut, NotificationReadIn
+
+router = APIRouter(prefix="/api/notifications", tags=["notifications"])
+
+
+def to_notification_out(n: Notification) -> NotificationOut:
+    return NotificationOut(
+        notification_id=n.id,
+        type=n.type,
+        posting_id=n.posting_id,
+        payload=n.payload or {},
+        is_read=n.is_read,
+        created_at=n.created_at,
+    )
+
+
+def _unread_count(db: Session, user_id: int) -> int:
+    return db.scalar(
+        select(func.count()).select_from(Notification)
+        .where(Notification.user_id == user_id, Notification.is_read.is_(False))
+    )
+
+
+# ---------- 알림함 (최신순, beforeId 로 다음 페이지) ----------
+@router.get("", response_model=NotificationPageOut)
+def list_notifications(
+    before_id: Optional[int] = Query(None, alias="beforeId", ge=1),
+    size: int = Query(20, ge=1, le=100),
+    unread_only: bool = Query(False, alias="unreadOnly"),
+    db: Session = Depends(get_db),
+    me: User = Depends(get_current_user),
+):
+    q = select(Notification).where(Notification.user_id == me.user_id)
+    if before_id is not None:
+        q = q.where(Notification.id < before_id)
+    if unread_only:
+        q = q.where(Notification.is_read.is_(False))
+    rows = db.execute(q.order_by(Notification.id.desc()).limit(size + 1)).scalars().all()
+
+    has_more = len(rows) > size
+    rows = rows[:size]
+    return NotificationPageOut(
+        unread_count=_unread_count(db, me.user_id),
+        data=[to_notification_out(n) for n in rows],
+        next_before_id=rows[-1].id if has_more else None,
+    )
+
+
+# ---------- 읽음 처리 (notificationIds 비우면 전부) ----------
+@router.post("/read", status_code=200)
+def mark_notifications_read(
+    body: NotificationReadIn,
+    db: Session = Depends(get_db),
+    me: User = Depends(get_current_user),
+):
+    stmt = update(Notification).where(Notification.user_id == me.user_id, Notification.is_read.is_(False))
+    if body.notification_ids:
+        stmt = stmt.where(Notification.id.in_(body.notification_ids))
+    updated = db.execute(stmt.values(is_read=True)).rowcount
+    db.commit()
+    return {"updated": updated, "unreadCount": _unread_count(db, me.user_id)}
+
+
+# ---------- 알림 삭제 ----------
+@router.delete("/{notification_id}", status_code=200)
+def delete_notification(
+    notification_id: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    me: User = Depends(get_current_user),
+):
+    n = db.get(Notification, notification_id)
+    if not n or n.user_id != me.user_id:
+        raise HTTPException(status_code=404, detail="notification_not_found")
+    db.delete(n)
+    db.commit()
+    return {"notificationId": notification_id}
@@ -1,23 +1,57 @@
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
-from sqlalchemy.orm import Session
-from sqlalchemy import select, func, desc, or_
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Path, File, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, desc, or_, exists, update
 from datetime import datetime, timezone
 
-from app.core.db import get_db
+from app.core.db import get_async_db
 from app.models.posting import Posting, PostingImage
 from app.models.favorite import Favorite
 from app.models.user import User
 from app.models.chat import ChatRoom
 from app.schemas.posting import (
-    PostingCreateIn, PostingUpdateIn, PostingOut, PostingListItem, PageOut, ChatExistOut
+    PostingCreateIn, PostingUpdateIn, PostingOut, PostingListItem, PageOut, ChatExistOut, PostingImageOut,
+    SuggestionOut,
 )
-from app.core.auth import get_current_user, get_current_user_optional
+from app.core.auth import get_current_user_async, get_current_user_optional_async
+from app.core.config import settings
+from app.services.uploads import build_posting_images
+from app.services.dedupe import duplicate_index
+from app.services.visual_search import visual_index, index_posting, embed_query
+from app.services.related import related_index
+from app.services.suggest import suggest_index
+from app.services.fuzzy import trigram_index, fuzzy_search
+from app.services.saved_search_matcher import notify_saved_searches
+from app.services.price_watch import notify_price_drop
+from app.services.feed_cache import feed_cache
 
 router = APIRouter(prefix="/api/postings", tags=["postings"])
 
 
 # ---------- helpers ----------
+def to_image_out(img: PostingImage) -> PostingImageOut:
+    return PostingImageOut(
+        url=img.url,
+        thumbnail_url=img.thumbnail_url,
+        width=img.width,
+        height=img.height,
+        byte_size=img.byte_size,
+        dominant_color=img.dominant_color,
+        blurhash=img.blurhash,
+    )
+
+
+def check_duplicates(images: List[PostingImage], exclude_posting_id: Optional[int] = None) -> Optional[List[int]]:
+    """DUPLICATE_POLICY 에 따라 같은 사진 쓴 게시물 id 목록 반환 (reject 면 409)"""
+    if settings.DUPLICATE_POLICY == "off":
+        return None
+    dup_ids = duplicate_index.find([img.phash for img in images], exclude_posting_id=exclude_posting_id)
+    if dup_ids and settings.DUPLICATE_POLICY == "reject":
+        raise HTTPException(status_code=409, detail="DUPLICATE_POSTING")
+    return dup_ids or None
+
+
 def to_posting_out(p: Posting, is_owner: Optional[bool] = None, is_favorite: Optional[bool] = None) -> PostingOut:
     def iso(dt):
         if not dt:
@@ -38,6 +72,7 @@ def to_posting_out(p: Posting, is_owner: Optional[bool] = None, is_favorite: Opt
         created_at=p.created_at,
         updated_at=p.updated_at,
         images=[img.url for img in (p.images or [])],
+        image_infos=[to_image_out(img) for img in (p.images or [])],
         is_owner=is_owner,
         is_favorite=is_favorite,
         status=p.status,
@@ -45,7 +80,7 @@ def to_posting_out(p: Posting, is_owner: Optional[bool] = None, is_favorite: Opt
 
 
 def to_list_item(p: Posting, is_favorite: bool = False) -> PostingListItem:
-    thumb = p.images[0].url if p.images else None
+    thumb = (p.images[0].thumbnail_url or p.images[0].url) if p.images else None
     return PostingListItem(
         posting_id=p.id,
         seller_id=p.seller_id,
@@ -58,6 +93,7 @@ def to_list_item(p: Posting, is_favorite: bool = False) -> PostingListItem:
         chat_count=p.chat_count,
         view_count=p.view_count,
         thumbnail=thumb,
+        thumbnail_info=to_image_out(p.images[0]) if p.images else None,
         is_favorite=is_favorite,
         status=p.status,
     )
@@ -65,10 +101,11 @@ def to_list_item(p: Posting, is_favorite: bool = False) -> PostingListItem:
 
 # ---------- 1) 게시물 생성 ----------
 @router.post("", response_model=PostingOut, status_code=200)
-def create_posting(
+async def create_posting(
     body: PostingCreateIn,
-    db: Session = Depends(get_db),
-    me: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    me: User = Depends(get_current_user_async),
 ):
     p = Posting(
         seller_id=me.user_id,
@@ -78,27 +115,64 @@ def create_posting(
         category=body.category,
     )
     db.add(p)
-    db.flush()  # id 확보
-
-    for url in body.images:
-        db.add(PostingImage(posting_id=p.id, url=str(url)))
-
-    db.commit()
-    db.refresh(p)
-    return to_posting_out(p, is_owner=True, is_favorite=False)
+    await db.flush()  # id 확보
+
+    # 동기 헬퍼는 run_sync 로 같은 세션/트랜잭션에서 실행
+    images = await db.run_sync(build_posting_images, p.id, body.images)
+    try:
+        dup_ids = check_duplicates(images)
+    except HTTPException:
+        await db.rollback()
+        raise
+    db.add_all(images)
+
+    await db.commit()
+    await db.refresh(p)
+    duplicate_index.add(p.id, [img.phash for img in p.images])
+    await db.run_sync(index_posting, p.id, [img.url for img in p.images])
+    related_index.upsert(p.id, p.category, p.title, p.content)
+    trigram_index.upsert(p.id, p.title)
+    feed_cache.add(p)
+
+    out = to_posting_out(p, is_owner=True, is_favorite=False)
+    out.duplicate_of = dup_ids
+
+    # 저장 검색 알림은 응답 보낸 뒤에
+    item = to_list_item(p)
+    background_tasks.add_task(notify_saved_searches, {
+        "postingId": p.id,
+        "title": p.title,
+        "content": p.content,
+        "category": p.category,
+        "price": p.price,
+        "sellerId": p.seller_id,
+        "thumbnail": str(item.thumbnail) if item.thumbnail else None,
+    })
+    return out
 
 
 # ---------- 2) 전체 리스트 조회 (토큰 불필요) ----------
 @router.get("", response_model=PageOut)
-def list_postings(
+async def list_postings(
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     sort: str = Query("latest", regex="^(latest|likeCount|chatCount|viewCount)$"),
     keyword: Optional[str] = None,
     category: Optional[str] = None,
-    db: Session = Depends(get_db),
-    me: Optional[User] = Depends(get_current_user_optional),   # ✅ optional
+    db: AsyncSession = Depends(get_async_db),
+    me: Optional[User] = Depends(get_current_user_optional_async),   # ✅ optional
 ):
+    exclude_seller_id = me.user_id if me else None
+
+    # 검색어 없는 목록은 카테고리별 캐시에서 id 만 가져와 IN 한 번으로 채움
+    cached = None
+    if not keyword:
+        cached = await db.run_sync(feed_cache.page, category or None, sort, page, size, exclude_seller_id)
+    if cached is not None:
+        total, ids = cached
+        rows = await _hydrate_ranked(db, ids)
+        return PageOut(page=page, size=size, total=total, data=await _to_list_items(db, rows, me))
+
     q = select(Posting)
 
     # 검색/카테고리
@@ -118,35 +192,104 @@ def list_postings(
         "chatCount": desc(Posting.chat_count),
         "viewCount": desc(Posting.view_count),
     }
-    q = q.order_by(sort_map.get(sort, desc(Posting.created_at)))
+    # 같은 값끼리는 id 역순 (캐시와 같은 순서, 페이지 경계 고정)
+    q = q.order_by(sort_map.get(sort, desc(Posting.created_at)), desc(Posting.id))
+
+    total = await db.scalar(select(func.count()).select_from(q.subquery()))
+    fuzzy = False
+    if total == 0 and keyword:
+        # 오타 등으로 일치하는 글이 없으면 제목 유사도 순으로 다시 찾음
+        total, rows = await db.run_sync(
+            lambda sync_db: fuzzy_search(
+                sync_db, keyword, category=category, exclude_seller_id=exclude_seller_id, page=page, size=size
+            )
+        )
+        fuzzy = total > 0
+    else:
+        rows = (await db.execute(q.offset((page - 1) * size).limit(size))).scalars().all()
+
+    return PageOut(page=page, size=size, total=total, data=await _to_list_items(db, rows, me), fuzzy=fuzzy)
 
-    total = db.scalar(select(func.count()).select_from(q.subquery()))
-    rows = db.execute(q.offset((page - 1) * size).limit(size)).scalars().all()
 
-    # (옵션) 토큰 있으면 is_favorite 계산 — 필요 없으면 이 블록 삭제해도 됨
+async def _to_list_items(db: AsyncSession, rows: List[Posting], me: Optional[User]) -> List[PostingListItem]:
+    # (옵션) 토큰 있으면 is_favorite 계산
     fav_ids: set[int] = set()
     if me and rows:
         post_ids = [p.id for p in rows]
         fav_ids = set(
-            db.execute(
+            (await db.execute(
                 select(Favorite.posting_id)
                 .where(Favorite.user_id == me.user_id, Favorite.posting_id.in_(post_ids))
-            ).scalars().all()
+            )).scalars().all()
         )
+    return [to_list_item(p, is_favorite=(p.id in fav_ids if me else False)) for p in rows]
+
+
+# ---------- 2-1) 비슷한 사진으로 검색 (토큰 불필요) ----------
+async def _hydrate_ranked(db: AsyncSession, posting_ids: List[int]) -> List[Posting]:
+    """IN 한 번으로 가져와서 검색 순위 순서대로 (그 사이 삭제된 글은 빠짐)"""
+    if not posting_ids:
+        return []
+    rows = (await db.execute(select(Posting).where(Posting.id.in_(posting_ids)))).scalars().all()
+    by_id = {p.id: p for p in rows}
+    return [by_id[pid] for pid in posting_ids if pid in by_id]
+
+
+@router.post("/search-by-image", response_model=PageOut)
+async def search_by_image(
+    file: UploadFile = File(...),
+    size: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+):
+    data = await file.read(settings.UPLOAD_MAX_BYTES + 1)
+    if len(data) > settings.UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="FILE_TOO_LARGE")
+    try:
+        query = await embed_query(data)
+    except Exception:
+        raise HTTPException(status_code=400, detail="INVALID_IMAGE")
+
+    hits = await run_in_threadpool(visual_index.search, query, size)
+    rows = await _hydrate_ranked(db, [pid for pid, _ in hits])
+    data = [to_list_item(p, is_favorite=False) for p in rows]
+    return PageOut(page=1, size=size, total=len(data), data=data)
+
+
+# ---------- 2-2) 검색어 자동완성 (토큰 불필요) ----------
+@router.get("/suggest", response_model=List[SuggestionOut])
+def suggest(
+    q: str = Query(..., max_length=50),
+    # trie 노드마다 SUGGEST_TOP_K 개만 들고 있어서 그보다 많이는 못 줌
+    size: int = Query(min(10, settings.SUGGEST_TOP_K), ge=1, le=settings.SUGGEST_TOP_K),
+):
+    return suggest_index.suggest(q, size)
+
+
+# ---------- 2-3) 맞춤 피드: 내 관심 카테고리 목록 (토큰 없거나 카테고리 미설정이면 전체) ----------
+@router.get("/feed", response_model=PageOut)
+async def feed(
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=100),
+    sort: str = Query("latest", regex="^(latest|likeCount|chatCount|viewCount)$"),
+    db: AsyncSession = Depends(get_async_db),
+    me: Optional[User] = Depends(get_current_user_optional_async),
+):
+    category = (me.category or None) if me else None
+    out = await list_postings(page=page, size=size, sort=sort, keyword=None, category=category, db=db, me=me)
+    if category and out.total == 0:
+        # 관심 카테고리에 글이 없으면 전체 목록
+        out = await list_postings(page=page, size=size, sort=sort, keyword=None, category=None, db=db, me=me)
+    return out
 
-    data: List[PostingListItem] = [
-        to_list_item(p, is_favorite=(p.id in fav_ids if me else False)) for p in rows
-    ]
-    return PageOut(page=page, size=size, total=total, data=data)
 
 # ---------- 3) 내 게시물 ----------
 @router.get("/my", response_model=PageOut)
-def my_postings(
+async def my_postings(
     status_filter: str = Query(..., alias="status", regex="^(selling|sold|purchased|favorite)$"),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
-    me: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    me: User = Depends(get_current_user_async),
 ):
     # ----- 판매중 / 판매완료(내가 판매자) -----
     if status_filter == "selling":
@@ -190,13 +333,13 @@ def my_postings(
         raise HTTPException(400, "Invalid status")
 
     # ----- 페이징 -----
-    total = db.scalar(select(func.count()).select_from(q.subquery()))
+    total = await db.scalar(select(func.count()).select_from(q.subquery()))
     rows = (
-        db.execute(
+        (await db.execute(
             q.order_by(desc(Posting.created_at))
             .offset((page - 1) * size)
             .limit(size)
-        )
+        ))
         .scalars()
         .all()
     )
@@ -204,10 +347,11 @@ def my_postings(
     # ----- 즐겨찾기 여부 계산 -----
     posting_ids = [p.id for p in rows]
     fav_map = {
-        f.posting_id: True
-        for f in db.query(Favorite)
-        .filter(Favorite.user_id == me.user_id, Favorite.posting_id.in_(posting_ids))
-        .all()
+        posting_id: True
+        for posting_id in (await db.execute(
+            select(Favorite.posting_id)
+            .where(Favorite.user_id == me.user_id, Favorite.posting_id.in_(posting_ids))
+        )).scalars().all()
     }
 
     # ----- list item 변환 -----
@@ -227,66 +371,71 @@ def my_postings(
 
 # ---------- 4) 특정 유저의 게시물 (특정 글 제외 지원) ----------
 @router.get("/user/{user_id}", response_model=PageOut)
-def postings_by_user(
+async def postings_by_user(
     user_id: int = Path(..., ge=1),
     exclude_posting_id: Optional[int] = Query(None, alias="postingId"),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     q = select(Posting).where(Posting.seller_id == user_id)
     if exclude_posting_id is not None:
         q = q.where(Posting.id != exclude_posting_id)
 
-    total = db.scalar(select(func.count()).select_from(q.subquery()))
-    rows = db.execute(q.order_by(desc(Posting.created_at)).offset((page-1)*size).limit(size)).scalars().all()
+    total = await db.scalar(select(func.count()).select_from(q.subquery()))
+    rows = (await db.execute(q.order_by(desc(Posting.created_at)).offset((page-1)*size).limit(size))).scalars().all()
     data = [to_list_item(p, is_favorite=False) for p in rows]
     return PageOut(page=page, size=size, total=total, data=data)
 
 # ---------- 5) 게시물 상세 (토큰 optional) ----------
 @router.get("/{posting_id}", response_model=PostingOut)
-def get_posting(
+async def get_posting(
     posting_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db),
-    me: Optional[User] = Depends(get_current_user_optional),  # ✅ optional
+    db: AsyncSession = Depends(get_async_db),
+    me: Optional[User] = Depends(get_current_user_optional_async),  # ✅ optional
 ):
-    p = db.get(Posting, posting_id)
+    p = await db.get(Posting, posting_id)
     if not p:
         raise HTTPException(status_code=404, detail="게시물 없음")
 
-    # 조회수 증가
-    p.view_count += 1
-    p.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(p)
+    # 조회수 증가 (복제본에서 읽은 값으로 덮어쓰지 않도록 primary 에서 +1)
+    await db.execute(
+        update(Posting)
+        .where(Posting.id == posting_id)
+        .values(view_count=Posting.view_count + 1, updated_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    await db.refresh(p)
+    feed_cache.update(p)
 
     # ✅ 토큰 있으면 is_owner / is_favorite 계산
     is_owner = bool(me and p.seller_id == me.user_id)
     is_favorite = False
     if me and not is_owner:
-        is_favorite = db.query(
-            db.query(Favorite)
-            .filter(Favorite.user_id == me.user_id, Favorite.posting_id == p.id)
-            .exists()
-        ).scalar()
+        is_favorite = await db.scalar(
+            select(exists().where(Favorite.user_id == me.user_id, Favorite.posting_id == p.id))
+        )
 
     return to_posting_out(p, is_owner=is_owner, is_favorite=is_favorite)
 
 
 # ---------- 6) 게시물 수정 ----------
 @router.patch("/{posting_id}", response_model=PostingOut)
-def update_posting(
+async def update_posting(
     posting_id: int,
     body: PostingUpdateIn,
-    db: Session = Depends(get_db),
-    me: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    me: User = Depends(get_current_user_async),
 ):
-    p = db.get(Posting, posting_id)
+    p = await db.get(Posting, posting_id)
     if not p:
         raise HTTPException(404, "게시물 없음")
     if p.seller_id != me.user_id:
         raise HTTPException(403, "권한 없음")
 
+    old_price, old_category = p.price, p.category
     if body.title is not None:
         p.title = body.title
     if body.price is not None:
@@ -296,57 +445,103 @@ def update_posting(
     if body.category is not None:
         p.category = body.category
 
+    dup_ids = None
     if body.images is not None:
+        images = await db.run_sync(build_posting_images, p.id, body.images)
+        dup_ids = check_duplicates(images, exclude_posting_id=p.id)
         p.images.clear()
-        db.flush()
-        for url in body.images:
-            db.add(PostingImage(posting_id=p.id, url=str(url)))
+        await db.flush()
+        db.add_all(images)
 
-    db.commit()
-    db.refresh(p)
-    return to_posting_out(p, is_owner=True, is_favorite=False)
+    await db.commit()
+    await db.refresh(p)
+    if body.images is not None:
+        duplicate_index.remove(p.id)
+        duplicate_index.add(p.id, [img.phash for img in p.images])
+        await db.run_sync(index_posting, p.id, [img.url for img in p.images])
+    related_index.upsert(p.id, p.category, p.title, p.content)
+    trigram_index.upsert(p.id, p.title)
+    feed_cache.update(p, old_category)
+
+    out = to_posting_out(p, is_owner=True, is_favorite=False)
+    out.duplicate_of = dup_ids
+
+    # 가격이 내려가면 찜한 사용자 알림 (응답 후 큐에 넣기만 함)
+    if p.price < old_price:
+        item = to_list_item(p)
+        background_tasks.add_task(notify_price_drop, {
+            "postingId": p.id,
+            "title": p.title,
+            "oldPrice": old_price,
+            "newPrice": p.price,
+            "thumbnail": str(item.thumbnail) if item.thumbnail else None,
+        })
+    return out
 
 
 # ---------- 7) 게시물 삭제 ----------
 @router.delete("/{posting_id}", status_code=200)
-def delete_posting(
+async def delete_posting(
     posting_id: int,
-    db: Session = Depends(get_db),
-    me: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    me: User = Depends(get_current_user_async),
 ):
-    p = db.get(Posting, posting_id)
+    p = await db.get(Posting, posting_id)
     if not p:
         raise HTTPException(404, "게시물 없음")
     if p.seller_id != me.user_id:
         raise HTTPException(403, "권한 없음")
 
-    db.delete(p)
-    db.commit()
+    category, seller_id = p.category, p.seller_id
+    await db.delete(p)
+    await db.commit()
+    duplicate_index.remove(posting_id)
+    visual_index.remove(posting_id)
+    related_index.remove(posting_id)
+    trigram_index.remove(posting_id)
+    feed_cache.remove(posting_id, category, seller_id)
     return {"postingId": posting_id}
 
+# ---------- 8) 비슷한 게시물 (토큰 불필요) ----------
+@router.get("/{posting_id}/related", response_model=PageOut)
+async def related_postings(
+    posting_id: int = Path(..., ge=1),
+    size: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if await db.get(Posting, posting_id) is None:
+        raise HTTPException(status_code=404, detail="게시물 없음")
+
+    # 판매완료 글은 빼고 보여주므로 넉넉히 뽑음 (점수 계산은 이벤트 루프 밖에서)
+    hits = await run_in_threadpool(related_index.related, posting_id, size * 2)
+    rows = [p for p in await _hydrate_ranked(db, [pid for pid, _ in hits]) if p.status != "SOLD"][:size]
+    data = [to_list_item(p, is_favorite=False) for p in rows]
+    return PageOut(page=1, size=size, total=len(data), data=data)
+
+
 @router.get("/{posting_id}/chat", response_model=ChatExistOut)
-def check_chat_exist(
+async def check_chat_exist(
     posting_id: int = Path(..., description="대상 게시글 ID"),
-    db: Session = Depends(get_db),
-    me: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    me: User = Depends(get_current_user_async),
 ):
     """
     해당 게시물에 대해 현재 로그인한 사용자가 가진 채팅방이 존재하는지 확인
     """
 
     # 1) 게시글 존재 여부 확인 (없으면 404)
-    posting = db.query(Posting).filter(Posting.id == posting_id).first()
+    posting = await db.get(Posting, posting_id)
     if not posting:
         raise HTTPException(status_code=404, detail="posting_not_found")  # 명세 404
 
     # 2) 현재 로그인한 유저(me)가 이 게시물에 대해 만든 채팅방이 있는지 확인
-    room = (
-        db.query(ChatRoom)
-        .filter(
+    room = await db.scalar(
+        select(ChatRoom)
+        .where(
             ChatRoom.posting_id == posting_id,
             ChatRoom.buyer_id == me.user_id,  # create_chat에서 쓰던 조건과 동일
         )
-        .first()
+        .limit(1)
     )
 
     if room:
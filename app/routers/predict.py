@@ -1,6 +1,7 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException
-from app.services.ai import predict_image
-from app.core.auth import get_current_user
+from fastapi import APIRouter, Depends, File, UploadFile, HTTPException
+from app.services.ai import predict_image, get_prediction_service, prediction_cache
+from app.services.price_estimator import price_estimator
+from app.core.auth import get_current_user, require_metrics_access
 
 router = APIRouter(prefix="/api", tags=["ai"])
 
@@ -8,7 +9,17 @@ router = APIRouter(prefix="/api", tags=["ai"])
 async def predict(file: UploadFile = File(...)):
     content = await file.read()
     try:
-        result = predict_image(content)
+        result = await predict_image(content)
     except Exception:
         raise HTTPException(status_code=400, detail="INVALID_IMAGE")
     return result
+
+
+@router.get("/predict/metrics", dependencies=[Depends(require_metrics_access)])
+async def predict_metrics():
+    """배치 큐 깊이 / 평균 배치 크기 / 단계별 지연시간 / 캐시 적중률 / 가격 추정 테이블 상태"""
+    return {
+        **get_prediction_service().metrics(),
+        "cache": prediction_cache.metrics(),
+        "priceEstimator": price_estimator.stats(),
+    }
@@ -0,0 +1,75 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Path
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from app.core.db import get_db
+from app.core.auth import get_current_user
+from app.core.config import settings
+from app.models.user import User
+from app.models.saved_search import SavedSearch
+from app.schemas.saved_search import SavedSearchCreateIn, SavedSearchOut
+from app.services.saved_search_matcher import saved_search_matcher, normalize_keyword
+
+router = APIRouter(prefix="/api/saved-searches", tags=["saved-searches"])
+
+
+def to_saved_search_out(s: SavedSearch) -> SavedSearchOut:
+    return SavedSearchOut(
+        saved_search_id=s.id,
+        keyword=s.keyword,
+        category=s.category,
+        max_price=s.max_price,
+        created_at=s.created_at,
+    )
+
+
+# ---------- 저장 검색 등록 ----------
+@router.post("", response_model=SavedSearchOut, status_code=201)
+def create_saved_search(
+    body: SavedSearchCreateIn,
+    db: Session = Depends(get_db),
+    me: User = Depends(get_current_user),
+):
+    keyword = normalize_keyword(body.keyword) or None
+    if not keyword and not body.category:
+        raise HTTPException(status_code=400, detail="KEYWORD_OR_CATEGORY_REQUIRED")
+
+    count = db.scalar(select(func.count()).select_from(SavedSearch).where(SavedSearch.user_id == me.user_id))
+    if count >= settings.SAVED_SEARCH_MAX_PER_USER:
+        raise HTTPException(status_code=409, detail="SAVED_SEARCH_LIMIT")
+
+    s = SavedSearch(user_id=me.user_id, keyword=keyword, category=body.category, max_price=body.max_price)
+    db.add(s)
+    db.commit()
+    db.refresh(s)
+    saved_search_matcher.add(s)
+    return to_saved_search_out(s)
+
+
+# ---------- 내 저장 검색 목록 ----------
+@router.get("", response_model=List[SavedSearchOut])
+def list_saved_searches(
+    db: Session = Depends(get_db),
+    me: User = Depends(get_current_user),
+):
+    rows = db.execute(
+        select(SavedSearch).where(SavedSearch.user_id == me.user_id).order_by(SavedSearch.id.desc())
+    ).scalars().all()
+    return [to_saved_search_out(s) for s in rows]
+
+
+# ---------- 저장 검색 삭제 ----------
+@router.delete("/{saved_search_id}", status_code=200)
+def delete_saved_search(
+    saved_search_id: int = Path(..., ge=1),
+    db: Session = Depends(get_db),
+    me: User = Depends(get_current_user),
+):
+    s = db.get(SavedSearch, saved_search_id)
+    if not s or s.user_id != me.user_id:
+        raise HTTPException(status_code=404, detail="saved_search_not_found")
+    db.delete(s)
+    db.commit()
+    saved_search_matcher.remove(saved_search_id)
+    return {"savedSearchId": saved_search_id}
@@ -1,26 +1,29 @@
 # app/routers/users.py  (네가 보낸 파일 상단 import 라인 수정)
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status, Path  # ✅ Path 추가
-from sqlalchemy.orm import Session
-from app.core.db import get_db
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.db import get_async_db
 from app.models.user import User
 from app.schemas.user import UserCreateIn, UserOut, MeUpdateIn
-from app.core.security import hash_password, get_current_user
+from app.core.security import hash_password, get_current_user_async
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
 @router.post("", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def create_user(payload: UserCreateIn, db: Session = Depends(get_db)):
-    if db.query(User).filter(User.email == payload.email).first():
+async def create_user(payload: UserCreateIn, db: AsyncSession = Depends(get_async_db)):
+    if await db.scalar(select(User.user_id).where(User.email == payload.email)):
         raise HTTPException(status_code=400, detail="EMAIL_DUPLICATE")
-    if db.query(User).filter(User.nickname == payload.nickname).first():
+    if await db.scalar(select(User.user_id).where(User.nickname == payload.nickname)):
         raise HTTPException(status_code=400, detail="NICKNAME_DUPLICATE")
 
     user = User(
         email=payload.email,
         nickname=payload.nickname,
         birth_date=payload.birth_date,
-        password_hash=hash_password(payload.password),
+        # argon2 해시는 CPU 를 오래 쓰므로 이벤트 루프 밖에서
+        password_hash=await run_in_threadpool(hash_password, payload.password),
         introduction="",
         image_url=None,
         category="",
@@ -30,27 +33,29 @@ def create_user(payload: UserCreateIn, db: Session = Depends(get_db)):
         updated_at=datetime.utcnow(),
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 @router.get("/me", response_model=UserOut)
-def get_me(current: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    me = db.query(User).filter(User.user_id == current.user_id).first()
+async def get_me(current: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    me = await db.scalar(select(User).where(User.user_id == current.user_id))
     if not me:
         raise HTTPException(status_code=404, detail="USER_NOT_FOUND")
     return me
 
 @router.patch("/me", response_model=UserOut)
-def update_me(payload: MeUpdateIn, current: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    me = db.query(User).filter(User.user_id == current.user_id).first()
+async def update_me(payload: MeUpdateIn, current: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    me = await db.scalar(select(User).where(User.user_id == current.user_id))
     if not me:
         raise HTTPException(status_code=404, detail="USER_NOT_FOUND")
 
     data = payload.model_dump(exclude_unset=True, by_alias=False)
 
     if "nickname" in data:
-        exists = db.query(User).filter(User.nickname == data["nickname"], User.user_id != me.user_id).first()
+        exists = await db.scalar(
+            select(User.user_id).where(User.nickname == data["nickname"], User.user_id != me.user_id)
+        )
         if exists:
             raise HTTPException(status_code=400, detail="NICKNAME_DUPLICATE")
         me.nickname = data["nickname"]
@@ -66,17 +71,17 @@ def update_me(payload: MeUpdateIn, current: User = Depends(get_current_user), db
         me.category = data["category"]
 
     me.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(me)
+    await db.commit()
+    await db.refresh(me)
     return me
 
 # ✅ 신규: 공개 유저 정보 조회 (토큰 불필요) - /api/users/{userId}
 @router.get("/{user_id}", response_model=UserOut, status_code=status.HTTP_200_OK)
-def get_user_by_id(
+async def get_user_by_id(
     user_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = await db.scalar(select(User).where(User.user_id == user_id))
     if not user:
         # 스펙의 404에 맞춰 메시지는 기존 스타일 유지
         raise HTTPException(status_code=404, detail="USER_NOT_FOUND")
@@ -0,0 +1,23 @@
+# app/schemas/notification.py
+from datetime import datetime
+from typing import List, Optional
+from .base import BaseSchema
+
+
+class NotificationOut(BaseSchema):
+    notification_id: int
+    type: str
+    posting_id: Optional[int] = None
+    payload: dict
+    is_read: bool
+    created_at: datetime
+
+
+class NotificationPageOut(BaseSchema):
+    unread_count: int
+    data: List[NotificationOut]
+    next_before_id: Optional[int] = None  # 다음 페이지 요청 시 beforeId 로 사용
+
+
+class NotificationReadIn(BaseSchema):
+    notification_ids: Optional[List[int]] = None  # 비우면 전부 읽음 처리
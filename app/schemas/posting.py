@@ -32,6 +32,12 @@ Category = Literal[
 
 class PostingImageOut(BaseSchema):
     url: HttpUrl
+    thumbnail_url: Optional[HttpUrl] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    byte_size: Optional[int] = None
+    dominant_color: Optional[str] = None
+    blurhash: Optional[str] = None
 
 class PostingCreateIn(BaseSchema):
     title: str
@@ -61,8 +67,10 @@ class PostingOut(BaseSchema):
     created_at: datetime
     updated_at: datetime
     images: List[HttpUrl]
+    image_infos: List[PostingImageOut] = Field(default_factory=list)  # images 와 같은 순서
     is_owner: Optional[bool] = None
     is_favorite: Optional[bool] = None  # ✅ 추가
+    duplicate_of: Optional[List[int]] = None  # 같은 사진을 쓴 기존 게시물 (생성/수정 응답에서만)
     status: str
 
 class PostingListItem(BaseSchema):
@@ -77,6 +85,7 @@ class PostingListItem(BaseSchema):
     chat_count: int
     view_count: int
     thumbnail: Optional[HttpUrl] = None
+    thumbnail_info: Optional[PostingImageOut] = None
     is_favorite: Optional[bool] = None  # ✅ 추가
     status: str
 
@@ -85,6 +94,12 @@ class PageOut(BaseSchema):
     size: int
     total: int
     data: List[PostingListItem]
+    fuzzy: bool = False  # keyword 일치 결과가 없어서 비슷한 제목으로 찾은 결과
+
+class SuggestionOut(BaseSchema):
+    text: str
+    type: Literal["term", "category"]
+    count: int  # 이 단어/카테고리를 쓴 게시물 수
 
 class ChatExistOut(BaseSchema):
     isExist: bool
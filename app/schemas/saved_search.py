@@ -0,0 +1,20 @@
+# app/schemas/saved_search.py
+from datetime import datetime
+from typing import Optional
+from pydantic import Field
+from .base import BaseSchema
+from .posting import Category
+
+
+class SavedSearchCreateIn(BaseSchema):
+    keyword: Optional[str] = Field(None, max_length=50)
+    category: Optional[Category] = None
+    max_price: Optional[int] = Field(None, ge=0)
+
+
+class SavedSearchOut(BaseSchema):
+    saved_search_id: int
+    keyword: Optional[str] = None
+    category: Optional[str] = None
+    max_price: Optional[int] = None
+    created_at: datetime
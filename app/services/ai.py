@@ -1,9 +1,276 @@
+# app/services/ai.py
+"""
+이미지 → 상품 라벨/가격대 예측.
+
+요청 흐름
+  1) 디코딩/리사이즈: 이미지 프로세스 풀 (Pillow draft 모드) → 코어 수만큼 병렬
+  2) 추론: 마이크로 배치 큐 (최대 PREDICT_MAX_BATCH 장 또는 PREDICT_MAX_WAIT_MS 까지 모아서 한 번에)
+     → 모델 러너는 스레드풀에서 실행되어 이벤트 루프를 막지 않음
+
+모델 러너는 ModelRunner 를 상속해서 PREDICT_RUNNER 설정("module:Class")으로 교체 가능.
+"""
+import asyncio
+import importlib
+import logging
+import time
+from typing import Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
 from PIL import Image
-from io import BytesIO
-
-def predict_image(file_bytes: bytes):
-    Image.open(BytesIO(file_bytes)).convert("RGB")
-    label = "sample_model"
-    candidates = [{"label": "sample_model", "score": 0.92}, {"label": "alt_model", "score": 0.73}]
-    price_low, price_high = 50000, 70000
-    return {"topLabel": label, "candidates": candidates, "priceRange": [price_low, price_high]}
+
+from app.core.config import settings
+from app.core.jobs import register_job
+from app.services.images import open_image, run_in_image_pool
+from app.services.predict_cache import PredictionCache, cache_key
+from app.services.price_estimator import price_estimator
+
+logger = logging.getLogger(__name__)
+
+
+# ---------- 모델 러너 ----------
+class ModelRunner:
+    """
+    predict_batch 입력: input_size x input_size RGB raw bytes 목록
+    labels / label_categories 는 가격대 추정(라벨별/카테고리별 분위수)에 사용
+    """
+
+    name = "base"
+    version = "0"
+    input_size = 224
+    labels: List[str] = []
+    label_categories: Dict[str, str] = {}
+
+    def predict_batch(self, images: List[bytes]) -> List[dict]:
+        raise NotImplementedError
+
+
+class SampleModelRunner(ModelRunner):
+    """실제 모델 붙이기 전 자리표시 러너 (고정 결과)"""
+
+    name = "sample"
+    version = "sample-1"
+    labels = ["sample_model", "alt_model"]
+
+    def predict_batch(self, images: List[bytes]) -> List[dict]:
+        candidates = [{"label": "sample_model", "score": 0.92}, {"label": "alt_model", "score": 0.73}]
+        return [{"topLabel": "sample_model", "candidates": candidates} for _ in images]
+
+
+def load_runner(spec: str) -> ModelRunner:
+    if not spec or spec == "sample":
+        return SampleModelRunner()
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr)()
+
+
+def decode_for_model(data: bytes, size: int) -> bytes:
+    """(프로세스 풀) 디코딩 + 정사각 리사이즈 → RGB raw bytes. JPEG 는 draft 로 축소 디코딩"""
+    im = open_image(data, max_side=size).convert("RGB")
+    return im.resize((size, size), Image.BILINEAR).tobytes()
+
+
+# ---------- 마이크로 배치 큐 ----------
+class _LatencyStats:
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def as_dict(self) -> dict:
+        avg = self.total_ms / self.count if self.count else 0.0
+        return {"count": self.count, "avgMs": round(avg, 3), "maxMs": round(self.max_ms, 3)}
+
+
+class PredictionService:
+    def __init__(self, runner: ModelRunner, max_batch: int, max_wait_ms: float):
+        self.runner = runner
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self.batches = 0
+        self.batched_items = 0
+        self.errors = 0
+        self.decode_latency = _LatencyStats()
+        self.queue_latency = _LatencyStats()
+        self.infer_latency = _LatencyStats()
+        self.total_latency = _LatencyStats()
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        # 이벤트 루프 안에서 처음 호출될 때 큐/워커 생성 (import 시점에는 루프가 없음)
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        return self._queue
+
+    async def predict(self, data: bytes) -> dict:
+        started = time.perf_counter()
+        pixels = await run_in_image_pool(decode_for_model, data, self.runner.input_size)
+        decoded = time.perf_counter()
+        self.decode_latency.observe((decoded - started) * 1000)
+
+        fut = asyncio.get_running_loop().create_future()
+        await self._ensure_worker().put((pixels, fut, decoded))
+        result = await fut
+        self.total_latency.observe((time.perf_counter() - started) * 1000)
+        return result
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            now = time.perf_counter()
+            for _, _, enqueued in batch:
+                self.queue_latency.observe((now - enqueued) * 1000)
+
+            try:
+                results = await run_in_threadpool(self.runner.predict_batch, [p for p, _, _ in batch])
+            except Exception as e:
+                self.errors += 1
+                for _, fut, _ in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+
+            self.infer_latency.observe((time.perf_counter() - now) * 1000)
+            self.batches += 1
+            self.batched_items += len(batch)
+            results = list(results)
+            if len(results) != len(batch):
+                # 결과가 모자라면 남은 요청이 영원히 기다리지 않게 실패 처리
+                self.errors += 1
+                logger.error("predict_batch returned %d results for %d inputs", len(results), len(batch))
+            for i, (_, fut, _) in enumerate(batch):
+                if fut.done():
+                    continue
+                if i < len(results):
+                    fut.set_result(results[i])
+                else:
+                    fut.set_exception(RuntimeError(f"model returned {len(results)} results for {len(batch)} inputs"))
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+    def metrics(self) -> dict:
+        return {
+            "model": self.runner.name,
+            "modelVersion": self.runner.version,
+            "queueDepth": self._queue.qsize() if self._queue else 0,
+            "maxBatch": self.max_batch,
+            "maxWaitMs": self.max_wait * 1000,
+            "batches": self.batches,
+            "avgBatchSize": round(self.batched_items / self.batches, 3) if self.batches else 0.0,
+            "errors": self.errors,
+            "latency": {
+                "decode": self.decode_latency.as_dict(),
+                "queue": self.queue_latency.as_dict(),
+                "infer": self.infer_latency.as_dict(),
+                "total": self.total_latency.as_dict(),
+            },
+        }
+
+
+_service: Optional[PredictionService] = None
+prediction_cache = PredictionCache(settings.PREDICT_CACHE_SIZE, settings.PREDICT_CACHE_PATH)
+# 같은 사진이 동시에 여러 번 들어오면 추론은 한 번만
+_inflight: dict = {}
+
+# 이보다 큰 이미지는 해시 계산도 스레드풀에서 (hashlib 은 GIL 을 풀어줌)
+_INLINE_HASH_BYTES = 256 * 1024
+
+
+def get_prediction_service() -> PredictionService:
+    global _service
+    if _service is None:
+        _service = PredictionService(
+            load_runner(settings.PREDICT_RUNNER),
+            max_batch=settings.PREDICT_MAX_BATCH,
+            max_wait_ms=settings.PREDICT_MAX_WAIT_MS,
+        )
+    return _service
+
+
+async def close_prediction_service() -> None:
+    global _service
+    if _service is not None:
+        await _service.close()
+        _service = None
+
+
+async def _predict_cached(file_bytes: bytes) -> dict:
+    """내용 해시 + 모델 버전으로 캐시 조회. 적중하면 디코딩/추론 모두 건너뜀"""
+    service = get_prediction_service()
+    if len(file_bytes) <= _INLINE_HASH_BYTES:
+        key = cache_key(file_bytes, service.runner.version)
+    else:
+        key = await run_in_threadpool(cache_key, file_bytes, service.runner.version)
+
+    result = prediction_cache.get(key)
+    if result is not None:
+        return result
+    if key in _inflight:
+        return await asyncio.shield(_inflight[key])
+    if prediction_cache.persistent:
+        result = await run_in_threadpool(prediction_cache.load, key)
+        if result is not None:
+            return result
+
+    prediction_cache.misses += 1
+    # 추론은 요청과 분리된 task 에서 → 먼저 온 요청이 끊겨도(취소) 같은 사진을 기다리는 다른 요청은 그대로 결과를 받음
+    task = asyncio.get_running_loop().create_task(_predict_and_store(service, key, file_bytes))
+    _inflight[key] = task
+    task.add_done_callback(lambda t: _inflight_done(key, t))
+    return await asyncio.shield(task)
+
+
+async def _predict_and_store(service: PredictionService, key: str, file_bytes: bytes) -> dict:
+    result = await service.predict(file_bytes)
+    if prediction_cache.persistent:
+        await run_in_threadpool(prediction_cache.put, key, result)
+    else:
+        prediction_cache.put(key, result)
+    return result
+
+
+def _inflight_done(key: str, task: asyncio.Task) -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        task.exception()  # 기다리는 쪽이 다 끊겼어도 경고 안 뜨게
+
+
+# 판매 데이터가 부족할 때 기본 가격대
+DEFAULT_PRICE_RANGE = (50000, 70000)
+
+
+def _refresh_prices(db) -> None:
+    runner = get_prediction_service().runner
+    price_estimator.set_labels(runner.labels, runner.label_categories)
+    price_estimator.refresh(db)
+
+
+register_job("price_estimator", settings.PRICE_REFRESH_SECONDS, _refresh_prices)
+
+
+async def predict_image(file_bytes: bytes) -> dict:
+    result = await _predict_cached(file_bytes)
+    price_low, price_high = price_estimator.lookup(result.get("topLabel"), result.get("category")) or DEFAULT_PRICE_RANGE
+    return {**result, "priceRange": [price_low, price_high]}
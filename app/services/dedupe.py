@@ -0,0 +1,138 @@
+# app/services/dedupe.py
+"""
+같은 사진으로 다시 올린 게시물 탐지.
+
+게시물 이미지의 dHash(64bit)를 multi-index hash 에 넣어두고 해밍 거리 반경 검색.
+(BK-tree 는 서로 다른 사진끼리 거리가 32 근처에 몰려 있어서 가지치기가 거의 안 됨 →
+ 20만 장에서 10ms 이상. 조각 dict 방식은 같은 규모에서 수십 µs)
+앱 시작 시(이후 주기적으로) DB 에서 다시 만들고, 게시물 생성/수정/삭제 때 바로 반영.
+"""
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.jobs import register_job
+from app.models.posting import PostingImage
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class MultiIndexHash:
+    """
+    64bit 해시 반경 검색용 인덱스 (multi-index hashing).
+
+    해시를 radius+1 조각으로 나누면, 해밍 거리 radius 이하인 두 해시는 비둘기집 원리로
+    최소 한 조각이 완전히 같음 → 조각별 dict 로 후보만 뽑고 전체 거리는 후보에만 계산.
+    """
+
+    def __init__(self, radius: int, bits: int = 64):
+        self.radius = radius
+        n = radius + 1
+        base, extra = divmod(bits, n)
+        self._spans = []  # (shift, mask)
+        shift = bits
+        for i in range(n):
+            width = base + (1 if i < extra else 0)
+            shift -= width
+            self._spans.append((shift, (1 << width) - 1))
+        self._tables: List[Dict[int, Set[int]]] = [{} for _ in self._spans]
+        self._values: Dict[int, Set] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self._values)
+
+    def add(self, h: int, value) -> None:
+        values = self._values.get(h)
+        if values is None:
+            values = self._values[h] = set()
+            for table, (shift, mask) in zip(self._tables, self._spans):
+                table.setdefault((h >> shift) & mask, set()).add(h)
+        values.add(value)
+
+    def discard(self, h: int, value) -> None:
+        values = self._values.get(h)
+        if values is None:
+            return
+        values.discard(value)
+        if not values:
+            del self._values[h]
+            for table, (shift, mask) in zip(self._tables, self._spans):
+                bucket = table.get((h >> shift) & mask)
+                if bucket is not None:
+                    bucket.discard(h)
+                    if not bucket:
+                        del table[(h >> shift) & mask]
+
+    def search(self, h: int) -> List[tuple]:
+        """반경 내 (거리, 값) 목록"""
+        candidates: Set[int] = set()
+        for table, (shift, mask) in zip(self._tables, self._spans):
+            bucket = table.get((h >> shift) & mask)
+            if bucket:
+                candidates.update(bucket)
+        out = []
+        for c in candidates:
+            d = hamming(h, c)
+            if d <= self.radius:
+                out.extend((d, v) for v in self._values[c])
+        return out
+
+
+class DuplicateIndex:
+    def __init__(self):
+        self._tree = MultiIndexHash(settings.DUPLICATE_MAX_DISTANCE)
+        # posting_id → 등록된 해시들 (삭제/수정 때 제거용)
+        self._by_posting: Dict[int, Set[int]] = {}
+        self._lock = threading.Lock()
+
+    def rebuild(self, db: Session) -> int:
+        rows = db.execute(
+            select(PostingImage.posting_id, PostingImage.phash).where(PostingImage.phash.is_not(None))
+        ).all()
+        tree = MultiIndexHash(settings.DUPLICATE_MAX_DISTANCE)
+        by_posting: Dict[int, Set[int]] = {}
+        for pid, phash in rows:
+            h = int(phash, 16)
+            tree.add(h, pid)
+            by_posting.setdefault(pid, set()).add(h)
+        with self._lock:
+            self._tree, self._by_posting = tree, by_posting
+        return len(rows)
+
+    def add(self, posting_id: int, phashes: Iterable[Optional[str]]) -> None:
+        hashes = {int(p, 16) for p in phashes if p}
+        with self._lock:
+            for h in hashes:
+                self._tree.add(h, posting_id)
+            self._by_posting.setdefault(posting_id, set()).update(hashes)
+
+    def remove(self, posting_id: int) -> None:
+        with self._lock:
+            for h in self._by_posting.pop(posting_id, ()):
+                self._tree.discard(h, posting_id)
+
+    def find(self, phashes: Iterable[Optional[str]], exclude_posting_id: Optional[int] = None) -> List[int]:
+        """사진 중 하나라도 가까운 해시를 가진 기존 게시물 id (가까운 순)"""
+        best: Dict[int, int] = {}
+        with self._lock:
+            for p in phashes:
+                if not p:
+                    continue
+                for d, pid in self._tree.search(int(p, 16)):
+                    if pid != exclude_posting_id and d < best.get(pid, 65):
+                        best[pid] = d
+        return sorted(best, key=lambda pid: (best[pid], pid))
+
+    def stats(self) -> dict:
+        return {"hashes": self._tree.size, "postings": len(self._by_posting)}
+
+
+duplicate_index = DuplicateIndex()
+
+register_job("duplicate_index", settings.DUPLICATE_REBUILD_SECONDS, duplicate_index.rebuild)
@@ -0,0 +1,78 @@
+# app/services/embeddings.py
+"""
+이미지 임베딩 (비슷한 상품 사진 검색용, CPU 전용).
+
+기본 추출기 ColorLayoutExtractor 는 모델 없이 계산하는 128차원 벡터
+  - 4x4x4 RGB 색 히스토그램 (64)  : 어떤 색이 얼마나 있는지
+  - 8x8 흑백 레이아웃 (64)        : 대략적인 모양/배치
+두 부분을 각각 L2 정규화 후 이어붙여 전체도 단위 벡터 → 내적 = 코사인 유사도.
+
+EMBEDDING_EXTRACTOR 에 "module:Class" 를 주면 다른 추출기(예: ONNX CNN)로 교체 가능.
+추출기 버전이 바뀌면 저장된 벡터는 검색 인덱스에서 제외된다.
+"""
+import importlib
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+from app.core.config import settings
+
+
+class EmbeddingExtractor:
+    name = "base"
+    version = "0"
+    dim = 0
+
+    def extract(self, im: Image.Image) -> np.ndarray:
+        """RGB 이미지 → float32 단위 벡터 (dim,)"""
+        raise NotImplementedError
+
+
+def _l2(v: np.ndarray) -> np.ndarray:
+    n = np.linalg.norm(v)
+    return v / n if n > 0 else v
+
+
+class ColorLayoutExtractor(EmbeddingExtractor):
+    name = "color-layout"
+    version = "color-layout-1"
+    dim = 128
+
+    def extract(self, im: Image.Image) -> np.ndarray:
+        small = im.convert("RGB")
+        small.thumbnail((64, 64), Image.BILINEAR)
+        rgb = np.asarray(small, dtype=np.uint8).reshape(-1, 3)
+
+        # 4단계 양자화 → 64 bin 히스토그램 (sqrt 로 큰 bin 영향 완화)
+        q = (rgb >> 6).astype(np.int64)
+        hist = np.bincount(q[:, 0] * 16 + q[:, 1] * 4 + q[:, 2], minlength=64).astype(np.float32)
+        hist = _l2(np.sqrt(hist))
+
+        layout = np.asarray(small.convert("L").resize((8, 8), Image.BILINEAR), dtype=np.float32).ravel()
+        layout = _l2(layout - layout.mean())
+
+        return (np.concatenate([hist, layout]) / np.sqrt(2)).astype(np.float32)
+
+
+_extractor: Optional[EmbeddingExtractor] = None
+
+
+def get_extractor() -> EmbeddingExtractor:
+    global _extractor
+    if _extractor is None:
+        spec = settings.EMBEDDING_EXTRACTOR
+        if not spec or spec == ColorLayoutExtractor.name:
+            _extractor = ColorLayoutExtractor()
+        else:
+            module_name, _, attr = spec.partition(":")
+            _extractor = getattr(importlib.import_module(module_name), attr)()
+    return _extractor
+
+
+def embed_bytes(data: bytes) -> bytes:
+    """(프로세스 풀) 검색 질의 이미지 → float16 벡터 bytes"""
+    from app.services.images import open_image
+
+    vec = get_extractor().extract(open_image(data, max_side=256))
+    return vec.astype(np.float16).tobytes()
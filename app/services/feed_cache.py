@@ -0,0 +1,280 @@
+# app/services/feed_cache.py
+"""
+카테고리별 목록(list_postings, /feed) 앞쪽 페이지 캐시.
+
+(카테고리, 정렬) 마다 상위 FEED_CACHE_DEPTH 개 게시물의 (정렬키, id) 를 정렬된 리스트로 들고 있고
+카테고리/판매자별 게시물 수도 같이 세어 둠 → 페이지 조회는 id 슬라이스 + IN 한 번으로 끝.
+
+- 리스트는 항상 "전체 정렬 순서의 앞부분" 이 되도록 유지:
+  생성/수정/조회수·찜·채팅수 변경 때 기존 항목을 빼고, 리스트 마지막보다 앞이면 다시 끼워 넣음
+  (뒤로 밀려난 글은 그냥 빠지고, 리스트가 짧아져서 요청 페이지를 못 채우면 DB 에서 다시 채움)
+- 리스트는 처음 요청될 때 만들고, 주기 작업이 개수를 다시 세면서 전부 비움 (다른 경로로 바뀐 값 정리)
+- 캐시 깊이를 넘는 페이지, keyword 검색, 처음 보는 카테고리는 기존처럼 DB 쿼리
+- 거래 상태(SELLING/RESERVED/SOLD)는 목록 포함 여부와 무관하고, 내용은 IN 조회로 새로 읽으므로 따로 반영 안 함
+- 변경 반영(add/update/remove)은 그 요청을 처리한 워커 프로세스의 캐시에만 됨.
+  워커가 여럿이면 다른 워커의 캐시는 다음 rebuild 까지 옛 순서/개수로 답함 →
+  FEED_CACHE_SYNC_SECONDS > 0 이면 그 주기마다 DB 의 (게시물 수, max(updated_at)) 를 확인해서
+  마지막 rebuild 때와 다르면 바로 rebuild (오래돼도 그 주기 + 요청 간격까지). 워커 1개면 0 으로 둬도 됨
+"""
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import read_primary
+from app.core.jobs import register_job
+from app.models.posting import Posting
+
+SORT_COLUMNS = {
+    "latest": Posting.created_at,
+    "likeCount": Posting.like_count,
+    "chatCount": Posting.chat_count,
+    "viewCount": Posting.view_count,
+}
+
+Key = Tuple[float, int]
+
+
+def _sort_key(sort: str, value, posting_id: int) -> Key:
+    # 오름차순으로 정렬했을 때 "값 desc, id desc" 가 되도록 부호를 뒤집음
+    if sort == "latest":
+        value = value.timestamp() if value is not None else 0.0
+    return (-(value or 0), -posting_id)
+
+
+class _FeedList:
+    __slots__ = ("keys", "sellers")
+
+    def __init__(self):
+        self.keys: List[Key] = []
+        self.sellers: Dict[int, Tuple[Key, int]] = {}  # id → (정렬키, 판매자)
+
+    def drop(self, posting_id: int) -> None:
+        entry = self.sellers.pop(posting_id, None)
+        if entry is not None:
+            del self.keys[bisect_left(self.keys, entry[0])]
+
+
+class FeedCache:
+    def __init__(self, depth: int, sync_seconds: float = 0):
+        self.depth = depth
+        self.sync_seconds = sync_seconds
+        self._lists: Dict[Tuple[Optional[str], str], _FeedList] = {}
+        # category → 게시물 수 (None 은 전체), (category, seller_id) → 게시물 수
+        self._counts: Counter = Counter()
+        self._seller_counts: Counter = Counter()
+        self._lock = threading.Lock()
+        # 카테고리별 변경 횟수 + rebuild 횟수: 락 밖에서 리스트를 읽어 오는 동안 바뀌었는지 확인용
+        self._versions: Counter = Counter()
+        self._epoch = 0
+        # 첫 rebuild 전에는 조회/반영 모두 하지 않음
+        self.enabled = False
+        # 마지막 rebuild 때 DB 상태 (다른 워커가 바꿨는지 확인용) / 다음 확인 시각
+        self._signature: Optional[tuple] = None
+        self._next_sync = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+
+    # ---------- 주기 작업 ----------
+    def _db_signature(self, db: Session) -> tuple:
+        with read_primary(db):
+            return tuple(db.execute(select(func.count(), func.max(Posting.updated_at))).one())
+
+    def rebuild(self, db: Session) -> int:
+        signature = self._db_signature(db) if self.sync_seconds > 0 else None
+        with read_primary(db):
+            rows = db.execute(
+                select(Posting.category, Posting.seller_id, func.count()).group_by(Posting.category, Posting.seller_id)
+            ).all()
+        counts: Counter = Counter()
+        seller_counts: Counter = Counter()
+        for category, seller_id, n in rows:
+            for cat in (category, None):
+                counts[cat] += n
+                seller_counts[(cat, seller_id)] += n
+        with self._lock:
+            self._counts = counts
+            self._seller_counts = seller_counts
+            self._lists = {}
+            self._epoch += 1
+            self._signature = signature
+            self._next_sync = time.monotonic() + self.sync_seconds
+            self.enabled = True
+        return counts[None]
+
+    def _sync(self, db: Session) -> None:
+        """sync_seconds 마다 한 번: 다른 워커가 게시물을 추가/수정/삭제했으면 rebuild"""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_sync:
+                return
+            self._next_sync = now + self.sync_seconds
+            known = self._signature
+        if self._db_signature(db) != known:
+            self.rebuild(db)
+
+    # ---------- 변경 반영 (커밋 뒤에 호출) ----------
+    def _place(self, category: Optional[str], p: Posting) -> None:
+        for sort, column in SORT_COLUMNS.items():
+            lst = self._lists.get((category, sort))
+            if lst is None:
+                continue
+            lst.drop(p.id)
+            key = _sort_key(sort, getattr(p, column.key), p.id)
+            # 이 글을 뺀 나머지가 전부 리스트에 있거나, 리스트 마지막보다 앞일 때만 넣을 수 있음
+            complete = len(lst.keys) >= self._counts[category] - 1
+            if not complete and not (lst.keys and key < lst.keys[-1]):
+                continue
+            insort(lst.keys, key)
+            lst.sellers[p.id] = (key, p.seller_id)
+            if len(lst.keys) > self.depth:
+                lst.sellers.pop(-lst.keys.pop()[1], None)
+
+    def _drop(self, category: Optional[str], posting_id: int) -> None:
+        for sort in SORT_COLUMNS:
+            lst = self._lists.get((category, sort))
+            if lst is not None:
+                lst.drop(posting_id)
+
+    def _touch(self, *categories: Optional[str]) -> None:
+        for cat in set(categories) | {None}:
+            self._versions[cat] += 1
+
+    def _count(self, category: Optional[str], seller_id: int, delta: int) -> None:
+        for cat in (category, None):
+            self._counts[cat] += delta
+            self._seller_counts[(cat, seller_id)] += delta
+
+    def add(self, p: Posting) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._touch(p.category)
+            self._count(p.category, p.seller_id, 1)
+            self._place(p.category, p)
+            self._place(None, p)
+
+    def update(self, p: Posting, old_category: Optional[str] = None) -> None:
+        """정렬값(조회수/찜/채팅수)이나 카테고리가 바뀐 뒤. old_category 는 바뀌기 전 카테고리"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._touch(p.category, old_category)
+            if old_category is not None and old_category != p.category:
+                self._drop(old_category, p.id)
+                self._count(old_category, p.seller_id, -1)
+                self._count(p.category, p.seller_id, 1)
+            self._place(p.category, p)
+            self._place(None, p)
+
+    def remove(self, posting_id: int, category: Optional[str], seller_id: int) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._touch(category)
+            self._drop(category, posting_id)
+            self._drop(None, posting_id)
+            self._count(category, seller_id, -1)
+
+    # ---------- 조회 ----------
+    def _fetch(self, db: Session, category: Optional[str], sort: str) -> list:
+        column = SORT_COLUMNS[sort]
+        q = select(Posting.id, Posting.seller_id, column)
+        if category is not None:
+            q = q.where(Posting.category == category)
+        # 모든 요청이 같이 쓰는 리스트라 복제 지연된 값으로 채우지 않게 primary 에서
+        with read_primary(db):
+            return db.execute(q.order_by(column.desc(), Posting.id.desc()).limit(self.depth)).all()
+
+    def _install(self, category: Optional[str], sort: str, rows: list) -> None:
+        lst = _FeedList()
+        for pid, seller_id, value in rows:
+            key = _sort_key(sort, value, pid)
+            lst.keys.append(key)
+            lst.sellers[pid] = (key, seller_id)
+        lst.keys.sort()
+        self._lists[(category, sort)] = lst
+        self.loads += 1
+
+    def _slice(self, lst: _FeedList, start: int, end: int, exclude_seller_id: Optional[int]) -> List[int]:
+        if exclude_seller_id is None:
+            return [-k[1] for k in lst.keys[start:end]]
+        out: List[int] = []
+        seen = 0
+        for k in lst.keys:
+            if lst.sellers[-k[1]][1] == exclude_seller_id:
+                continue
+            if seen >= start:
+                out.append(-k[1])
+                if len(out) >= end - start:
+                    break
+            seen += 1
+        return out
+
+    def page(
+        self,
+        db: Session,
+        category: Optional[str],
+        sort: str,
+        page: int,
+        size: int,
+        exclude_seller_id: Optional[int] = None,
+    ) -> Optional[Tuple[int, List[int]]]:
+        """(total, 해당 페이지 id 목록). 캐시로 답할 수 없으면 None → 호출한 쪽이 DB 쿼리"""
+        start, end = (page - 1) * size, page * size
+        if not self.enabled or sort not in SORT_COLUMNS or end > self.depth:
+            return None
+        if self.sync_seconds > 0:
+            self._sync(db)
+        for attempt in range(2):
+            with self._lock:
+                if category is not None and category not in self._counts:
+                    return None
+                total = self._counts[category]
+                if exclude_seller_id is not None:
+                    total -= self._seller_counts[(category, exclude_seller_id)]
+                want = min(end, total) - start
+
+                lst = self._lists.get((category, sort))
+                if lst is not None:
+                    ids = self._slice(lst, start, end, exclude_seller_id)
+                    if len(ids) >= want:
+                        self.hits += 1
+                        return total, ids
+                    if attempt or len(lst.keys) >= min(self.depth, self._counts[category]):
+                        # 내 글 제외로 모자라는 경우 등
+                        self.misses += 1
+                        return None
+                # 처음이거나, 뒤로 밀려나고 삭제돼서 리스트가 짧아짐 → 다시 채움
+                stamp = (self._epoch, self._versions[category])
+
+            # DB 조회는 락 밖에서 (async 세션 run_sync 안에서 락을 쥔 채 이벤트 루프로 넘어가지 않게)
+            rows = self._fetch(db, category, sort)
+            with self._lock:
+                if (self._epoch, self._versions[category]) != stamp:
+                    # 읽는 사이에 바뀜 → 이번 요청은 DB 로
+                    self.misses += 1
+                    return None
+                self._install(category, sort, rows)
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "lists": len(self._lists),
+            "postings": self._counts[None],
+            "hits": self.hits,
+            "misses": self.misses,
+            "loads": self.loads,
+        }
+
+
+feed_cache = FeedCache(settings.FEED_CACHE_DEPTH, settings.FEED_CACHE_SYNC_SECONDS)
+
+register_job("feed_cache", settings.FEED_REBUILD_SECONDS, feed_cache.rebuild)
@@ -0,0 +1,210 @@
+# app/services/fuzzy.py
+"""
+오타 허용 검색 (keyword 로 아무것도 안 나올 때 제목 trigram 유사도로 다시 찾기).
+
+- PostgreSQL: pg_trgm 의 word_similarity() / %> 연산자 + postings.title GIN 인덱스 (마이그레이션)
+- SQLite 등  : 같은 규칙으로 만든 trigram 역색인을 메모리에 두고 사용
+  (게시물 생성/수정/삭제 때 바로 반영, 주기 작업이 updated_at 이후 바뀐 글/삭제된 글 정리)
+
+trigram 규칙은 pg_trgm 과 같게 맞춤: 소문자, 단어마다 앞에 공백 2개 뒤에 1개 붙여서 3글자씩.
+제목 전체와 비교하면 긴 제목일수록 점수가 낮아지므로 word_similarity 처럼
+"제목 trigram 중 연속 구간 하나" 와의 유사도(공통 / 합집합) 최댓값을 씀
+"""
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.jobs import register_job
+from app.models.posting import Posting
+
+_WORD = re.compile(r"[0-9a-z가-힣]+")
+
+
+def ordered_trigrams(value: str) -> List[str]:
+    out: List[str] = []
+    for word in _WORD.findall((value or "").lower()):
+        w = f"  {word} "
+        out.extend(w[i:i + 3] for i in range(len(w) - 2))
+    return out
+
+
+def trigrams(value: str) -> Set[str]:
+    return set(ordered_trigrams(value))
+
+
+def word_similarity(query: Set[str], ordered: List[str]) -> float:
+    """query 와 ordered 의 연속 구간 중 가장 비슷한 것의 유사도 (pg_trgm word_similarity 와 같은 정의)"""
+    best = 0.0
+    for i, first in enumerate(ordered):
+        # 최적 구간은 공통 trigram 에서 시작함
+        if first not in query:
+            continue
+        seen: Set[str] = set()
+        shared = 0
+        for g in ordered[i:]:
+            if g in seen:
+                continue
+            seen.add(g)
+            if g in query:
+                shared += 1
+                best = max(best, shared / (len(query) + len(seen) - shared))
+    return best
+
+
+def use_pg_trgm(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+class TrigramIndex:
+    def __init__(self):
+        self._grams: Dict[int, List[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._cursor: Optional[datetime] = None
+        self._lock = threading.Lock()
+        # 첫 refresh 전(및 Postgres)에는 생성/수정 반영도 하지 않음
+        self.enabled = False
+
+    def _add(self, posting_id: int, grams: List[str]) -> None:
+        self._grams[posting_id] = grams
+        for g in set(grams):
+            self._postings.setdefault(g, set()).add(posting_id)
+
+    def _discard(self, posting_id: int) -> None:
+        for g in self._grams.pop(posting_id, ()):
+            ids = self._postings.get(g)
+            if ids is not None:
+                ids.discard(posting_id)
+                if not ids:
+                    del self._postings[g]
+
+    def upsert(self, posting_id: int, title: str) -> None:
+        if not self.enabled:
+            return
+        grams = ordered_trigrams(title)
+        with self._lock:
+            if self._grams.get(posting_id) == grams:
+                return
+            self._discard(posting_id)
+            self._add(posting_id, grams)
+
+    def remove(self, posting_id: int) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._discard(posting_id)
+
+    def refresh(self, db: Session) -> int:
+        q = select(Posting.id, Posting.title, Posting.updated_at)
+        if self._cursor is not None:
+            q = q.where(Posting.updated_at >= self._cursor)
+        rows = db.execute(q).all()
+        alive = set(db.execute(select(Posting.id)).scalars().all())
+
+        self.enabled = True
+        with self._lock:
+            for pid in [pid for pid in self._grams if pid not in alive]:
+                self._discard(pid)
+        cursor = self._cursor
+        for pid, title, updated_at in rows:
+            self.upsert(pid, title)
+            if updated_at is not None and (cursor is None or updated_at > cursor):
+                cursor = updated_at
+        self._cursor = cursor
+        return len(rows)
+
+    def search(
+        self, keyword: str, limit: int, min_similarity: float, allowed: Optional[Set[int]] = None
+    ) -> List[Tuple[int, float]]:
+        """[(posting_id, 유사도)] 유사도 내림차순. allowed 를 주면 그 안의 게시물만 후보로 씀"""
+        q = trigrams(keyword)
+        if not q:
+            return []
+        with self._lock:
+            shared: Counter = Counter()
+            for g in q:
+                shared.update(self._postings.get(g, ()))
+            # 구간 유사도는 공통 trigram 수 n 에 대해 n / len(q) 를 넘을 수 없음
+            # → n 큰 후보부터 계산하고, 결과가 limit 개 찼는데 남은 후보의 상한이 그보다 낮으면 중단
+            groups: Dict[int, List[int]] = {}
+            for pid, n in shared.items():
+                if allowed is not None and pid not in allowed:
+                    continue
+                if n / len(q) >= min_similarity:
+                    groups.setdefault(n, []).append(pid)
+            scored: List[Tuple[int, float]] = []
+            for n in sorted(groups, reverse=True):
+                bound = n / len(q)
+                if len(scored) >= limit and scored[limit - 1][1] >= bound:
+                    break
+                at_bound = sum(1 for _, v in scored if v >= bound)
+                for pid in sorted(groups[n], reverse=True):
+                    sim = word_similarity(q, self._grams[pid])
+                    if sim >= min_similarity:
+                        scored.append((pid, sim))
+                        if sim >= bound:
+                            at_bound += 1
+                            if at_bound >= limit:
+                                break
+                scored.sort(key=lambda kv: (-kv[1], -kv[0]))
+        return scored[:limit]
+
+    def stats(self) -> dict:
+        return {"postings": len(self._grams), "trigrams": len(self._postings)}
+
+
+trigram_index = TrigramIndex()
+
+
+def _refresh(db: Session) -> None:
+    # Postgres 는 DB 인덱스를 쓰므로 메모리 색인은 만들지 않음
+    if not use_pg_trgm(db):
+        trigram_index.refresh(db)
+
+
+register_job("trigram_index", settings.FUZZY_REFRESH_SECONDS, _refresh)
+
+
+def fuzzy_search(
+    db: Session,
+    keyword: str,
+    category: Optional[str] = None,
+    exclude_seller_id: Optional[int] = None,
+    page: int = 1,
+    size: int = 20,
+) -> Tuple[int, List[Posting]]:
+    """제목 trigram 유사도 순 (total, 해당 페이지 게시물). total 은 FUZZY_MAX_RESULTS 까지만 셈"""
+    threshold = settings.FUZZY_MIN_SIMILARITY
+    limit = settings.FUZZY_MAX_RESULTS
+
+    if use_pg_trgm(db):
+        # %> 연산자가 GIN 인덱스를 탐. 기준값은 이 트랜잭션에서만 설정
+        db.execute(text("SELECT set_config('pg_trgm.word_similarity_threshold', :t, true)"), {"t": str(threshold)})
+        sim = func.word_similarity(keyword, Posting.title)
+        q = select(Posting.id).where(Posting.title.op("%>")(keyword))
+        if category:
+            q = q.where(Posting.category == category)
+        if exclude_seller_id is not None:
+            q = q.where(Posting.seller_id != exclude_seller_id)
+        ranked = db.execute(q.order_by(sim.desc(), Posting.id.desc()).limit(limit)).scalars().all()
+    else:
+        # 필터는 상위 limit 개를 자르기 전에 적용해야 함 (pg_trgm 쪽 WHERE 와 같은 결과)
+        allowed = None
+        if category or exclude_seller_id is not None:
+            q = select(Posting.id)
+            if category:
+                q = q.where(Posting.category == category)
+            if exclude_seller_id is not None:
+                q = q.where(Posting.seller_id != exclude_seller_id)
+            allowed = set(db.execute(q).scalars().all())
+        ranked = [pid for pid, _ in trigram_index.search(keyword, limit, threshold, allowed)]
+
+    page_ids = ranked[(page - 1) * size: page * size]
+    rows = db.execute(select(Posting).where(Posting.id.in_(page_ids))).scalars().all() if page_ids else []
+    by_id = {p.id: p for p in rows}
+    return len(ranked), [by_id[pid] for pid in page_ids if pid in by_id]
@@ -0,0 +1,234 @@
+# app/services/images.py
+"""
+업로드 이미지 후처리 (리사이즈 WebP 파생본 + 크기/대표색/blurhash 메타데이터).
+
+Pillow 작업은 CPU 를 오래 쓰므로 프로세스 풀에서 돌린다.
+워커에서 실행되는 함수는 pickle 가능해야 하므로 모듈 최상위 함수로 둔다.
+"""
+import asyncio
+import logging
+import math
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Dict, List, Optional
+
+from PIL import Image, ImageOps
+
+from app.core.config import settings
+from app.services.embeddings import get_extractor
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_image_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=settings.IMAGE_WORKERS or None)
+    return _pool
+
+
+def shutdown_image_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _discard_broken_pool(pool: ProcessPoolExecutor) -> None:
+    """워커가 죽어서 깨진 풀은 버림 → 다음 호출에서 get_image_pool() 이 새로 만듦"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_in_image_pool(fn, *args):
+    loop = asyncio.get_running_loop()
+    pool = get_image_pool()
+    try:
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        # 이 호출은 실패로 돌려줌 (같은 입력이 워커를 또 죽일 수 있어서 재시도 안 함)
+        logger.warning("image pool broken, recreating")
+        _discard_broken_pool(pool)
+        raise
+
+
+def open_image(data: bytes, max_side: Optional[int] = None) -> Image.Image:
+    """
+    이미지 디코딩.
+    max_side 가 있으면 JPEG 는 draft 모드로 DCT 단계에서 1/2, 1/4, 1/8 축소해서 읽음
+    (풀 해상도 디코딩보다 훨씬 빠름). 휴대폰 사진 회전(EXIF)도 여기서 바로잡음.
+    """
+    im = Image.open(BytesIO(data))
+    if max_side:
+        im.draft("RGB", (max_side, max_side))
+    im = ImageOps.exif_transpose(im)
+    if im.mode not in ("RGB", "RGBA"):
+        im = im.convert("RGBA" if "A" in im.getbands() or im.mode == "P" else "RGB")
+    return im
+
+
+def _original_size(im: Image.Image) -> tuple:
+    """draft/회전 적용 전 원본 크기 (EXIF 5~8 은 90도 회전이라 가로세로 뒤바뀜)"""
+    w, h = im.size
+    try:
+        orientation = im.getexif().get(0x0112, 1)
+    except Exception:
+        orientation = 1
+    return (h, w) if orientation in (5, 6, 7, 8) else (w, h)
+
+
+def process_upload(data: bytes, widths: List[int], quality: int = 80) -> dict:
+    """
+    업로드 이미지 한 번 디코딩해서 파생본 + 메타데이터 계산. (프로세스 풀에서 실행)
+    반환: {"variants": {가로폭: webp bytes},
+           "meta": {width, height, byte_size, dominant_color, blurhash, phash, embedding, embedding_version}}
+    """
+
+    im = Image.open(BytesIO(data))
+    width, height = _original_size(im)
+    im.draft("RGB", (max(widths), max(widths)))
+    im = ImageOps.exif_transpose(im)
+    if im.mode not in ("RGB", "RGBA"):
+        im = im.convert("RGBA" if "A" in im.getbands() or im.mode == "P" else "RGB")
+
+    # 메타데이터는 32px 축소본으로 계산 (색/blurhash 에는 이 정도면 충분)
+    small = im.convert("RGB")
+    small.thumbnail((32, 32), Image.BILINEAR)
+    meta = {
+        "width": width,
+        "height": height,
+        "byte_size": len(data),
+        "dominant_color": dominant_color(small),
+        "blurhash": blurhash_encode(small, 4, 3),
+        "phash": f"{dhash(im):016x}",
+    }
+    extractor = get_extractor()
+    meta["embedding"] = extractor.extract(im).astype("float16").tobytes()
+    meta["embedding_version"] = extractor.version
+    return {"variants": _render(im, widths, quality), "meta": meta}
+
+
+def _render(im: Image.Image, widths: List[int], quality: int) -> Dict[int, bytes]:
+    """{가로폭: webp bytes}. 원본보다 크게 키우지는 않음"""
+    widths = sorted(set(widths), reverse=True)
+    out: Dict[int, bytes] = {}
+    for w in widths:
+        # 큰 것부터 줄여가며 재사용 → 매번 원본에서 리샘플링하지 않음
+        if im.width > w:
+            h = max(1, round(im.height * w / im.width))
+            im = im.resize((w, h), Image.LANCZOS)
+        buf = BytesIO()
+        im.save(buf, format="WEBP", quality=quality, method=4)
+        out[w] = buf.getvalue()
+    return out
+
+
+def derivative_name(blob_name: str, width: int) -> str:
+    stem, _ = os.path.splitext(blob_name)
+    return f"{stem}_w{width}.webp"
+
+
+# ---------- 지각 해시 (중복 사진 탐지) ----------
+def dhash(im: Image.Image, size: int = 8) -> int:
+    """
+    difference hash: 9x8 흑백 축소본에서 가로로 이웃한 픽셀 밝기 비교 → 64bit.
+    재압축/리사이즈/약한 보정에는 거의 안 변하고, 다른 사진끼리는 해밍 거리가 큼.
+    """
+    gray = im.convert("L").resize((size + 1, size), Image.BILINEAR)
+    px = list(gray.getdata())
+    bits = 0
+    for y in range(size):
+        row = y * (size + 1)
+        for x in range(size):
+            bits = (bits << 1) | (px[row + x] > px[row + x + 1])
+    return bits
+
+
+# ---------- 색상 / blurhash ----------
+def dominant_color(im: Image.Image) -> str:
+    """가장 많이 쓰인 색 (5색 양자화 기준) → #rrggbb"""
+    q = im.quantize(colors=5, method=Image.Quantize.MEDIANCUT)
+    palette = q.getpalette()
+    count, idx = max(q.getcolors())
+    r, g, b = palette[idx * 3: idx * 3 + 3]
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+_B83 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+
+def _b83(value: int, length: int) -> str:
+    return "".join(_B83[(value // 83 ** (length - i - 1)) % 83] for i in range(length))
+
+
+def _srgb_to_linear(v: int) -> float:
+    x = v / 255
+    return x / 12.92 if x <= 0.04045 else ((x + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(v: float) -> int:
+    x = max(0.0, min(1.0, v))
+    if x <= 0.0031308:
+        return int(x * 12.92 * 255 + 0.5)
+    return int((1.055 * x ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(v: float, e: float) -> float:
+    return math.copysign(abs(v) ** e, v)
+
+
+def blurhash_encode(im: Image.Image, x_components: int = 4, y_components: int = 3) -> str:
+    """BlurHash (https://blurha.sh) 인코더. 작은 RGB 이미지를 넣을 것 (32px 정도)"""
+    w, h = im.size
+    lut = [_srgb_to_linear(i) for i in range(256)]
+    pixels = [(lut[r], lut[g], lut[b]) for r, g, b in im.getdata()]
+
+    factors = []
+    for j in range(y_components):
+        cos_y = [math.cos(math.pi * j * y / h) for y in range(h)]
+        for i in range(x_components):
+            cos_x = [math.cos(math.pi * i * x / w) for x in range(w)]
+            r = g = b = 0.0
+            for y in range(h):
+                row = y * w
+                cy = cos_y[y]
+                for x in range(w):
+                    basis = cos_x[x] * cy
+                    pr, pg, pb = pixels[row + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            scale = (1 if i == 0 and j == 0 else 2) / (w * h)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    out = _b83((x_components - 1) + (y_components - 1) * 9, 1)
+
+    if ac:
+        actual_max = max(abs(c) for f in ac for c in f)
+        quantised = max(0, min(82, int(actual_max * 166 - 0.5)))
+        max_value = (quantised + 1) / 166
+        out += _b83(quantised, 1)
+    else:
+        max_value = 1.0
+        out += _b83(0, 1)
+
+    out += _b83((_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8) + _linear_to_srgb(dc[2]), 4)
+    for f in ac:
+        qr, qg, qb = (
+            max(0, min(18, int(_sign_pow(c / max_value, 0.5) * 9 + 9.5))) for c in f
+        )
+        out += _b83(qr * 19 * 19 + qg * 19 + qb, 2)
+    return out
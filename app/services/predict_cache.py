@@ -0,0 +1,91 @@
+# app/services/predict_cache.py
+"""
+/api/predict 결과 캐시.
+
+키 = 이미지 내용 SHA-256 + 모델 버전 → 같은 사진을 다시 올리면 디코딩/추론 없이 바로 응답.
+메모리 LRU 가 1차, PREDICT_CACHE_PATH 를 주면 sqlite 파일에도 저장해서 재시작 후에도 유지.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+
+def cache_key(data: bytes, model_version: str) -> str:
+    return f"{hashlib.sha256(data).hexdigest()}:{model_version}"
+
+
+class PredictionCache:
+    def __init__(self, maxsize: int, path: str = ""):
+        self.maxsize = maxsize
+        self.path = path
+        self._mem: "OrderedDict[str, dict]" = OrderedDict()
+        # 메모리 LRU 용 (이벤트 루프에서도 잡으므로 디스크 작업 동안은 절대 잡지 않음)
+        self._lock = threading.Lock()
+        # sqlite 커넥션 용 (스레드풀에서만)
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # ----- 메모리 -----
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            value = self._mem.get(key)
+            if value is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+            return value
+
+    def _remember(self, key: str, value: dict) -> None:
+        with self._lock:
+            self._mem[key] = value
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.maxsize:
+                self._mem.popitem(last=False)
+
+    # ----- 디스크 (블로킹이라 스레드풀에서 호출) -----
+    @property
+    def persistent(self) -> bool:
+        return bool(self.path)
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS predictions (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        return self._conn
+
+    def load(self, key: str) -> Optional[dict]:
+        """디스크에서 찾으면 메모리에도 올림"""
+        if not self.persistent:
+            return None
+        with self._db_lock:
+            row = self._db().execute("SELECT value FROM predictions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value = json.loads(row[0])
+        self.disk_hits += 1
+        self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: dict) -> None:
+        self._remember(key, value)
+        if self.persistent:
+            with self._db_lock:
+                db = self._db()
+                db.execute("INSERT OR REPLACE INTO predictions (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+                db.commit()
+
+    def metrics(self) -> dict:
+        return {
+            "size": len(self._mem),
+            "maxSize": self.maxsize,
+            "hits": self.hits,
+            "diskHits": self.disk_hits,
+            "misses": self.misses,
+            "persistent": self.persistent,
+        }
@@ -0,0 +1,147 @@
+# app/services/price_estimator.py
+"""
+판매 완료(SOLD) 게시물 가격으로 가격대 추정.
+
+- 카테고리별 / 예측 라벨별 가격 분위수(기본 25%~75%)를 메모리에 미리 계산 → 조회는 dict 한 번
+- 주기 작업이 updated_at 이후 바뀐 row 만 가져와서 메모리 테이블 갱신 후 NumPy 로 일괄 재계산
+  (삭제된 게시물은 delta 로 안 보이므로 PRICE_FULL_REFRESH_EVERY 번마다 전체 재적재)
+"""
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.posting import Posting
+
+SOLD = "SOLD"
+
+
+def group_quantiles(keys: np.ndarray, values: np.ndarray, qs: Iterable[float]) -> Dict[object, Tuple[int, ...]]:
+    """
+    keys 별 values 분위수 (선형 보간, np.quantile 기본과 동일).
+    그룹 수만큼 반복하지 않고 정렬 + 인덱스 계산으로 한 번에 처리.
+    반환: {key: (q1값, q2값, ..., 표본수)}
+    """
+    if len(values) == 0:
+        return {}
+    uniq, codes = np.unique(keys, return_inverse=True)
+    order = np.lexsort((values, codes))
+    sorted_vals = values[order].astype(np.float64)
+    counts = np.bincount(codes, minlength=len(uniq))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    cols = []
+    for q in qs:
+        pos = starts + q * (counts - 1)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, starts + counts - 1)
+        frac = pos - lo
+        cols.append(sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * frac)
+
+    stacked = np.rint(np.column_stack(cols)).astype(np.int64)
+    return {k: (*map(int, row), int(n)) for k, row, n in zip(uniq.tolist(), stacked, counts)}
+
+
+class PriceEstimator:
+    def __init__(self, quantiles=(0.25, 0.75), min_samples: int = 3):
+        self.quantiles = quantiles
+        self.min_samples = min_samples
+        self.labels: Tuple[str, ...] = ()
+        self.label_categories: Dict[str, str] = {}
+
+        # posting_id → (category, 소문자 title, price)  (SOLD 만)
+        self._rows: Dict[int, Tuple[str, str, int]] = {}
+        # "category:..." / "label:..." / "all" → (low, high, 표본수)
+        self._ranges: Dict[str, Tuple[int, int, int]] = {}
+        self._cursor: Optional[datetime] = None
+        self._refreshes = 0
+        self._lock = threading.Lock()
+
+    def set_labels(self, labels: Iterable[str], label_categories: Optional[Dict[str, str]] = None) -> None:
+        """모델 라벨 목록 (라벨별 분위수는 제목에 라벨이 들어간 판매완료 글로 계산)"""
+        self.labels = tuple(dict.fromkeys(l.lower() for l in labels))
+        self.label_categories = {k.lower(): v for k, v in (label_categories or {}).items()}
+
+    # ---------- 갱신 ----------
+    def refresh(self, db: Session, full: bool = False) -> int:
+        """바뀐 게시물만 반영 후 분위수 재계산. 반영한 row 수 반환"""
+        full = full or self._cursor is None or (
+            self._refreshes % max(1, settings.PRICE_FULL_REFRESH_EVERY) == 0
+        )
+        q = select(Posting.id, Posting.category, Posting.title, Posting.price, Posting.status, Posting.updated_at)
+        if not full:
+            q = q.where(Posting.updated_at >= self._cursor)
+        rows = db.execute(q).all()
+
+        with self._lock:
+            table = {} if full else dict(self._rows)
+            cursor = self._cursor
+            for pid, category, title, price, status, updated_at in rows:
+                if status == SOLD and price is not None:
+                    table[pid] = (category or "", (title or "").lower(), int(price))
+                else:
+                    table.pop(pid, None)
+                if updated_at is not None and (cursor is None or updated_at > cursor):
+                    cursor = updated_at
+            self._rows = table
+            self._cursor = cursor
+            self._refreshes += 1
+            self._ranges = self._compute(table)
+        return len(rows)
+
+    def _compute(self, table: Dict[int, Tuple[str, str, int]]) -> Dict[str, Tuple[int, int, int]]:
+        if not table:
+            return {}
+        cats = np.array([r[0] for r in table.values()], dtype=object)
+        titles = np.array([r[1] for r in table.values()], dtype=str)
+        prices = np.fromiter((r[2] for r in table.values()), dtype=np.int64, count=len(table))
+        qs = self.quantiles
+
+        ranges: Dict[str, Tuple[int, int, int]] = {}
+        for cat, (low, high, n) in group_quantiles(cats, prices, qs).items():
+            ranges[f"category:{cat}"] = (low, high, n)
+
+        for label in self.labels:
+            mask = np.char.find(titles, label) >= 0
+            if mask.any():
+                low, high, n = group_quantiles(np.zeros(int(mask.sum())), prices[mask], qs)[0.0]
+                ranges[f"label:{label}"] = (low, high, n)
+
+        low, high, n = group_quantiles(np.zeros(len(prices)), prices, qs)[0.0]
+        ranges["all"] = (low, high, n)
+        return ranges
+
+    # ---------- 조회 ----------
+    def lookup(self, label: Optional[str], category: Optional[str] = None) -> Optional[Tuple[int, int]]:
+        """라벨 → (라벨의) 카테고리 → 전체 순서로, 표본이 min_samples 이상인 첫 구간"""
+        label = (label or "").lower()
+        category = category or self.label_categories.get(label)
+        ranges = self._ranges
+        for key in (f"label:{label}", f"category:{category}", "all"):
+            hit = ranges.get(key)
+            if hit and hit[2] >= self.min_samples:
+                return _round_won(hit[0]), _round_won(hit[1])
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "soldPostings": len(self._rows),
+            "ranges": len(self._ranges),
+            "cursor": self._cursor.isoformat() if self._cursor else None,
+            "refreshes": self._refreshes,
+        }
+
+
+def _round_won(v: int) -> int:
+    # 1000원 단위로
+    return int(round(v, -3))
+
+
+price_estimator = PriceEstimator(
+    quantiles=(settings.PRICE_QUANTILE_LOW, settings.PRICE_QUANTILE_HIGH),
+    min_samples=settings.PRICE_MIN_SAMPLES,
+)
@@ -0,0 +1,144 @@
+# app/services/price_watch.py
+"""
+찜한 게시물 가격 인하 알림.
+
+update_posting 은 가격이 내려갔을 때 이벤트를 큐에 넣기만 하고(BackgroundTasks) 바로 응답함.
+워커 하나가 큐를 순서대로 처리:
+  favorites 를 user_id 기준 keyset 으로 PRICE_DROP_BATCH_SIZE 명씩 읽어서
+  → notifications 에 한 번에 insert (웹소켓에 없던 사용자는 /api/notifications 로 확인)
+  → chat-list 웹소켓에 연결된 사용자에게만 price_drop 이벤트 전송
+  → PRICE_DROP_RATE_PER_SEC 를 넘지 않게 배치 사이에 쉼
+같은 게시물 가격이 처리 전에 또 내려가면 한 건으로 합침 (처음 가격 → 마지막 가격).
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.db_writer import db_writer
+from app.models.favorite import Favorite
+from app.models.notification import Notification
+
+logger = logging.getLogger(__name__)
+
+PRICE_DROP = "price_drop"
+
+
+def _favorite_batch(posting_id: int, after_user_id: int, limit: int) -> List[int]:
+    with SessionLocal() as db:
+        return db.execute(
+            select(Favorite.user_id)
+            .where(Favorite.posting_id == posting_id, Favorite.user_id > after_user_id)
+            .order_by(Favorite.user_id)
+            .limit(limit)
+        ).scalars().all()
+
+
+def _insert_notifications(db: Session, user_ids: List[int], posting_id: int, payload: dict) -> None:
+    db.execute(insert(Notification), [
+        {"user_id": uid, "type": PRICE_DROP, "posting_id": posting_id, "payload": payload, "is_read": False}
+        for uid in user_ids
+    ])
+    db.commit()
+
+
+class PriceDropFanout:
+    def __init__(self, batch_size: int, rate_per_sec: float):
+        self.batch_size = batch_size
+        self.rate_per_sec = rate_per_sec
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # 큐에서 아직 안 꺼낸 이벤트 (posting_id → payload). 같은 게시물은 여기서 합침
+        self._pending: Dict[int, dict] = {}
+
+        self.events = 0
+        self.stored = 0
+        self.pushed = 0
+        self.errors = 0
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        # 이벤트 루프 안에서 처음 호출될 때 큐/워커 생성 (import 시점에는 루프가 없음)
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._pending.clear()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        return self._queue
+
+    async def enqueue(self, posting: dict) -> None:
+        """posting: postingId, title, oldPrice, newPrice, thumbnail"""
+        queue = self._ensure_worker()
+        pid = posting["postingId"]
+        waiting = self._pending.get(pid)
+        if waiting is not None:
+            waiting.update({k: v for k, v in posting.items() if k != "oldPrice"})
+            return
+        self._pending[pid] = dict(posting)
+        await queue.put(pid)
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            pid = await queue.get()
+            payload = self._pending.pop(pid, None)
+            if payload is None or payload["newPrice"] >= payload["oldPrice"]:
+                continue
+            self.events += 1
+            try:
+                await self._fan_out(payload)
+            except Exception:
+                self.errors += 1
+                logger.exception("price drop fan-out failed: posting_id=%s", pid)
+
+    async def _fan_out(self, payload: dict) -> None:
+        from app.routers.chat_list_ws import broadcast_to_user, chat_list_connections
+
+        pid = payload["postingId"]
+        after = 0
+        while True:
+            user_ids = await run_in_threadpool(_favorite_batch, pid, after, self.batch_size)
+            if not user_ids:
+                return
+            after = user_ids[-1]
+            # 배치 insert 는 채팅 쓰기와 같은 SQLite writer 로 (잠금 경쟁 없음)
+            await db_writer.run(lambda wdb: _insert_notifications(wdb, user_ids, pid, payload))
+            self.stored += len(user_ids)
+
+            online = [uid for uid in user_ids if chat_list_connections.get(uid)]
+            for uid in online:
+                await broadcast_to_user(uid, PRICE_DROP, payload)
+            self.pushed += len(online)
+
+            if len(user_ids) < self.batch_size:
+                return
+            await asyncio.sleep(len(user_ids) / self.rate_per_sec)
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self._pending.clear()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "events": self.events,
+            "stored": self.stored,
+            "pushed": self.pushed,
+            "errors": self.errors,
+        }
+
+
+price_drop_fanout = PriceDropFanout(settings.PRICE_DROP_BATCH_SIZE, settings.PRICE_DROP_RATE_PER_SEC)
+
+
+async def notify_price_drop(posting: dict) -> None:
+    """(BackgroundTasks) 가격 인하 이벤트를 큐에 넣기만 함 — 실제 전송은 워커가"""
+    try:
+        await price_drop_fanout.enqueue(posting)
+    except Exception:
+        logger.exception("price drop enqueue failed: posting_id=%s", posting.get("postingId"))
@@ -0,0 +1,315 @@
+# app/services/related.py
+"""
+상세 페이지 "비슷한 상품" (같은 카테고리 안에서 제목/본문 TF-IDF 코사인 유사도).
+
+- 한국어는 띄어쓰기/조사가 제각각이라 단어 대신 글자 2~3-gram 을 씀 ("아이폰13" ↔ "아이폰 13")
+- 카테고리별 희소 행렬을 NumPy 배열로 CSC(n-gram → 게시물) 형태로 들고 있음 → 질의 한 번은
+  질의 글의 n-gram 열만 모아서 bincount 하는 희소 행렬-벡터 곱
+- 게시물 생성/수정/삭제는 바로 반영: 기존 행은 죽은 행으로 표시하고 새 내용은 delta 로 따로 계산,
+  delta 가 커지면 그 카테고리 행렬만 다시 만듦
+- 주기 작업은 updated_at 이후 바뀐 글만 읽어서 반영 (다른 경로로 바뀐 글/삭제된 글 정리)
+"""
+import re
+import threading
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.jobs import register_job
+from app.models.posting import Posting
+
+_WORD = re.compile(r"[0-9a-z가-힣]+")
+# 본문은 앞부분만 (긴 글이 n-gram 수로 다른 글을 압도하지 않게)
+_CONTENT_CHARS = 1000
+# 제목 n-gram 가중치
+_TITLE_WEIGHT = 2.0
+# 이 비율 이상 글에 나오는 n-gram 은 질의에서 무시 ("판매", "합니" 같은 것). 글이 적은 카테고리는 제외
+_MAX_DF_RATIO = 0.5
+_MAX_DF_MIN_DOCS = 100
+# refresh 가 락을 잡고 한 번에 반영하는 row 수 (그 사이 조회가 끼어들 수 있게)
+_REFRESH_BATCH = 1000
+
+
+def char_ngrams(text: str, counts: Optional[Counter] = None, weight: float = 1.0, ns=(2, 3)) -> Counter:
+    """단어별 앞뒤에 공백을 붙여 글자 n-gram 빈도 (단어 경계도 특징이 됨)"""
+    counts = Counter() if counts is None else counts
+    for word in _WORD.findall((text or "").lower()):
+        w = f" {word} "
+        for n in ns:
+            for i in range(len(w) - n + 1):
+                counts[w[i:i + n]] += weight
+    return counts
+
+
+class _Matrix:
+    """한 카테고리의 TF-IDF 행렬 스냅샷 (행 = 게시물, 열 = n-gram). 열 방향으로 정렬해 둠"""
+
+    def __init__(self, ids: List[int], docs: List[Tuple[np.ndarray, np.ndarray]]):
+        self.ids = np.array(ids, dtype=np.int64)
+        self.row_of = {pid: i for i, pid in enumerate(ids)}
+        self.alive = np.ones(len(ids), dtype=bool)
+
+        if docs:
+            terms = np.concatenate([t for t, _ in docs])
+            data = np.concatenate([w for _, w in docs])
+            rows = np.repeat(np.arange(len(docs), dtype=np.int32), [len(t) for t, _ in docs])
+        else:
+            terms = np.zeros(0, np.int32)
+            data = np.zeros(0, np.float32)
+            rows = np.zeros(0, np.int32)
+        order = np.argsort(terms, kind="stable")
+        sorted_terms = terms[order]
+        self.rows = rows[order]
+        self.data = data[order]
+        self.terms, self.starts = np.unique(sorted_terms, return_index=True)
+        self.ends = np.append(self.starts[1:], len(sorted_terms)).astype(np.int64)
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    def scores(self, q_terms: np.ndarray, q_weights: np.ndarray) -> np.ndarray:
+        """행렬 · 질의벡터 (행마다 내적)"""
+        if self.size == 0 or len(q_terms) == 0:
+            return np.zeros(self.size, dtype=np.float32)
+        pos = np.searchsorted(self.terms, q_terms)
+        pos = np.minimum(pos, len(self.terms) - 1)
+        hit = self.terms[pos] == q_terms
+        pos, qw = pos[hit], q_weights[hit]
+        starts, lengths = self.starts[pos], self.ends[pos] - self.starts[pos]
+        total = int(lengths.sum())
+        if total == 0:
+            return np.zeros(self.size, dtype=np.float32)
+        # 여러 열 구간 [start, end) 를 한 번에 이어붙인 인덱스
+        offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+        idx = offsets + np.arange(total)
+        return np.bincount(self.rows[idx], weights=self.data[idx] * np.repeat(qw, lengths), minlength=self.size)
+
+
+class RelatedIndex:
+    def __init__(self, cache_size: int = 10000, delta_limit: int = 1000):
+        self.cache_size = cache_size
+        self.delta_limit = delta_limit
+        self._vocab: Dict[str, int] = {}
+        # n-gram id → n-gram / 그 n-gram 이 들어 있는 게시물 수 (0 이 된 id 는 _build 때 풀어서 재사용)
+        self._terms: List[Optional[str]] = []
+        self._refs: Counter = Counter()
+        self._free: List[int] = []
+        # posting_id → (category, 내용 해시, n-gram id, 로그 tf)
+        self._docs: Dict[int, Tuple[str, int, np.ndarray, np.ndarray]] = {}
+        self._df: Dict[str, Counter] = {}
+        self._matrices: Dict[str, _Matrix] = {}
+        # 행렬 만든 이후 추가/수정된 게시물 (행렬 밖에서 직접 계산) + 추가 시점 가중치
+        # (refresh 가 defer 로 넣은 글은 가중치가 없을 수 있음 → related 에서 처음 쓸 때 계산)
+        self._delta: Dict[str, Set[int]] = {}
+        self._delta_weights: Dict[int, np.ndarray] = {}
+        # 이웃 캐시: posting_id → (카테고리 세대, 계산할 때 개수 한도, 결과)
+        self._cache: "OrderedDict[int, Tuple[int, int, List[Tuple[int, float]]]]" = OrderedDict()
+        self._generation: Dict[str, int] = {}
+        self._cursor: Optional[datetime] = None
+        self._lock = threading.RLock()
+
+    # ---------- 문서 벡터 ----------
+    def _term_id(self, gram: str) -> int:
+        tid = self._vocab.get(gram)
+        if tid is None:
+            if self._free:
+                tid = self._free.pop()
+                self._terms[tid] = gram
+            else:
+                tid = len(self._terms)
+                self._terms.append(gram)
+            self._vocab[gram] = tid
+        return tid
+
+    def _tokenize(self, title: str, content: str) -> Tuple[np.ndarray, np.ndarray]:
+        counts = char_ngrams(title, weight=_TITLE_WEIGHT)
+        char_ngrams((content or "")[:_CONTENT_CHARS], counts)
+        terms = np.fromiter((self._term_id(g) for g in counts), dtype=np.int32, count=len(counts))
+        tf = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+        order = np.argsort(terms)
+        return terms[order], tf[order].astype(np.float32)
+
+    def _weights(self, category: str, terms: np.ndarray, tf: np.ndarray,
+                 n: Optional[int] = None, df_arr: Optional[np.ndarray] = None) -> np.ndarray:
+        """로그 tf x 스무딩 idf, L2 정규화"""
+        n = self._count(category) if n is None else n
+        if df_arr is not None:
+            dfs = df_arr[terms]
+        else:
+            df = self._df.get(category, Counter())
+            dfs = np.fromiter((df.get(int(t), 0) for t in terms), dtype=np.float32, count=len(terms))
+        w = tf * (np.log((1 + n) / (1 + dfs)) + 1)
+        norm = np.linalg.norm(w)
+        return (w / norm if norm > 0 else w).astype(np.float32)
+
+    def _count(self, category: str) -> int:
+        m = self._matrices.get(category)
+        return (int(m.alive.sum()) if m else 0) + len(self._delta.get(category, ()))
+
+    # ---------- 반영 ----------
+    def upsert(self, posting_id: int, category: str, title: str, content: str, defer: bool = False) -> None:
+        """defer=True 면 가중치/행렬 재생성을 미룸 (refresh 에서 한꺼번에 _build)"""
+        key = hash((category, title, content))
+        with self._lock:
+            old = self._docs.get(posting_id)
+            if old is not None and old[1] == key:
+                return  # 조회수 등 다른 컬럼만 바뀜
+            self._detach(posting_id)
+            terms, tf = self._tokenize(title, content)
+            self._docs[posting_id] = (category, key, terms, tf)
+            self._df.setdefault(category, Counter()).update(terms.tolist())
+            self._refs.update(terms.tolist())
+            self._delta.setdefault(category, set()).add(posting_id)
+            self._touch(category)
+            if defer:
+                return
+            self._delta_weights[posting_id] = self._weights(category, terms, tf)
+            if len(self._delta[category]) > self.delta_limit:
+                self._build(category)
+
+    def remove(self, posting_id: int) -> None:
+        with self._lock:
+            self._detach(posting_id)
+
+    def _detach(self, posting_id: int) -> None:
+        old = self._docs.pop(posting_id, None)
+        if old is None:
+            return
+        category, _, terms, _ = old
+        self._df[category].subtract(terms.tolist())
+        self._refs.subtract(terms.tolist())
+        self._delta.get(category, set()).discard(posting_id)
+        self._delta_weights.pop(posting_id, None)
+        m = self._matrices.get(category)
+        if m is not None and posting_id in m.row_of:
+            m.alive[m.row_of[posting_id]] = False
+        self._touch(category)
+        self._cache.pop(posting_id, None)
+
+    def _touch(self, category: str) -> None:
+        self._generation[category] = self._generation.get(category, 0) + 1
+
+    def _build(self, category: str) -> None:
+        """카테고리 행렬을 현재 문서들로 다시 만들고 delta 비움"""
+        df = self._df[category] = +self._df.get(category, Counter())  # 0 이하 항목 정리
+        df_arr = np.zeros(len(self._terms), dtype=np.float32)
+        if df:
+            df_arr[np.fromiter(df.keys(), dtype=np.int64, count=len(df))] = np.fromiter(df.values(), dtype=np.float32, count=len(df))
+        ids = [pid for pid, doc in self._docs.items() if doc[0] == category]
+        docs = [
+            (self._docs[pid][2], self._weights(category, self._docs[pid][2], self._docs[pid][3], len(ids), df_arr))
+            for pid in ids
+        ]
+        for pid in self._delta.get(category, ()):
+            self._delta_weights.pop(pid, None)
+        self._delta[category] = set()
+        self._matrices[category] = _Matrix(ids, docs)
+        self._prune_vocab()
+
+    def _prune_vocab(self) -> None:
+        """어느 게시물에도 없는 n-gram 을 사전에서 빼고 id 는 재사용
+        (다른 카테고리 행렬의 죽은 행에 남아 있어도 alive 로 걸러지므로 상관없음)"""
+        for tid in [tid for tid, n in self._refs.items() if n <= 0]:
+            del self._refs[tid]
+            del self._vocab[self._terms[tid]]
+            self._terms[tid] = None
+            self._free.append(tid)
+
+    # ---------- 주기 작업 ----------
+    def refresh(self, db: Session) -> int:
+        """바뀐 게시물만 다시 토큰화, 없어진 게시물 제거, delta 있는 카테고리 행렬 재생성"""
+        q = select(Posting.id, Posting.category, Posting.title, Posting.content, Posting.updated_at)
+        if self._cursor is not None:
+            q = q.where(Posting.updated_at >= self._cursor)
+        rows = db.execute(q).all()
+        alive = set(db.execute(select(Posting.id)).scalars().all())
+
+        with self._lock:
+            for pid in [pid for pid in self._docs if pid not in alive]:
+                self._detach(pid)
+        cursor = self._cursor
+        for start in range(0, len(rows), _REFRESH_BATCH):
+            with self._lock:
+                for pid, category, title, content, updated_at in rows[start:start + _REFRESH_BATCH]:
+                    self.upsert(pid, category, title, content, defer=True)
+                    if updated_at is not None and (cursor is None or updated_at > cursor):
+                        cursor = updated_at
+        with self._lock:
+            self._cursor = cursor
+            for category, delta in list(self._delta.items()):
+                if delta or category not in self._matrices:
+                    self._build(category)
+        return len(rows)
+
+    # ---------- 조회 ----------
+    def related(self, posting_id: int, k: int = 10) -> List[Tuple[int, float]]:
+        """같은 카테고리에서 가장 비슷한 게시물 [(posting_id, 유사도)] 내림차순 (자기 자신 제외)"""
+        with self._lock:
+            doc = self._docs.get(posting_id)
+            if doc is None:
+                return []
+            category, _, terms, tf = doc
+            gen = self._generation.get(category, 0)
+            cached = self._cache.get(posting_id)
+            # 한도보다 적게 나왔으면 후보 전부라서 k 와 상관없이 그대로 씀
+            if cached is not None and cached[0] == gen and (len(cached[2]) >= k or len(cached[2]) < cached[1]):
+                self._cache.move_to_end(posting_id)
+                return cached[2][:k]
+
+            n = self._count(category)
+            df = self._df.get(category, Counter())
+            max_df = _MAX_DF_RATIO * n if n >= _MAX_DF_MIN_DOCS else n
+            keep = np.fromiter((df.get(int(t), 0) <= max_df for t in terms), dtype=bool, count=len(terms))
+            q_terms = terms[keep]
+            q_weights = self._weights(category, terms, tf)[keep]
+
+            scores: Dict[int, float] = {}
+            m = self._matrices.get(category)
+            if m is not None and m.size:
+                s = m.scores(q_terms, q_weights)
+                s[~m.alive] = 0
+                if posting_id in m.row_of:
+                    s[m.row_of[posting_id]] = 0
+                want = min(len(s), k * 2)
+                top = np.argpartition(-s, want - 1)[:want] if len(s) > want else np.arange(len(s))
+                scores.update((int(m.ids[i]), float(s[i])) for i in top if s[i] > 0)
+            for pid in self._delta.get(category, ()):
+                if pid == posting_id:
+                    continue
+                _, _, d_terms, d_tf = self._docs[pid]
+                d_w = self._delta_weights.get(pid)
+                if d_w is None:
+                    # refresh 가 defer=True 로 넣고 아직 _build 전인 글 (배치 사이에 락이 풀림)
+                    d_w = self._delta_weights[pid] = self._weights(category, d_terms, d_tf)
+                _, qi, di = np.intersect1d(q_terms, d_terms, assume_unique=True, return_indices=True)
+                s = float(q_weights[qi] @ d_w[di])
+                if s > 0:
+                    scores[pid] = s
+
+            ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[: k * 2]
+            result = [(pid, round(s, 4)) for pid, s in ranked]
+            self._cache[posting_id] = (gen, k * 2, result)
+            self._cache.move_to_end(posting_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return result[:k]
+
+    def stats(self) -> dict:
+        return {
+            "postings": len(self._docs),
+            "vocabulary": len(self._vocab),
+            "categories": len(self._matrices),
+            "delta": sum(len(d) for d in self._delta.values()),
+            "cached": len(self._cache),
+        }
+
+
+related_index = RelatedIndex(settings.RELATED_CACHE_SIZE, settings.RELATED_DELTA_LIMIT)
+
+register_job("related_index", settings.RELATED_REFRESH_SECONDS, related_index.refresh)
@@ -0,0 +1,271 @@
+# app/services/saved_search_matcher.py
+"""
+저장한 검색 ↔ 새 게시물 매칭.
+
+모든 저장 검색의 keyword 를 Aho-Corasick 오토마톤 하나에 넣어두고, 새 게시물 제목+본문을
+한 번 훑어서 들어 있는 keyword 를 전부 찾음 (저장 검색 수와 무관하게 글 길이에 비례).
+keyword 없이 카테고리만 저장한 검색은 카테고리별로 따로 모아둠.
+
+- 추가: trie 에 경로만 붙이고 실패 링크는 다음 매칭 때 다시 계산 (trie 크기에 비례, 짧음)
+- 삭제: 출력 집합에서만 빼고 노드는 남겨둠 → 주기 작업이 DB 기준으로 통째로 다시 만들며 정리
+- rebuild 가 DB 를 읽는 동안 들어온 추가/삭제는 모아 뒀다가 새 인덱스에 다시 적용한 뒤 교체
+- 추가/삭제는 그 요청을 받은 워커에만 반영되므로, 알림 보낼 때 DB 로 한 번 더 맞춤:
+  마지막으로 본 id 이후에 생긴 검색은 가져와서 추가하고, 매칭된 검색이 아직 있는지 확인
+"""
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.jobs import register_job
+from app.models.saved_search import SavedSearch
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_keyword(text: Optional[str]) -> str:
+    return " ".join((text or "").lower().split())
+
+
+class AhoCorasick:
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 이 노드에서 끝나는 단어
+        self._out: List[Set[str]] = [set()]
+        # 실패 링크를 따라가다 처음 만나는 "단어가 끝나는" 노드 (없으면 0)
+        self._dict_link: List[int] = [0]
+        self._dirty = False
+
+    def add(self, word: str) -> None:
+        node = 0
+        for ch in word:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+                self._dict_link.append(0)
+            node = nxt
+        if word not in self._out[node]:
+            self._out[node].add(word)
+            self._dirty = True
+
+    def discard(self, word: str) -> None:
+        node = 0
+        for ch in word:
+            node = self._goto[node].get(ch)
+            if node is None:
+                return
+        self._out[node].discard(word)
+
+    def _build_links(self) -> None:
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            self._dict_link[child] = 0
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                f = self._goto[f].get(ch, 0)
+                self._fail[child] = f if f != child else 0
+                self._dict_link[child] = f if self._out[f] else self._dict_link[f]
+                queue.append(child)
+        self._dirty = False
+
+    def find(self, text: str) -> Set[str]:
+        """text 안에 나오는 단어 전부"""
+        if self._dirty:
+            self._build_links()
+        goto, fail, out, link = self._goto, self._fail, self._out, self._dict_link
+        found: Set[str] = set()
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = node
+            while hit:
+                if out[hit]:
+                    found |= out[hit]
+                hit = link[hit]
+        return found
+
+    @property
+    def size(self) -> int:
+        return len(self._goto)
+
+
+class SavedSearchMatcher:
+    def __init__(self):
+        self._automaton = AhoCorasick()
+        # id → (user_id, keyword, category, max_price)
+        self._searches: Dict[int, Tuple[int, str, Optional[str], Optional[int]]] = {}
+        self._by_keyword: Dict[str, Set[int]] = {}
+        self._by_category: Dict[Optional[str], Set[int]] = {}  # keyword 없는 검색
+        self._lock = threading.Lock()
+        # rebuild 중에 들어온 변경 ("add", id, entry) / ("remove", id, None). rebuild 중이 아니면 None
+        self._pending: Optional[List[tuple]] = None
+        self._rebuild_lock = threading.Lock()
+        # DB 에서 마지막으로 읽어 온 가장 큰 id (다른 워커가 추가한 검색 가져올 때 기준)
+        self._synced_id = 0
+
+    def _add(self, search_id: int, entry: Tuple[int, str, Optional[str], Optional[int]]) -> None:
+        _, keyword, category, _ = entry
+        self._searches[search_id] = entry
+        if keyword:
+            self._by_keyword.setdefault(keyword, set()).add(search_id)
+            self._automaton.add(keyword)
+        else:
+            self._by_category.setdefault(category, set()).add(search_id)
+
+    def _remove(self, search_id: int) -> None:
+        entry = self._searches.pop(search_id, None)
+        if entry is None:
+            return
+        _, keyword, category, _ = entry
+        if keyword:
+            ids = self._by_keyword.get(keyword, set())
+            ids.discard(search_id)
+            if not ids:
+                self._by_keyword.pop(keyword, None)
+                self._automaton.discard(keyword)
+        else:
+            self._by_category.get(category, set()).discard(search_id)
+
+    @staticmethod
+    def _entry(s: SavedSearch) -> Tuple[int, str, Optional[str], Optional[int]]:
+        return (s.user_id, normalize_keyword(s.keyword), s.category, s.max_price)
+
+    def add(self, s: SavedSearch) -> None:
+        entry = self._entry(s)
+        with self._lock:
+            self._add(s.id, entry)
+            if self._pending is not None:
+                self._pending.append(("add", s.id, entry))
+
+    def remove(self, search_id: int) -> None:
+        with self._lock:
+            self._remove(search_id)
+            if self._pending is not None:
+                self._pending.append(("remove", search_id, None))
+
+    def rebuild(self, db: Session) -> int:
+        with self._rebuild_lock:
+            with self._lock:
+                self._pending = []
+            try:
+                rows = db.execute(select(SavedSearch)).scalars().all()
+                fresh = SavedSearchMatcher()
+                for s in rows:
+                    fresh._add(s.id, self._entry(s))
+            except Exception:
+                with self._lock:
+                    self._pending = None
+                raise
+            with self._lock:
+                # DB 를 읽는 사이에 이 워커로 들어온 추가/삭제를 새 인덱스에도 적용
+                for op, search_id, entry in self._pending:
+                    if op == "add":
+                        fresh._add(search_id, entry)
+                    else:
+                        fresh._remove(search_id)
+                self._pending = None
+                self._automaton = fresh._automaton
+                self._searches = fresh._searches
+                self._by_keyword = fresh._by_keyword
+                self._by_category = fresh._by_category
+                self._synced_id = max([self._synced_id] + [s.id for s in rows])
+        return len(rows)
+
+    def sync_new(self, db: Session) -> int:
+        """다른 워커가 추가한 검색 (마지막으로 읽은 id 이후) 가져오기. 새로 읽은 개수"""
+        with self._lock:
+            since = self._synced_id
+        rows = db.execute(select(SavedSearch).where(SavedSearch.id > since)).scalars().all()
+        for s in rows:
+            self.add(s)
+        if rows:
+            with self._lock:
+                self._synced_id = max(self._synced_id, max(s.id for s in rows))
+        return len(rows)
+
+    def match(self, title: str, content: str, category: str, price: int, seller_id: int) -> Dict[int, List[int]]:
+        """게시물 하나에 맞는 저장 검색: {user_id: [saved_search_id, ...]} (판매자 본인 제외)"""
+        text = normalize_keyword(f"{title} {content}")
+        with self._lock:
+            candidates: Set[int] = set()
+            for keyword in self._automaton.find(text):
+                candidates |= self._by_keyword.get(keyword, set())
+            candidates |= self._by_category.get(category, set())
+
+            out: Dict[int, List[int]] = {}
+            for sid in candidates:
+                user_id, _, want_category, max_price = self._searches[sid]
+                if user_id == seller_id:
+                    continue
+                if want_category and want_category != category:
+                    continue
+                if max_price is not None and price > max_price:
+                    continue
+                out.setdefault(user_id, []).append(sid)
+        return out
+
+    def stats(self) -> dict:
+        return {
+            "searches": len(self._searches),
+            "keywords": len(self._by_keyword),
+            "automatonNodes": self._automaton.size,
+        }
+
+
+saved_search_matcher = SavedSearchMatcher()
+
+register_job("saved_search_matcher", settings.SAVED_SEARCH_REBUILD_SECONDS, saved_search_matcher.rebuild)
+
+
+def _match_checked(posting: dict) -> Dict[int, List[int]]:
+    """매칭 전에 다른 워커에서 추가된 검색을 가져오고, 매칭된 것 중 DB 에서 지워진 검색은 뺌"""
+    with SessionLocal() as db:
+        saved_search_matcher.sync_new(db)
+        matches = saved_search_matcher.match(
+            posting["title"], posting["content"], posting["category"], posting["price"], posting["sellerId"]
+        )
+        search_ids = [sid for ids in matches.values() for sid in ids]
+        if not search_ids:
+            return {}
+        alive = set(db.execute(select(SavedSearch.id).where(SavedSearch.id.in_(search_ids))).scalars())
+    out: Dict[int, List[int]] = {}
+    for user_id, ids in matches.items():
+        ids = [sid for sid in ids if sid in alive]
+        if ids:
+            out[user_id] = ids
+    return out
+
+
+async def notify_saved_searches(posting: dict) -> None:
+    """
+    (BackgroundTasks) 새 게시물과 맞는 저장 검색 주인에게 saved_search_match 이벤트 전송.
+    posting: postingId, title, content, category, price, sellerId, thumbnail
+    """
+    from app.routers.chat_list_ws import broadcast_to_user
+
+    try:
+        matches = await run_in_threadpool(_match_checked, posting)
+        payload = {k: posting[k] for k in ("postingId", "title", "price", "category", "thumbnail")}
+        for user_id, search_ids in matches.items():
+            await broadcast_to_user(user_id, "saved_search_match", {**payload, "savedSearchIds": sorted(search_ids)})
+    except Exception:
+        logger.exception("saved search notify failed: posting_id=%s", posting.get("postingId"))
@@ -0,0 +1,341 @@
+# app/services/storage.py
+"""
+이미지 저장소 추상화.
+
+- AzureStorage : Azure Blob (운영)
+- LocalStorage : 로컬 디스크 + /media 정적 라우트 (테스트/벤치마크/단일 서버)
+
+import 시점에는 아무 것도 만들지 않고, get_storage() 를 처음 부를 때
+설정을 보고 백엔드를 하나 만들어 프로세스 전체에서 공유한다.
+"""
+import base64
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+
+
+class UploadTooLargeError(ValueError):
+    """업로드 크기가 UPLOAD_MAX_BYTES 를 넘었을 때"""
+
+    def __init__(self, limit: int):
+        super().__init__(f"upload exceeds {limit} bytes")
+        self.limit = limit
+
+
+class StorageBackend:
+    """모든 백엔드가 구현하는 최소 인터페이스"""
+
+    name = "base"
+
+    def url_for(self, blob_name: str) -> str:
+        raise NotImplementedError
+
+    def exists(self, blob_name: str) -> bool:
+        raise NotImplementedError
+
+    def put_bytes(self, blob_name: str, data: bytes, content_type: Optional[str] = None) -> str:
+        raise NotImplementedError
+
+    async def put_stream(
+        self,
+        stream,
+        blob_name: str,
+        content_type: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+    ) -> str:
+        raise NotImplementedError
+
+    def size_of(self, blob_name: str) -> Optional[int]:
+        """blob 크기 (없으면 None)"""
+        raise NotImplementedError
+
+    def get_bytes(self, blob_name: str) -> bytes:
+        raise NotImplementedError
+
+    def get_bytes_with_etag(self, blob_name: str) -> Tuple[bytes, str]:
+        """내용 + 그 내용의 ETag (읽은 뒤 덮어써졌는지 etag_of 와 비교할 때)"""
+        raise NotImplementedError
+
+    def etag_of(self, blob_name: str) -> Optional[str]:
+        """현재 ETag (없으면 None). 다시 쓰면 바뀜"""
+        raise NotImplementedError
+
+    def delete(self, blob_name: str) -> None:
+        raise NotImplementedError
+
+    def create_upload_url(self, blob_name: str, content_type: Optional[str], expires_at: datetime, token: str) -> dict:
+        """
+        클라이언트가 API 를 거치지 않고 직접 올릴 수 있는 URL.
+        반환: {"uploadUrl", "method", "headers"}
+        """
+        raise NotImplementedError
+
+
+async def iter_chunks(stream, max_bytes: Optional[int], chunk_size: Optional[int]):
+    """async 스트림을 chunk 로 읽으면서 max_bytes 를 넘으면 바로 중단"""
+    max_bytes = max_bytes or settings.UPLOAD_MAX_BYTES
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    total = 0
+    while True:
+        chunk = await stream.read(chunk_size)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_bytes:
+            raise UploadTooLargeError(max_bytes)
+        yield chunk
+
+
+# ---------- Azure Blob ----------
+class AzureStorage(StorageBackend):
+    name = "azure"
+
+    def __init__(self, connection_string: str, container: str, pool_size: int = 20):
+        if not connection_string:
+            raise RuntimeError("AZURE_STORAGE_CONNECTION_STRING is missing")
+        if not container:
+            raise RuntimeError("AZURE_CONTAINER_NAME is missing (Blob 컨테이너 이름을 넣어야 함)")
+        self.connection_string = connection_string
+        self.container = container
+        self.pool_size = pool_size
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        # 첫 사용 시에만 클라이언트 생성 + 컨테이너 확인 (네트워크 호출은 여기서 한 번)
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    from azure.core.pipeline.transport import RequestsTransport
+                    from azure.storage.blob import BlobServiceClient
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    client = BlobServiceClient.from_connection_string(
+                        self.connection_string,
+                        transport=RequestsTransport(session=session, session_owner=False),
+                    )
+                    try:
+                        client.create_container(self.container)
+                    except Exception:
+                        pass  # 이미 있으면 스킵
+                    self._client = client
+        return self._client
+
+    def _blob(self, blob_name: str):
+        return self.client.get_blob_client(container=self.container, blob=blob_name)
+
+    def url_for(self, blob_name: str) -> str:
+        return self._blob(blob_name).url
+
+    def exists(self, blob_name: str) -> bool:
+        return self._blob(blob_name).exists()
+
+    def put_bytes(self, blob_name: str, data: bytes, content_type: Optional[str] = None) -> str:
+        from azure.storage.blob import ContentSettings
+
+        blob_client = self._blob(blob_name)
+        content_settings = ContentSettings(content_type=content_type) if content_type else None
+        blob_client.upload_blob(data, overwrite=True, content_settings=content_settings)
+        return blob_client.url
+
+    async def put_stream(self, stream, blob_name, content_type=None, max_bytes=None, chunk_size=None) -> str:
+        """
+        staged block 업로드.
+        - chunk 하나 크기만 메모리 사용
+        - 블로킹 SDK 호출은 스레드풀로 넘겨서 이벤트 루프를 막지 않음
+        - 커밋 안 된 블록은 Azure가 알아서 정리
+        """
+        from azure.storage.blob import BlobBlock, ContentSettings
+
+        blob_client = self._blob(blob_name)
+        blocks = []
+        async for chunk in iter_chunks(stream, max_bytes, chunk_size):
+            # 블록 ID는 blob 안에서 길이가 모두 같아야 함
+            block_id = base64.b64encode(f"{len(blocks):08d}".encode()).decode()
+            await run_in_threadpool(blob_client.stage_block, block_id=block_id, data=chunk, length=len(chunk))
+            blocks.append(BlobBlock(block_id=block_id))
+
+        content_settings = ContentSettings(content_type=content_type) if content_type else None
+        await run_in_threadpool(blob_client.commit_block_list, blocks, content_settings=content_settings)
+        return blob_client.url
+
+    def size_of(self, blob_name: str) -> Optional[int]:
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            return self._blob(blob_name).get_blob_properties().size
+        except ResourceNotFoundError:
+            return None
+
+    def get_bytes(self, blob_name: str) -> bytes:
+        return self._blob(blob_name).download_blob().readall()
+
+    def get_bytes_with_etag(self, blob_name: str) -> Tuple[bytes, str]:
+        # 다운로드 응답의 ETag = 실제로 받은 내용의 버전
+        downloader = self._blob(blob_name).download_blob()
+        return downloader.readall(), downloader.properties.etag
+
+    def etag_of(self, blob_name: str) -> Optional[str]:
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            return self._blob(blob_name).get_blob_properties().etag
+        except ResourceNotFoundError:
+            return None
+
+    def delete(self, blob_name: str) -> None:
+        from azure.core.exceptions import ResourceNotFoundError
+
+        try:
+            self._blob(blob_name).delete_blob()
+        except ResourceNotFoundError:
+            pass
+
+    def create_upload_url(self, blob_name, content_type, expires_at, token) -> dict:
+        """쓰기 전용 SAS URL (해당 blob 하나, expires_at 까지만 유효)"""
+        from azure.storage.blob import BlobSasPermissions, generate_blob_sas
+
+        cred = self.client.credential
+        sas = generate_blob_sas(
+            account_name=cred.account_name,
+            container_name=self.container,
+            blob_name=blob_name,
+            account_key=cred.account_key,
+            permission=BlobSasPermissions(create=True, write=True),
+            expiry=expires_at,
+            content_type=content_type,
+        )
+        headers = {"x-ms-blob-type": "BlockBlob"}
+        if content_type:
+            headers["Content-Type"] = content_type
+        return {"uploadUrl": f"{self.url_for(blob_name)}?{sas}", "method": "PUT", "headers": headers}
+
+
+# ---------- 로컬 디스크 ----------
+class LocalStorage(StorageBackend):
+    name = "local"
+
+    def __init__(self, root: str, base_url: str):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip("/")
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, blob_name: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, blob_name))
+        # ../ 로 root 밖에 쓰는 것 방지
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError("invalid blob name")
+        return path
+
+    def url_for(self, blob_name: str) -> str:
+        return f"{self.base_url}/{blob_name}"
+
+    def exists(self, blob_name: str) -> bool:
+        return os.path.isfile(self._path(blob_name))
+
+    def put_bytes(self, blob_name: str, data: bytes, content_type: Optional[str] = None) -> str:
+        path = self._path(blob_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{uuid.uuid4().hex}.part"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return self.url_for(blob_name)
+
+    async def put_stream(self, stream, blob_name, content_type=None, max_bytes=None, chunk_size=None) -> str:
+        path = self._path(blob_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 임시 파일에 쓰고 끝나면 rename → 중간에 실패해도 반쪽 파일이 안 보임
+        tmp = f"{path}.{uuid.uuid4().hex}.part"
+        f = await run_in_threadpool(open, tmp, "wb")
+        try:
+            async for chunk in iter_chunks(stream, max_bytes, chunk_size):
+                await run_in_threadpool(f.write, chunk)
+        except BaseException:
+            f.close()
+            os.unlink(tmp)
+            raise
+        f.close()
+        os.replace(tmp, path)
+        return self.url_for(blob_name)
+
+    def size_of(self, blob_name: str) -> Optional[int]:
+        path = self._path(blob_name)
+        return os.path.getsize(path) if os.path.isfile(path) else None
+
+    def get_bytes(self, blob_name: str) -> bytes:
+        with open(self._path(blob_name), "rb") as f:
+            return f.read()
+
+    @staticmethod
+    def _etag(st: os.stat_result) -> str:
+        # 쓰기는 항상 임시 파일 + rename 이라 다시 쓰면 inode 가 바뀜
+        return f"{st.st_ino:x}-{st.st_mtime_ns:x}-{st.st_size:x}"
+
+    def get_bytes_with_etag(self, blob_name: str) -> Tuple[bytes, str]:
+        with open(self._path(blob_name), "rb") as f:
+            return f.read(), self._etag(os.fstat(f.fileno()))
+
+    def etag_of(self, blob_name: str) -> Optional[str]:
+        try:
+            return self._etag(os.stat(self._path(blob_name)))
+        except FileNotFoundError:
+            return None
+
+    def delete(self, blob_name: str) -> None:
+        try:
+            os.unlink(self._path(blob_name))
+        except FileNotFoundError:
+            pass
+
+    def create_upload_url(self, blob_name, content_type, expires_at, token) -> dict:
+        """SAS 대신 서명 토큰이 붙은 PUT /api/image/direct/... (로컬 저장소 전용 엔드포인트)"""
+        base = settings.PUBLIC_BASE_URL.rstrip("/")
+        headers = {"Content-Type": content_type} if content_type else {}
+        return {"uploadUrl": f"{base}/api/image/direct/{blob_name}?token={token}", "method": "PUT", "headers": headers}
+
+
+# ---------- 백엔드 선택 ----------
+_storage: Optional[StorageBackend] = None
+_storage_lock = threading.Lock()
+
+
+def storage_backend_name() -> str:
+    """STORAGE_BACKEND 미지정 시 Azure 접속 정보가 있으면 azure, 없으면 local"""
+    if settings.STORAGE_BACKEND:
+        return settings.STORAGE_BACKEND.lower()
+    return "azure" if settings.AZURE_STORAGE_CONNECTION_STRING else "local"
+
+
+def get_storage() -> StorageBackend:
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                backend = storage_backend_name()
+                if backend == "azure":
+                    _storage = AzureStorage(
+                        settings.AZURE_STORAGE_CONNECTION_STRING,
+                        settings.AZURE_CONTAINER_NAME,
+                        pool_size=settings.AZURE_POOL_SIZE,
+                    )
+                elif backend == "local":
+                    _storage = LocalStorage(
+                        settings.LOCAL_STORAGE_DIR,
+                        settings.PUBLIC_BASE_URL.rstrip("/") + settings.LOCAL_STORAGE_URL_PREFIX,
+                    )
+                else:
+                    raise RuntimeError(f"unknown STORAGE_BACKEND: {backend}")
+    return _storage
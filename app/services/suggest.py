@@ -0,0 +1,153 @@
+# app/services/suggest.py
+"""
+검색창 자동완성 (/api/postings/suggest).
+
+- 게시물 제목 단어 + 카테고리 이름을 자모 단위로 풀어서 prefix trie 에 넣음
+  → "아이ㅍ", "아이포" 처럼 글자를 치는 중간 상태도 "아이폰" 으로 이어짐
+  (겹모음/겹받침도 낱자로 풀어서 "괜" 을 치는 도중인 "고ㅐ" 도 맞음)
+- 인기순(게시물 수)으로 넣기 때문에 각 노드의 top-k 는 넣는 순서대로 채우면 끝 → 조회는 trie 를 따라 내려가기만 함
+- 노드 수 x 추정 크기가 SUGGEST_MEMORY_MB 를 넘으면 덜 인기 있는 단어부터 버림
+- 주기 작업으로 새로 만든 trie 로 통째로 교체 (조회 쪽은 락 없음)
+"""
+import re
+from collections import Counter
+from typing import List, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.jobs import register_job
+from app.models.posting import Posting
+
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+         "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+# 겹모음/겹받침 → 낱자 (자판에서 두 번 눌러 만드는 것들)
+_COMPOUND = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+
+_WORD = re.compile(r"[0-9a-z가-힣]+")
+# 노드 하나 ([자식 dict, top 목록]) 추정 크기 (bytes, tracemalloc 로 잰 값)
+_NODE_BYTES = 430
+
+
+def decompose(text: str) -> str:
+    """한글 음절 → 자모 낱자. 그 외 문자는 그대로 (소문자 변환은 호출하는 쪽에서)"""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_CHO[code // 588])
+            out.append(_COMPOUND.get(_JUNG[(code % 588) // 28], _JUNG[(code % 588) // 28]))
+            jong = _JONG[code % 28]
+            if jong:
+                out.append(_COMPOUND.get(jong, jong))
+        else:
+            out.append(_COMPOUND.get(ch, ch))
+    return "".join(out)
+
+
+def _normalize(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+class SuggestTrie:
+    """items: (보여줄 문자열, 종류, 점수) — 점수 내림차순으로 넣어야 top-k 가 맞음"""
+
+    def __init__(self, top_k: int):
+        self.top_k = top_k
+        self.root: list = [{}, []]
+        self.items: List[Tuple[str, str, int]] = []
+        self.nodes = 1
+
+    def insert(self, item: Tuple[str, str, int], keys: List[str], max_nodes: int) -> bool:
+        """노드 한도를 넘게 되면 넣지 않고 False"""
+        paths = [decompose(k) for k in keys]
+        # 새로 생길 노드 수를 먼저 세서 한도 확인
+        new_nodes = 0
+        for path in paths:
+            node = self.root
+            for i, ch in enumerate(path):
+                child = node[0].get(ch)
+                if child is None:
+                    new_nodes += len(path) - i
+                    break
+                node = child
+        if self.nodes + new_nodes > max_nodes:
+            return False
+
+        idx = len(self.items)
+        self.items.append(item)
+        for path in paths:
+            node = self.root
+            for ch in path:
+                child = node[0].get(ch)
+                if child is None:
+                    child = node[0][ch] = [{}, []]
+                    self.nodes += 1
+                node = child
+                top = node[1]
+                if len(top) < self.top_k and (not top or top[-1] != idx):
+                    top.append(idx)
+        return True
+
+    def lookup(self, prefix: str) -> List[Tuple[str, str, int]]:
+        node = self.root
+        for ch in decompose(prefix):
+            node = node[0].get(ch)
+            if node is None:
+                return []
+        return [self.items[i] for i in node[1]]
+
+
+class SuggestIndex:
+    def __init__(self):
+        self._trie = SuggestTrie(settings.SUGGEST_TOP_K)
+
+    def rebuild(self, db: Session) -> int:
+        term_counts: Counter = Counter()
+        for (title,) in db.execute(select(Posting.title)):
+            # 한 게시물 안에서 같은 단어는 한 번만
+            term_counts.update({w for w in _WORD.findall((title or "").lower()) if len(w) >= 2})
+        category_counts = dict(db.execute(select(Posting.category, func.count()).group_by(Posting.category)).all())
+
+        entries = [((c, "category", n), [c.lower()] + [p.lower() for p in re.split(r"[/\s]+", c) if p and p != c])
+                   for c, n in category_counts.items() if c]
+        entries += [((t, "term", n), [t]) for t, n in term_counts.items() if n >= settings.SUGGEST_MIN_COUNT]
+        # 점수 내림차순 (같으면 카테고리 먼저, 그다음 짧은 것)
+        entries.sort(key=lambda e: (-e[0][2], e[0][1] != "category", len(e[0][0]), e[0][0]))
+
+        trie = SuggestTrie(settings.SUGGEST_TOP_K)
+        max_nodes = settings.SUGGEST_MEMORY_MB * 1024 * 1024 // _NODE_BYTES
+        for item, keys in entries:
+            if not trie.insert(item, keys, max_nodes):
+                break
+        self._trie = trie
+        return len(trie.items)
+
+    def suggest(self, q: str, size: int = 10) -> List[dict]:
+        """마지막 단어를 자동완성하고 앞 단어들은 그대로 붙여서 돌려줌"""
+        q = _normalize(q)
+        if not q:
+            return []
+        head, _, last = q.rpartition(" ")
+        out = []
+        for text, kind, count in self._trie.lookup(last)[:size]:
+            if head and kind == "term":
+                text = f"{head} {text}"
+            out.append({"text": text, "type": kind, "count": count})
+        return out
+
+    def stats(self) -> dict:
+        trie = self._trie
+        return {"items": len(trie.items), "nodes": trie.nodes, "approxBytes": trie.nodes * _NODE_BYTES}
+
+
+suggest_index = SuggestIndex()
+
+register_job("suggest_index", settings.SUGGEST_REBUILD_SECONDS, suggest_index.rebuild)
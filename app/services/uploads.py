@@ -0,0 +1,319 @@
+# app/services/uploads.py
+"""이미지 업로드 흐름: 내용 해시 → (중복이면 기존 url) → 원본 저장 → 파생본 생성/저장 → ImageAsset 기록"""
+import hashlib
+import logging
+import mimetypes
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from jose import jwt, JWTError
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.db_writer import db_writer
+from app.models.image_asset import ImageAsset
+from app.models.posting import PostingImage
+from app.services.images import process_upload, derivative_name, run_in_image_pool
+from app.services.storage import get_storage, iter_chunks, UploadTooLargeError
+
+logger = logging.getLogger(__name__)
+
+# ImageAsset → PostingImage 로 그대로 복사하는 메타데이터 컬럼
+IMAGE_META_FIELDS = ("width", "height", "byte_size", "dominant_color", "blurhash", "phash")
+# ImageAsset 에만 저장 (비슷한 사진 검색 인덱스가 url 로 조인해서 읽음)
+ASSET_ONLY_FIELDS = ("embedding", "embedding_version")
+
+
+# ---------- 내용 해시 인덱스 ----------
+class HashIndex:
+    """sha256 → url LRU. 최근 업로드는 DB 조회 없이 바로 응답"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sha: str) -> Optional[str]:
+        with self._lock:
+            url = self._data.get(sha)
+            if url is not None:
+                self._data.move_to_end(sha)
+            return url
+
+    def put(self, sha: str, url: str) -> None:
+        with self._lock:
+            self._data[sha] = url
+            self._data.move_to_end(sha)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+hash_index = HashIndex(settings.UPLOAD_HASH_INDEX_SIZE)
+
+
+async def hash_stream(stream) -> Tuple[str, int]:
+    """스트림을 chunk 로 읽으며 SHA-256 계산 (크기 제한도 여기서 걸림)"""
+    h = hashlib.sha256()
+    size = 0
+    async for chunk in iter_chunks(stream, None, None):
+        h.update(chunk)
+        size += len(chunk)
+    return h.hexdigest(), size
+
+
+def _extension(filename: Optional[str], content_type: Optional[str]) -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    if not ext and content_type:
+        ext = mimetypes.guess_extension(content_type) or ""
+    return ext
+
+
+def content_blob_name(sha: str, filename: Optional[str], content_type: Optional[str]) -> str:
+    """내용 기반 blob 이름: ab/abcdef....jpg (같은 사진 = 같은 이름, 다른 사진끼리 덮어쓰기 없음)"""
+    return f"{sha[:2]}/{sha}{_extension(filename, content_type)}"
+
+
+def find_asset_by_hash(db: Session, sha: str) -> Optional[ImageAsset]:
+    url = hash_index.get(sha)
+    if url is not None:
+        asset = db.scalar(select(ImageAsset).where(ImageAsset.url == url))
+    else:
+        asset = db.scalar(select(ImageAsset).where(ImageAsset.sha256 == sha))
+    if asset is not None:
+        hash_index.put(sha, asset.url)
+    return asset
+
+
+async def store_derivatives(data: bytes, blob_name: str) -> Tuple[Dict[str, str], dict]:
+    """
+    파생본 + 메타데이터를 프로세스 풀에서 계산하고 파생본은 원본 옆에 저장.
+    반환: (variants, meta). 디코딩 불가 이미지면 ({}, {"byte_size": ...})
+    """
+    try:
+        result = await run_in_image_pool(process_upload, data, settings.IMAGE_DERIVATIVE_WIDTHS)
+    except Exception:
+        logger.warning("image processing failed: %s", blob_name, exc_info=True)
+        return {}, {"byte_size": len(data)}
+
+    storage = get_storage()
+    variants: Dict[str, str] = {}
+    for width, webp in result["variants"].items():
+        variants[str(width)] = await run_in_threadpool(
+            storage.put_bytes, derivative_name(blob_name, width), webp, "image/webp"
+        )
+    return variants, result["meta"]
+
+
+def record_asset(
+    db: Session,
+    url: str,
+    blob_name: str,
+    content_type: Optional[str],
+    variants: Dict[str, str],
+    sha256: Optional[str] = None,
+    meta: Optional[dict] = None,
+) -> ImageAsset:
+    thumb = variants[min(variants, key=int)] if variants else None
+    asset = db.scalar(select(ImageAsset).where(ImageAsset.url == url))
+    created = asset is None
+    if created:
+        asset = ImageAsset(url=url, blob_name=blob_name)
+        db.add(asset)
+    asset.sha256 = sha256 or asset.sha256
+    asset.content_type = content_type
+    asset.variants = variants
+    asset.thumbnail_url = thumb
+    for k, v in (meta or {}).items():
+        if k in IMAGE_META_FIELDS or k in ASSET_ONLY_FIELDS:
+            setattr(asset, k, v)
+    try:
+        db.commit()
+    except IntegrityError:
+        # 같은 내용(sha256)이나 같은 url 이 동시에 먼저 등록됨 (조회 → 업로드 → insert 사이)
+        db.rollback()
+        if created:
+            existing = (find_asset_by_hash(db, sha256) if sha256 else None) or db.scalar(
+                select(ImageAsset).where(ImageAsset.url == url)
+            )
+            if existing is not None:
+                return existing
+        elif sha256:
+            # 이미 있는 row 갱신인데 sha256 을 다른 row 가 가져감 → sha 없이 나머지만 기록
+            return record_asset(db, url, blob_name, content_type, variants, None, meta)
+        raise
+    db.refresh(asset)
+    if asset.sha256:
+        hash_index.put(asset.sha256, asset.url)
+    return asset
+
+
+async def store_upload(image: UploadFile, db: Session) -> ImageAsset:
+    # 1) 내용 해시 (UploadFile 은 이미 로컬 임시파일이라 한 번 더 읽는 비용은 작음)
+    sha, _ = await hash_stream(image)
+
+    # 2) 이미 올라온 내용이면 저장소 쓰기 없이 기존 url 반환
+    existing = await run_in_threadpool(find_asset_by_hash, db, sha)
+    if existing is not None:
+        return existing
+
+    # 3) 새 내용 → 해시 기반 이름으로 스트리밍 업로드
+    blob_name = content_blob_name(sha, image.filename, image.content_type)
+    await image.seek(0)
+    url = await get_storage().put_stream(image, blob_name=blob_name, content_type=image.content_type)
+
+    # 스트리밍 업로드가 끝난 뒤 (크기 제한 통과한) 파일을 다시 읽어 파생본 생성
+    await image.seek(0)
+    data = await image.read()
+    variants, meta = await store_derivatives(data, blob_name)
+
+    return await run_in_threadpool(record_asset, db, url, blob_name, image.content_type, variants, sha, meta)
+
+
+def assets_by_url(db: Session, urls: Iterable[str]) -> Dict[str, ImageAsset]:
+    urls = list({str(u) for u in urls})
+    if not urls:
+        return {}
+    rows = db.execute(select(ImageAsset).where(ImageAsset.url.in_(urls))).scalars().all()
+    return {a.url: a for a in rows}
+
+
+def build_posting_images(db: Session, posting_id: int, urls: Iterable[str]) -> list[PostingImage]:
+    """게시물 이미지 row 생성. 우리 저장소에 올라온 이미지면 썸네일 url/메타데이터도 채움"""
+    urls = [str(u) for u in urls]
+    assets = assets_by_url(db, urls)
+    images = []
+    for url in urls:
+        asset = assets.get(url)
+        img = PostingImage(posting_id=posting_id, url=url)
+        if asset is not None:
+            img.thumbnail_url = asset.thumbnail_url
+            for k in IMAGE_META_FIELDS:
+                setattr(img, k, getattr(asset, k))
+        images.append(img)
+    return images
+
+
+# ---------- 직접 업로드 (API 서버를 거치지 않는 업로드) ----------
+UPLOAD_TOKEN_TYPE = "direct_upload"
+# 마무리 계산 중에 원본이 계속 바뀌면 이 횟수까지만 다시 계산
+FINALIZE_ATTEMPTS = 3
+
+
+def create_upload_token(user_id: int, blob_name: str, content_type: Optional[str], expires_at: datetime) -> str:
+    payload = {
+        "sub": str(user_id),
+        "typ": UPLOAD_TOKEN_TYPE,
+        "blob": blob_name,
+        "ct": content_type,
+        "exp": expires_at,
+    }
+    return jwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALG)
+
+
+def decode_upload_token(token: str) -> dict:
+    """서명/만료 검증. 실패하면 JWTError"""
+    payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALG])
+    if payload.get("typ") != UPLOAD_TOKEN_TYPE or not payload.get("blob"):
+        raise JWTError("not an upload token")
+    return payload
+
+
+def start_direct_upload(user_id: int, filename: Optional[str], content_type: Optional[str]) -> dict:
+    """짧게 유효한 업로드 URL + 완료 확인용 토큰 발급"""
+    blob_name = f"uploads/{uuid.uuid4().hex}{_extension(filename, content_type)}"
+
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=settings.DIRECT_UPLOAD_EXPIRE_SECONDS)
+    token = create_upload_token(user_id, blob_name, content_type, expires_at)
+    target = get_storage().create_upload_url(blob_name, content_type, expires_at, token)
+    return {
+        **target,
+        "blobName": blob_name,
+        "uploadToken": token,
+        "expiresAt": expires_at.isoformat().replace("+00:00", "Z"),
+        "maxBytes": settings.UPLOAD_MAX_BYTES,
+    }
+
+
+def find_asset_by_blob(db: Session, blob_name: str) -> Optional[ImageAsset]:
+    """직접 업로드 blob 에 대해 이미 완료 처리된 ImageAsset (url 은 unique 인덱스)"""
+    return db.scalar(select(ImageAsset).where(ImageAsset.url == get_storage().url_for(blob_name)))
+
+
+def complete_direct_upload(db: Session, claims: dict) -> ImageAsset:
+    """
+    업로드 완료 콜백: blob 이 실제로 올라왔는지/크기는 맞는지 확인 후 ImageAsset 등록.
+    - 없으면 FileNotFoundError
+    - 너무 크면 blob 삭제 후 UploadTooLargeError
+    """
+    storage = get_storage()
+    blob_name = claims["blob"]
+    size = storage.size_of(blob_name)
+    if size is None:
+        raise FileNotFoundError(blob_name)
+    if size > settings.UPLOAD_MAX_BYTES:
+        storage.delete(blob_name)
+        raise UploadTooLargeError(settings.UPLOAD_MAX_BYTES)
+    return record_asset(db, storage.url_for(blob_name), blob_name, claims.get("ct"), {})
+
+
+def _hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _record_finalized(
+    db: Session, asset_id: int, etag: str, variants: Dict[str, str], sha: str, meta: dict
+) -> Optional[ImageAsset]:
+    """읽은 뒤 원본이 다시 올라왔으면 (Azure SAS 는 만료 전까지 덮어쓰기 가능) 기록 안 하고 None"""
+    asset = db.get(ImageAsset, asset_id)
+    if get_storage().etag_of(asset.blob_name) != etag:
+        return None
+    # 같은 내용이 이미 등록돼 있으면 sha 는 그쪽에 남겨둠 (unique)
+    taken = db.scalar(select(ImageAsset.id).where(ImageAsset.sha256 == sha, ImageAsset.id != asset.id))
+    asset = record_asset(
+        db, asset.url, asset.blob_name, asset.content_type, variants, None if taken else sha, meta
+    )
+
+    # 완료 전에 게시물이 먼저 만들어졌으면 썸네일/메타데이터를 뒤늦게 채움
+    db.execute(
+        update(PostingImage)
+        .where(PostingImage.url == asset.url, PostingImage.blurhash.is_(None))
+        .values(thumbnail_url=asset.thumbnail_url, **{k: getattr(asset, k) for k in IMAGE_META_FIELDS})
+    )
+    db.commit()
+    return asset
+
+
+async def finalize_direct_upload(asset_id: int) -> None:
+    """
+    (백그라운드) 직접 업로드된 원본으로 해시/파생본 계산.
+    요청 처리와 무관하게 돌기 때문에 응답 지연에는 영향 없음.
+    이벤트 루프에서 도는 task 라 DB 읽기/해시는 스레드풀, 이미지 처리는 프로세스 풀, 기록은 db_writer 에서.
+    계산하는 사이에 원본이 바뀌었으면 (ETag 비교) 새 내용으로 다시 계산.
+    """
+    db = SessionLocal()
+    try:
+        asset = await run_in_threadpool(db.get, ImageAsset, asset_id)
+        if asset is None:
+            return
+        storage = get_storage()
+        for _ in range(FINALIZE_ATTEMPTS):
+            data, etag = await run_in_threadpool(storage.get_bytes_with_etag, asset.blob_name)
+            sha = await run_in_threadpool(_hash_bytes, data)
+            variants, meta = await store_derivatives(data, asset.blob_name)
+            recorded = await db_writer.run(lambda wdb: _record_finalized(wdb, asset_id, etag, variants, sha, meta))
+            if recorded is not None:
+                return
+        logger.warning("finalize_direct_upload gave up, blob keeps changing: asset_id=%s", asset_id)
+    except Exception:
+        logger.exception("finalize_direct_upload failed: asset_id=%s", asset_id)
+    finally:
+        await run_in_threadpool(db.close)
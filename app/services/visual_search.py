@@ -0,0 +1,284 @@
+# app/services/visual_search.py
+"""
+비슷한 사진으로 게시물 찾기 (최근접 이웃 검색).
+
+- 벡터: ImageAsset.embedding (float16) 을 PostingImage.url 로 조인해서 읽음
+- 저장: VISUAL_INDEX_DIR 아래 float16 memmap 파일 → 30만 장 x 128차원 = 약 77MB,
+  OS 페이지 캐시에 올라가므로 프로세스 힙은 거의 안 씀
+- 검색: 단위 벡터라 내적 = 코사인 유사도. 행 블록 단위로 float32 변환 후 행렬곱 (BLAS)
+- VISUAL_IVF_MIN_ROWS 이상이면 구면 k-means 로 클러스터를 나눠 파일에 클러스터 순서로 저장하고
+  질의와 가까운 VISUAL_IVF_NPROBE 개 클러스터만 훑음 (IVF)
+- 재구축 사이에 생성/삭제된 게시물은 메모리의 pending 벡터 / 삭제 집합으로 바로 반영
+"""
+import glob
+import logging
+import os
+import threading
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.jobs import register_job
+from app.models.image_asset import ImageAsset
+from app.models.posting import PostingImage
+from app.services.embeddings import embed_bytes, get_extractor
+from app.services.images import get_image_pool, run_in_image_pool
+from app.services.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 float32 로 바꿔 곱하는 행 수 (약 8MB)
+_BLOCK_ROWS = 16384
+# k-means 학습에 쓰는 최대 표본 수 / 반복 횟수
+_KMEANS_SAMPLE = 20000
+_KMEANS_ITERS = 10
+
+
+def _normalize(m: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return m / norms
+
+
+def spherical_kmeans(vecs: np.ndarray, nlist: int, seed: int = 0) -> np.ndarray:
+    """단위 벡터 k-means (거리 대신 내적 최대). 반환: (nlist, dim) float32 단위 중심"""
+    rng = np.random.default_rng(seed)
+    sample = vecs
+    if len(vecs) > _KMEANS_SAMPLE:
+        sample = vecs[rng.choice(len(vecs), _KMEANS_SAMPLE, replace=False)]
+    sample = np.asarray(sample, dtype=np.float32)
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+    for _ in range(_KMEANS_ITERS):
+        assign = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        empty = np.bincount(assign, minlength=nlist) == 0
+        # 빈 클러스터는 임의 표본으로 다시 시작
+        sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+        centroids = _normalize(sums)
+    return centroids
+
+
+def assign_clusters(vecs: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    out = np.empty(len(vecs), dtype=np.int32)
+    for start in range(0, len(vecs), _BLOCK_ROWS):
+        block = np.asarray(vecs[start:start + _BLOCK_ROWS], dtype=np.float32)
+        out[start:start + _BLOCK_ROWS] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+
+class _Snapshot:
+    """재구축 한 번의 결과 (읽기 전용). 교체는 참조 한 번 바꾸는 것으로 끝남"""
+
+    def __init__(self, path: Optional[str], vectors: np.ndarray, ids: np.ndarray,
+                 centroids: Optional[np.ndarray] = None, offsets: Optional[np.ndarray] = None):
+        self.path = path
+        self.vectors = vectors
+        self.ids = ids
+        self.centroids = centroids
+        self.offsets = offsets
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    def segments(self, q: np.ndarray, nprobe: int) -> List[Tuple[int, int]]:
+        if self.centroids is None:
+            return [(0, self.size)]
+        nprobe = min(nprobe, len(self.centroids))
+        probe = np.argpartition(-(self.centroids @ q), nprobe - 1)[:nprobe]
+        return [(int(self.offsets[c]), int(self.offsets[c + 1])) for c in sorted(probe)]
+
+
+class VisualIndex:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.dim = get_extractor().dim
+        self._snap = _Snapshot(None, np.zeros((0, self.dim), np.float16), np.zeros(0, np.int64))
+        # 재구축 이후 추가된 게시물: posting_id → (seq, float32 벡터들)
+        self._pending: Dict[int, Tuple[int, np.ndarray]] = {}
+        # 재구축 이후 삭제/수정된 게시물: posting_id → seq
+        self._removed: Dict[int, int] = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+
+    # ---------- 재구축 ----------
+    def rebuild(self, db: Session) -> int:
+        with self._rebuild_lock:
+            self._backfill(db)
+            with self._lock:
+                started = self._seq
+
+            version = get_extractor().version
+            rows = db.execute(
+                select(PostingImage.posting_id, ImageAsset.embedding)
+                .join(ImageAsset, ImageAsset.url == PostingImage.url)
+                .where(ImageAsset.embedding.is_not(None), ImageAsset.embedding_version == version)
+            ).all()
+
+            n = len(rows)
+            ids = np.fromiter((pid for pid, _ in rows), dtype=np.int64, count=n)
+            vecs = np.frombuffer(b"".join(e for _, e in rows), dtype=np.float16).reshape(n, self.dim)
+            del rows
+
+            centroids = offsets = None
+            if n >= settings.VISUAL_IVF_MIN_ROWS:
+                nlist = int(min(4096, max(16, np.sqrt(n))))
+                centroids = spherical_kmeans(vecs, nlist)
+                assign = assign_clusters(vecs, centroids)
+                order = np.argsort(assign, kind="stable")
+                vecs, ids = vecs[order], ids[order]
+                offsets = np.searchsorted(assign[order], np.arange(nlist + 1))
+
+            snap = self._write(vecs, ids, centroids, offsets)
+
+            with self._lock:
+                self._snap = snap
+                # 재구축 시작 이후에 들어온 변경만 남김
+                self._pending = {k: v for k, v in self._pending.items() if v[0] > started}
+                self._removed = {k: s for k, s in self._removed.items() if s > started}
+            self._cleanup(keep=snap.path)
+            return n
+
+    def _write(self, vecs, ids, centroids, offsets) -> _Snapshot:
+        if len(ids) == 0:
+            return _Snapshot(None, np.zeros((0, self.dim), np.float16), ids)
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"vectors-{uuid.uuid4().hex}.f16")
+        mm = np.memmap(path, dtype=np.float16, mode="w+", shape=vecs.shape)
+        mm[:] = vecs
+        mm.flush()
+        del mm
+        vectors = np.memmap(path, dtype=np.float16, mode="r", shape=vecs.shape)
+        return _Snapshot(path, vectors, ids, centroids, offsets)
+
+    def _cleanup(self, keep: Optional[str]) -> None:
+        # 이전 파일은 열려 있어도 (검색 중이어도) unlink 가능 — 매핑이 닫힐 때 실제로 사라짐
+        for path in glob.glob(os.path.join(self.directory, "vectors-*.f16")):
+            if path != keep:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+    def _backfill(self, db: Session) -> int:
+        """게시물에 쓰인 이미지 중 임베딩이 없거나 추출기 버전이 다른 것을 조금씩 채움"""
+        if settings.VISUAL_BACKFILL_BATCH <= 0:
+            return 0
+        version = get_extractor().version
+        assets = db.execute(
+            select(ImageAsset)
+            .join(PostingImage, PostingImage.url == ImageAsset.url)
+            .where((ImageAsset.embedding_version.is_(None)) | (ImageAsset.embedding_version != version))
+            .distinct()
+            .limit(settings.VISUAL_BACKFILL_BATCH)
+        ).scalars().all()
+        if not assets:
+            return 0
+
+        storage = get_storage()
+        pool = get_image_pool()
+        futures = []
+        for asset in assets:
+            try:
+                futures.append((asset, pool.submit(embed_bytes, storage.get_bytes(asset.blob_name))))
+            except Exception:
+                logger.warning("visual backfill: cannot read %s", asset.blob_name, exc_info=True)
+        done = 0
+        for asset, fut in futures:
+            try:
+                asset.embedding = fut.result()
+            except Exception:
+                # 디코딩 불가 이미지는 버전만 기록해서 다시 시도하지 않음
+                asset.embedding = None
+            asset.embedding_version = version
+            done += 1
+        db.commit()
+        return done
+
+    # ---------- 실시간 반영 ----------
+    def add(self, posting_id: int, embeddings: Iterable[Optional[bytes]]) -> None:
+        vecs = [np.frombuffer(e, dtype=np.float16) for e in embeddings if e]
+        with self._lock:
+            self._seq += 1
+            self._removed[posting_id] = self._seq  # 예전 벡터는 가림
+            if vecs:
+                self._pending[posting_id] = (self._seq, np.vstack(vecs).astype(np.float32))
+            else:
+                self._pending.pop(posting_id, None)
+
+    def remove(self, posting_id: int) -> None:
+        with self._lock:
+            self._seq += 1
+            self._removed[posting_id] = self._seq
+            self._pending.pop(posting_id, None)
+
+    # ---------- 검색 ----------
+    def search(self, query: np.ndarray, k: int = 20, nprobe: Optional[int] = None) -> List[Tuple[int, float]]:
+        """질의 벡터와 가장 비슷한 사진을 가진 게시물 k 개: [(posting_id, 유사도)] 내림차순"""
+        q = np.asarray(query, dtype=np.float32).ravel()
+        q = q / (np.linalg.norm(q) or 1)
+        with self._lock:
+            snap, pending, removed = self._snap, dict(self._pending), set(self._removed)
+
+        # 게시물당 사진이 여러 장이라 넉넉히 뽑은 뒤 게시물 단위로 합침
+        want = k * 4 + len(removed)
+        best: Dict[int, float] = {}
+
+        for start, end in snap.segments(q, nprobe or settings.VISUAL_IVF_NPROBE):
+            for a in range(start, end, _BLOCK_ROWS):
+                b = min(end, a + _BLOCK_ROWS)
+                scores = np.asarray(snap.vectors[a:b], dtype=np.float32) @ q
+                if len(scores) > want:
+                    top = np.argpartition(-scores, want - 1)[:want]
+                else:
+                    top = np.arange(len(scores))
+                for i in top:
+                    pid = int(snap.ids[a + i])
+                    s = float(scores[i])
+                    if pid not in removed and s > best.get(pid, -2.0):
+                        best[pid] = s
+
+        for pid, (_, vecs) in pending.items():
+            best[pid] = max(best.get(pid, -2.0), float((vecs @ q).max()))
+
+        ranked = sorted(best.items(), key=lambda kv: (-kv[1], kv[0]))[:k]
+        return [(pid, round(s, 4)) for pid, s in ranked]
+
+    def stats(self) -> dict:
+        snap = self._snap
+        return {
+            "vectors": snap.size,
+            "dim": self.dim,
+            "clusters": len(snap.centroids) if snap.centroids is not None else 0,
+            "pending": len(self._pending),
+            "removed": len(self._removed),
+            "extractor": get_extractor().version,
+        }
+
+
+visual_index = VisualIndex(settings.VISUAL_INDEX_DIR)
+
+register_job("visual_index", settings.VISUAL_REBUILD_SECONDS, visual_index.rebuild)
+
+
+def index_posting(db: Session, posting_id: int, urls: Iterable[str]) -> None:
+    """게시물 생성/수정 직후 그 게시물 사진 벡터를 바로 반영"""
+    urls = [str(u) for u in urls]
+    version = get_extractor().version
+    embeddings = db.execute(
+        select(ImageAsset.embedding)
+        .where(ImageAsset.url.in_(urls), ImageAsset.embedding_version == version)
+    ).scalars().all() if urls else []
+    visual_index.add(posting_id, embeddings)
+
+
+async def embed_query(data: bytes) -> np.ndarray:
+    """(프로세스 풀) 검색 질의 사진 → float32 벡터"""
+    raw = await run_in_image_pool(embed_bytes, data)
+    return np.frombuffer(raw, dtype=np.float16).astype(np.float32)
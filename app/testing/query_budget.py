@@ -0,0 +1,65 @@
+# app/testing/query_budget.py
+"""
+엔드포인트별 쿼리 수 상한 검사 (테스트용).
+
+    from app.testing.query_budget import assert_max_queries
+
+    with TestClient(app) as client:
+        with assert_max_queries(6, route="/api/chat/me"):
+            client.get("/api/chat/me", headers=auth)
+
+블록 안에서 끝난 HTTP 요청 중 route(경로 템플릿, 안 주면 전부)에 해당하는 요청 각각의 쿼리 수가
+max_queries 를 넘으면 AssertionError (많이 나온 쿼리 모양을 같이 보여줌).
+TestClient 는 앱을 다른 스레드에서 돌리므로 contextvar 대신 query_stats 의 요청 종료 콜백으로 모음.
+HTTP 를 거치지 않고 서비스 함수를 직접 부르는 경우는 블록 안 쿼리를 합쳐서 한 건으로 셈.
+요청 단위 집계는 MetricsMiddleware 가 하므로 METRICS_ENABLED 가 켜져 있어야 함
+"""
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from app.core import query_stats
+from app.core.query_stats import QueryStats
+
+
+class QueryBudget:
+    def __init__(self, route: Optional[str]):
+        self.route = route
+        # (method, route, stats)
+        self.requests: List[Tuple[str, str, QueryStats]] = []
+
+    def _observe(self, method: str, route: str, stats: QueryStats) -> None:
+        if self.route is None or route == self.route:
+            self.requests.append((method, route, stats))
+
+    @property
+    def max_queries(self) -> int:
+        return max((s.queries for _, _, s in self.requests), default=0)
+
+
+def _describe(method: str, route: str, stats: QueryStats, limit: int) -> str:
+    lines = [f"{method} {route or '(direct)'}: {stats.queries} queries (budget {limit})"]
+    for shape, n in sorted((stats.shapes or {}).items(), key=lambda x: -x[1])[:5]:
+        lines.append(f"  {n}x {shape[:200]}")
+    return "\n".join(lines)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, route: Optional[str] = None) -> Iterator[QueryBudget]:
+    budget = QueryBudget(route)
+    query_stats.add_observer(budget._observe)
+    # 블록 안에서 직접 실행하는 쿼리 (HTTP 요청 밖)
+    token = query_stats.start_request(track_shapes=True)
+    try:
+        yield budget
+    finally:
+        query_stats.remove_observer(budget._observe)
+        direct = query_stats.end_request(token)
+        # observer 를 먼저 떼었으므로 direct 는 여기서 따로 더함
+        if route is None and direct.queries:
+            budget.requests.append(("", "", direct))
+
+    over = [(m, r, s) for m, r, s in budget.requests if s.queries > max_queries]
+    if over:
+        raise AssertionError(
+            "query budget exceeded\n" + "\n".join(_describe(m, r, s, max_queries) for m, r, s in over)
+        )
@@ -0,0 +1,55 @@
+# tests/conftest.py
+"""
+테스트용 설정: app 을 import 하기 전에 DB/저장소 경로를 임시 디렉터리로 돌림
+(settings 는 import 시점에 환경변수를 읽음).
+
+    pip install pytest httpx   # TestClient 가 httpx 를 씀
+    python -m pytest -q
+"""
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="preloved-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ["DATABASE_REPLICA_URLS"] = "[]"
+os.environ["LOCAL_STORAGE_DIR"] = f"{_tmp}/media"
+os.environ["VISUAL_INDEX_DIR"] = f"{_tmp}/visual_index"
+os.environ["SLOW_QUERY_LOG_PATH"] = ""
+os.environ["PREDICT_CACHE_PATH"] = ""
+# 요청별 쿼리 수 집계는 MetricsMiddleware 가 함 (assert_max_queries 에 필요)
+os.environ["METRICS_ENABLED"] = "true"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.security import create_access_token  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def make_user(client):
+    counter = {"n": 0}
+
+    def _make(nickname: str = None) -> tuple:
+        counter["n"] += 1
+        n = counter["n"]
+        r = client.post(
+            "/api/users",
+            json={
+                "email": f"user{n}@example.com",
+                "nickname": nickname or f"user{n}",
+                "birthDate": "2000-01-01",
+                "password": "password1",
+            },
+        )
+        assert r.status_code in (200, 201), r.text
+        user_id = r.json()["userId"]
+        return user_id, {"Authorization": "Bearer " + create_access_token(user_id)}
+
+    return _make
@@ -0,0 +1,123 @@
+# tests/test_chat_query_budget.py
+"""채팅 목록/메시지 조회: 방·메시지 수와 상관없이 쿼리 수가 고정인지 + 응답 내용"""
+import pytest
+
+from app.core.db import SessionLocal
+from app.models.chat import ChatMessage, ChatRead
+from app.testing.query_budget import assert_max_queries
+
+# 인증(사용자 조회) 포함
+CHAT_LIST_BUDGET = 6
+MESSAGES_BUDGET = 5
+
+
+@pytest.fixture(scope="module")
+def chats(client, make_user):
+    seller, seller_h = make_user("seller")
+    buyers = [make_user(f"buyer{i}") for i in range(3)]
+    posting_ids = [
+        client.post(
+            "/api/postings",
+            json={"title": f"상품{i}", "price": 1000, "content": "x", "category": "게임", "images": []},
+            headers=seller_h,
+        ).json()["postingId"]
+        for i in range(3)
+    ]
+    rooms = []
+    for pid in posting_ids:
+        for buyer, buyer_h in buyers:
+            r = client.post("/api/chat", json={"postingId": pid}, headers=buyer_h)
+            assert r.status_code in (200, 201), r.text
+            rooms.append((r.json()["chatId"], pid, buyer, buyer_h))
+
+    # 방마다 판매자 → 구매자 → 판매자 순으로 메시지 3개
+    messages = {}
+    with SessionLocal() as db:
+        for chat_id, _, buyer, _ in rooms:
+            ids = []
+            for sender in (seller, buyer, seller):
+                m = ChatMessage(room_id=chat_id, sender_id=sender, type="text", content=f"{chat_id}-{sender}")
+                db.add(m)
+                db.flush()
+                ids.append(m.id)
+            messages[chat_id] = ids
+
+        first, second = rooms[0][0], rooms[1][0]
+        # 첫 방: 구매자는 읽음 row 만 있고 아직 안 읽음 (NULL), 판매자는 구매자 메시지까지 읽음
+        db.add(ChatRead(room_id=first, user_id=rooms[0][2], last_read_message_id=None))
+        db.add(ChatRead(room_id=first, user_id=seller, last_read_message_id=messages[first][1]))
+        # 두 번째 방: 구매자가 끝까지 읽음, 판매자도 끝까지 읽음
+        db.add(ChatRead(room_id=second, user_id=rooms[1][2], last_read_message_id=messages[second][2]))
+        db.add(ChatRead(room_id=second, user_id=seller, last_read_message_id=messages[second][2]))
+        db.commit()
+
+    return {
+        "seller": seller,
+        "seller_h": seller_h,
+        "rooms": rooms,
+        "messages": messages,
+        "titles": {pid: f"상품{i}" for i, pid in enumerate(posting_ids)},
+        "nicknames": {b: f"buyer{i}" for i, (b, _) in enumerate(buyers)},
+    }
+
+
+def test_chat_list_budget_and_payload(client, chats):
+    with assert_max_queries(CHAT_LIST_BUDGET, route="/api/chat/me") as budget:
+        r = client.get("/api/chat/me", headers=chats["seller_h"])
+    assert r.status_code == 200, r.text
+    assert len(budget.requests) == 1
+
+    items = {c["chatId"]: c for c in r.json()["chats"]}
+    assert set(items) == {chat_id for chat_id, _, _, _ in chats["rooms"]}
+
+    first, second = chats["rooms"][0][0], chats["rooms"][1][0]
+    for chat_id, pid, buyer, _ in chats["rooms"]:
+        item = items[chat_id]
+        assert item["role"] == "seller"
+        assert item["postingId"] == pid
+        assert item["postingTitle"] == chats["titles"][pid]
+        assert item["otherId"] == buyer
+        assert item["otherNickname"] == chats["nicknames"][buyer]
+        last = item["lastMessage"]
+        assert last["messageId"] == chats["messages"][chat_id][-1]
+        assert last["isMine"] is True
+        assert last["isRead"] is (chat_id == second)
+    assert items[first]["lastMessage"]["content"] == f"{first}-{chats['seller']}"
+
+
+def test_chat_messages_budget_and_payload(client, chats):
+    first, _, _, _ = chats["rooms"][0]
+    second, _, _, buyer_h = chats["rooms"][1]
+
+    with assert_max_queries(MESSAGES_BUDGET, route="/api/chat/{chat_id}") as budget:
+        r1 = client.get(f"/api/chat/{first}", headers=chats["seller_h"])
+        r2 = client.get(f"/api/chat/{second}", headers=buyer_h)
+        r3 = client.get(f"/api/chat/{second}", headers=chats["seller_h"])
+    for r in (r1, r2, r3):
+        assert r.status_code == 200, r.text
+    assert len(budget.requests) == 3
+
+    # 첫 방: 구매자 last_read 가 NULL → 판매자 메시지는 안 읽음, 구매자 메시지는 판매자가 읽음
+    body = r1.json()
+    m1, m2, m3 = chats["messages"][first]
+    assert [(m["messageId"], m["isMine"], m["isRead"]) for m in body["messages"]] == [
+        (m3, True, False),
+        (m2, False, True),
+        (m1, True, False),
+    ]
+    assert body["hasNext"] is False
+    assert body["nextCursor"] == m1
+    assert body["lastReadMessageId"] is None
+
+    # 두 번째 방 (구매자 시점): 서로 끝까지 읽음
+    body = r2.json()
+    m1, m2, m3 = chats["messages"][second]
+    assert [(m["messageId"], m["isMine"], m["isRead"]) for m in body["messages"]] == [
+        (m3, False, True),
+        (m2, True, True),
+        (m1, False, True),
+    ]
+    # 판매자가 읽은 마지막 메시지(m3)는 구매자가 보낸 게 아니라서 없음
+    assert body["lastReadMessageId"] is None
+    # 판매자 시점: 구매자가 판매자의 m3 까지 읽음
+    assert r3.json()["lastReadMessageId"] == m3
@@ -0,0 +1,51 @@
+# tests/test_chat_read.py
+"""웹소켓 read_message 의 읽음 위치 갱신 (_mark_read)"""
+from app.core.db import SessionLocal
+from app.models.chat import ChatMessage, ChatRead
+from app.routers.chat_ws import _mark_read
+
+
+def _room_with_messages(client, make_user, n: int):
+    seller, seller_h = make_user()
+    buyer, buyer_h = make_user()
+    pid = client.post(
+        "/api/postings",
+        json={"title": "읽음", "price": 1000, "content": "x", "category": "게임", "images": []},
+        headers=seller_h,
+    ).json()["postingId"]
+    chat_id = client.post("/api/chat", json={"postingId": pid}, headers=buyer_h).json()["chatId"]
+    with SessionLocal() as db:
+        msgs = [ChatMessage(room_id=chat_id, sender_id=seller, type="text", content=str(i)) for i in range(n)]
+        db.add_all(msgs)
+        db.commit()
+        return chat_id, buyer, [m.id for m in msgs]
+
+
+def _last_read(chat_id: int, user_id: int):
+    with SessionLocal() as db:
+        return db.query(ChatRead.last_read_message_id).filter_by(room_id=chat_id, user_id=user_id).scalar()
+
+
+def test_mark_read_moves_forward_only(client, make_user):
+    chat_id, buyer, (m1, m2) = _room_with_messages(client, make_user, 2)
+    with SessionLocal() as db:
+        assert _mark_read(db, chat_id, buyer, m2) is True
+        assert _mark_read(db, chat_id, buyer, m1) is True
+    assert _last_read(chat_id, buyer) == m2
+
+
+def test_mark_read_with_null_last_read(client, make_user):
+    chat_id, buyer, (m1,) = _room_with_messages(client, make_user, 1)
+    with SessionLocal() as db:
+        db.add(ChatRead(room_id=chat_id, user_id=buyer, last_read_message_id=None))
+        db.commit()
+        assert _mark_read(db, chat_id, buyer, m1) is True
+    assert _last_read(chat_id, buyer) == m1
+
+
+def test_mark_read_rejects_message_from_other_room(client, make_user):
+    chat_id, buyer, _ = _room_with_messages(client, make_user, 1)
+    _, _, (other,) = _room_with_messages(client, make_user, 1)
+    with SessionLocal() as db:
+        assert _mark_read(db, chat_id, buyer, other) is False
+    assert _last_read(chat_id, buyer) is None
@@ -0,0 +1,58 @@
+# tests/test_dedupe.py
+"""사진 중복 탐지: multi-index hash 반경 검색"""
+import random
+
+from app.services.dedupe import MultiIndexHash, hamming
+
+
+def _flip(h: int, bits) -> int:
+    for b in bits:
+        h ^= 1 << b
+    return h
+
+
+def test_spans_cover_all_bits():
+    idx = MultiIndexHash(radius=6)
+    covered = 0
+    for shift, mask in idx._spans:
+        assert covered & (mask << shift) == 0
+        covered |= mask << shift
+    assert covered == (1 << 64) - 1
+
+
+def test_search_radius_boundary():
+    idx = MultiIndexHash(radius=4)
+    base = 0x0123_4567_89AB_CDEF
+    idx.add(base, "a")
+    idx.add(_flip(base, [0, 17, 33, 63]), "b")  # 거리 4
+    idx.add(_flip(base, [1, 2, 30, 40, 50]), "c")  # 거리 5
+    assert sorted(idx.search(base)) == [(0, "a"), (4, "b")]
+
+
+def test_same_hash_multiple_values_and_discard():
+    idx = MultiIndexHash(radius=2)
+    h = 0xFFFF_0000_FFFF_0000
+    idx.add(h, 1)
+    idx.add(h, 2)
+    assert idx.size == 1
+    assert sorted(idx.search(h)) == [(0, 1), (0, 2)]
+
+    idx.discard(h, 1)
+    idx.discard(h, 99)
+    assert idx.search(h) == [(0, 2)]
+    idx.discard(h, 2)
+    assert idx.size == 0 and idx.search(h) == []
+    assert all(not table for table in idx._tables)
+
+
+def test_matches_brute_force():
+    rng = random.Random(7)
+    idx = MultiIndexHash(radius=8)
+    hashes = [rng.getrandbits(64) for _ in range(300)]
+    # 일부는 가까운 변형으로
+    hashes += [_flip(h, rng.sample(range(64), rng.randint(1, 10))) for h in hashes[:100]]
+    for i, h in enumerate(hashes):
+        idx.add(h, i)
+    for q in hashes[:50] + [rng.getrandbits(64) for _ in range(20)]:
+        expected = sorted((hamming(q, h), i) for i, h in enumerate(hashes) if hamming(q, h) <= 8)
+        assert sorted(idx.search(q)) == expected
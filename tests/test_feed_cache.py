@@ -0,0 +1,67 @@
+# tests/test_feed_cache.py
+"""카테고리 목록 캐시: DB 정렬 순서와 같은 페이지를 돌려주는지 + 생성/수정/삭제 반영"""
+from sqlalchemy import func, select
+
+from app.core.db import SessionLocal
+from app.models.posting import Posting
+from app.services.feed_cache import FeedCache
+
+CATEGORY = "뷰티"
+
+
+def _db_page(db, page, size, exclude_seller_id=None):
+    """list_postings 의 DB 경로와 같은 (total, id 목록)"""
+    where = [Posting.category == CATEGORY]
+    if exclude_seller_id is not None:
+        where.append(Posting.seller_id != exclude_seller_id)
+    total = db.execute(select(func.count()).select_from(Posting).where(*where)).scalar_one()
+    q = select(Posting.id).where(*where).order_by(Posting.like_count.desc(), Posting.id.desc())
+    return total, db.execute(q.offset((page - 1) * size).limit(size)).scalars().all()
+
+
+def _create(db, seller_id, likes):
+    p = Posting(seller_id=seller_id, title="립스틱", price=1000, content="x", category=CATEGORY, like_count=likes)
+    db.add(p)
+    db.commit()
+    return p
+
+
+def test_feed_cache_tracks_changes(client, make_user):
+    seller, _ = make_user()
+    other, _ = make_user()
+    cache = FeedCache(depth=6)
+    with SessionLocal() as db:
+        postings = [_create(db, seller if i % 2 else other, likes) for i, likes in enumerate([5, 1, 9, 3, 7, 2, 8])]
+        assert cache.page(db, CATEGORY, "likeCount", 1, 3) is None  # rebuild 전
+        cache.rebuild(db)
+
+        def check(page, size, exclude_seller_id=None):
+            got = cache.page(db, CATEGORY, "likeCount", page, size, exclude_seller_id)
+            assert got == _db_page(db, page, size, exclude_seller_id)
+
+        check(1, 3)
+        check(2, 3)
+        check(1, 3, exclude_seller_id=seller)
+        assert cache.stats()["loads"] == 1
+        # 캐시 깊이를 넘는 페이지는 DB 로
+        assert cache.page(db, CATEGORY, "likeCount", 3, 3) is None
+
+        # 새 글이 맨 앞으로
+        top = _create(db, other, 100)
+        cache.add(top)
+        check(1, 3)
+        # 찜 수가 줄어 리스트 밖으로 밀려난 글은 빠지고, 모자라면 다시 채움
+        top.like_count = 0
+        db.commit()
+        cache.update(top)
+        check(1, 3)
+        check(2, 3)
+        # 삭제
+        gone = postings[2]
+        gone_id, gone_seller = gone.id, gone.seller_id
+        db.delete(gone)
+        db.commit()
+        cache.remove(gone_id, CATEGORY, gone_seller)
+        check(1, 3)
+        check(2, 3)
+        check(1, 3, exclude_seller_id=other)
@@ -0,0 +1,32 @@
+# tests/test_fuzzy.py
+"""오타 허용 검색 (SQLite 메모리 trigram 색인): 카테고리/판매자 필터가 상위 N 자르기 전에 적용되는지"""
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.services.fuzzy import fuzzy_search, trigram_index
+
+
+def test_filters_apply_before_top_n(client, make_user, monkeypatch):
+    seller, seller_h = make_user()
+    other, other_h = make_user()
+    # 찾는 글은 유사도가 같고 먼저 만들어서 (id 내림차순) 뒤로 밀림
+    target = client.post(
+        "/api/postings",
+        json={"title": "닌텐도스위치라이트", "price": 1000, "content": "x", "category": "게임", "images": []},
+        headers=other_h,
+    ).json()["postingId"]
+    # 다른 카테고리/판매자 글이 상위 N 을 다 차지
+    for i in range(5):
+        r = client.post(
+            "/api/postings",
+            json={"title": "닌텐도스위치", "price": 1000, "content": "x", "category": "전자제품/가전제품", "images": []},
+            headers=seller_h,
+        )
+        assert r.status_code in (200, 201), r.text
+    assert trigram_index.enabled
+    monkeypatch.setattr(settings, "FUZZY_MAX_RESULTS", 3)
+
+    with SessionLocal() as db:
+        total, rows = fuzzy_search(db, "닌텐도스위츠", category="게임")
+        assert (total, [p.id for p in rows]) == (1, [target])
+        total, rows = fuzzy_search(db, "닌텐도스위츠", exclude_seller_id=seller)
+        assert target in [p.id for p in rows]
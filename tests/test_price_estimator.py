@@ -0,0 +1,50 @@
+# tests/test_price_estimator.py
+"""가격대 추정: 그룹별 분위수가 np.quantile 과 같은지 + 라벨/카테고리/전체 순서 조회"""
+import numpy as np
+
+from app.services.price_estimator import PriceEstimator, group_quantiles
+
+
+def test_group_quantiles_matches_np_quantile():
+    rng = np.random.default_rng(3)
+    keys = rng.choice(np.array(["게임", "의류/패션", "뷰티", "식료품"], dtype=object), size=500)
+    values = rng.integers(1_000, 500_000, size=500)
+    qs = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+    out = group_quantiles(keys, values, qs)
+    assert set(out) == set(keys.tolist())
+    for key, row in out.items():
+        group = values[keys == key]
+        expected = tuple(int(v) for v in np.rint(np.quantile(group, qs))) + (len(group),)
+        assert row == expected
+
+
+def test_group_quantiles_small_groups():
+    keys = np.array(["a", "b", "b", "c", "c", "c"], dtype=object)
+    values = np.array([10, 30, 10, 5, 1, 3])
+    assert group_quantiles(keys, values, (0.0, 0.5, 1.0)) == {
+        "a": (10, 10, 10, 1),
+        "b": (10, 20, 30, 2),
+        "c": (1, 3, 5, 3),
+    }
+    assert group_quantiles(keys[:0], values[:0], (0.5,)) == {}
+
+
+def test_lookup_falls_back_by_sample_count():
+    est = PriceEstimator(quantiles=(0.25, 0.75), min_samples=3)
+    est.set_labels(["Switch", "카메라"], {"카메라": "전자제품/가전제품"})
+    table = {
+        1: ("게임", "닌텐도 switch", 200_000),
+        2: ("게임", "switch 라이트", 150_000),
+        3: ("게임", "switch oled", 300_000),
+        4: ("게임", "ps5", 500_000),
+        5: ("전자제품/가전제품", "카메라", 400_000),
+        6: ("전자제품/가전제품", "모니터", 100_000),
+    }
+    est._ranges = est._compute(table)
+
+    assert est.lookup("switch") == (175_000, 250_000)
+    # 라벨 표본 부족(1개) → 라벨의 카테고리 표본 부족(2개) → 전체
+    low, high, n = est._ranges["all"]
+    assert n == 6 and est.lookup("카메라") == (round(low, -3), round(high, -3))
+    assert est.lookup(None, "게임") == (188_000, 350_000)
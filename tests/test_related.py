@@ -0,0 +1,48 @@
+# tests/test_related.py
+"""비슷한 상품: n-gram 사전 정리(id 재사용)와 이웃 캐시"""
+from app.services.related import RelatedIndex
+
+
+def _index(docs, delta_limit=1000):
+    idx = RelatedIndex(cache_size=100, delta_limit=delta_limit)
+    for pid, (category, title) in docs.items():
+        idx.upsert(pid, category, title, "")
+    for category in {c for c, _ in docs.values()}:
+        idx._build(category)
+    return idx
+
+
+def test_vocab_pruned_and_ids_reused():
+    idx = _index({1: ("게임", "닌텐도 스위치"), 2: ("게임", "스위치 라이트"), 3: ("뷰티", "립스틱")})
+    size = len(idx._vocab)
+
+    idx.remove(3)
+    idx._build("뷰티")
+    assert len(idx._vocab) < size
+    assert not any(g in idx._vocab for g in (" 립", "스틱"))
+    freed = set(idx._free)
+
+    # 새 n-gram 은 풀린 id 를 다시 씀 → 사전 크기는 게시물이 실제로 쓰는 n-gram 수만큼
+    idx.upsert(4, "뷰티", "향수", "")
+    idx._build("뷰티")
+    assert {idx._vocab[g] for g in (" 향", "향수", "수 ")} <= freed
+    assert len(idx._terms) == size
+    assert [pid for pid, _ in idx.related(1)] == [2]
+
+
+def test_short_result_served_from_cache(monkeypatch):
+    idx = _index({1: ("게임", "닌텐도 스위치"), 2: ("게임", "스위치 라이트"), 3: ("게임", "플스")})
+    first = idx.related(1, k=2)
+    assert [pid for pid, _ in first] == [2]
+
+    calls = []
+    real = idx._weights
+    monkeypatch.setattr(idx, "_weights", lambda *a, **kw: calls.append(1) or real(*a, **kw))
+    # 결과가 한도(k*2)보다 적으면 후보 전부 → 더 큰 k 도 캐시로 답함
+    assert idx.related(1, k=10) == first
+    assert calls == []
+
+    # 같은 카테고리가 바뀌면 다시 계산
+    idx.upsert(5, "게임", "스위치 oled", "")
+    assert {pid for pid, _ in idx.related(1, k=10)} == {2, 5}
+    assert calls
@@ -0,0 +1,88 @@
+# tests/test_saved_search_matcher.py
+"""저장 검색 매칭: Aho-Corasick 오토마톤 + rebuild 중에 들어온 추가/삭제 반영"""
+from app.models.saved_search import SavedSearch
+from app.services.saved_search_matcher import AhoCorasick, SavedSearchMatcher
+
+
+def _search(sid: int, user_id: int, keyword=None, category=None, max_price=None) -> SavedSearch:
+    return SavedSearch(id=sid, user_id=user_id, keyword=keyword, category=category, max_price=max_price)
+
+
+class _Rows:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return list(self._rows)
+
+
+class _SlowDB:
+    """rebuild 가 DB 를 읽는 도중에 on_read 를 실행 (다른 요청의 추가/삭제 흉내)"""
+
+    def __init__(self, rows, on_read):
+        self._rows = rows
+        self._on_read = on_read
+
+    def execute(self, _query):
+        self._on_read()
+        return _Rows(self._rows)
+
+
+def test_overlapping_patterns():
+    ac = AhoCorasick()
+    for w in ("he", "she", "his", "hers"):
+        ac.add(w)
+    assert ac.find("ushers") == {"he", "she", "hers"}
+    assert ac.find("ahishe") == {"his", "she", "he"}
+    assert ac.find("xyz") == set()
+
+
+def test_discard_then_match():
+    ac = AhoCorasick()
+    ac.add("아이폰")
+    ac.add("아이폰 프로")
+    ac.add("폰")
+    assert ac.find("아이폰 프로 팝니다") == {"아이폰", "아이폰 프로", "폰"}
+
+    ac.discard("아이폰")
+    ac.discard("없는 단어")
+    assert ac.find("아이폰 프로 팝니다") == {"아이폰 프로", "폰"}
+    # 노드는 남아 있으므로 다시 추가해도 바로 찾음
+    ac.add("아이폰")
+    assert ac.find("아이폰") == {"아이폰", "폰"}
+
+
+def test_match_filters():
+    m = SavedSearchMatcher()
+    m.add(_search(1, 10, keyword="Switch"))
+    m.add(_search(2, 11, keyword="switch", category="게임", max_price=5000))
+    m.add(_search(3, 12, category="게임"))
+    m.add(_search(4, 13, keyword="switch"))
+
+    out = m.match("닌텐도 SWITCH", "x", "게임", 10000, seller_id=13)
+    assert out == {10: [1], 12: [3]}
+
+    m.remove(1)
+    assert m.match("switch", "", "게임", 1000, seller_id=0) == {11: [2], 12: [3], 13: [4]}
+
+
+def test_rebuild_keeps_changes_made_while_reading():
+    m = SavedSearchMatcher()
+    m.add(_search(1, 10, keyword="old"))
+    m.add(_search(2, 11, keyword="gone"))
+
+    def concurrent():
+        # DB 스냅샷에는 없는 검색 추가 + 스냅샷에 있는 검색 삭제
+        m.add(_search(4, 13, keyword="late"))
+        m.remove(2)
+
+    db_rows = [_search(1, 10, keyword="old"), _search(2, 11, keyword="gone"), _search(3, 12, keyword="fresh")]
+    assert m.rebuild(_SlowDB(db_rows, concurrent)) == 3
+
+    assert m.match("old fresh late gone", "", "게임", 0, seller_id=0) == {10: [1], 12: [3], 13: [4]}
+    assert m.stats()["searches"] == 3
+    # rebuild 가 끝난 뒤에는 더 모으지 않음
+    assert m._pending is None
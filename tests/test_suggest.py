@@ -0,0 +1,51 @@
+# tests/test_suggest.py
+"""자동완성: 자모 분해와 trie 노드 한도"""
+from app.services.suggest import SuggestTrie, decompose
+
+
+def test_decompose_splits_compound_vowels_and_finals():
+    assert decompose("가") == "ㄱㅏ"
+    assert decompose("괜") == "ㄱㅗㅐㄴ"
+    assert decompose("닭") == "ㄷㅏㄹㄱ"
+    assert decompose("의자") == "ㅇㅡㅣㅈㅏ"
+    # 한글 음절이 아닌 문자는 그대로, 낱자 겹모음은 풀어서
+    assert decompose("ps5 ㅘ") == "ps5 ㅗㅏ"
+
+
+def _trie(words, top_k=3, max_nodes=10_000):
+    trie = SuggestTrie(top_k)
+    for i, w in enumerate(words):
+        assert trie.insert((w, "term", 100 - i), [w], max_nodes)
+    return trie
+
+
+def test_lookup_mid_syllable_prefix():
+    trie = _trie(["아이폰", "아이패드", "괜찮은"])
+    texts = lambda q: [t for t, _, _ in trie.lookup(q)]  # noqa: E731
+    # 글자를 치는 도중 상태 ("아이ㅍ", "아이포", 다음 글자 초성이 아직 받침으로 붙어 있는 "아잎")
+    assert texts("아이ㅍ") == ["아이폰", "아이패드"]
+    assert texts("아이포") == ["아이폰"]
+    assert texts("아잎") == ["아이폰", "아이패드"]
+    assert texts("고ㅐ") == ["괜찮은"]
+    assert texts("괜찬") == ["괜찮은"]
+    assert texts("없음") == []
+
+
+def test_top_k_keeps_insertion_order():
+    trie = _trie(["가방", "가구", "가위", "가습기"], top_k=2)
+    assert [t for t, _, _ in trie.lookup("가")] == ["가방", "가구"]
+    assert [t for t, _, _ in trie.lookup("가ㅇ")] == ["가위"]
+
+
+def test_node_budget():
+    trie = SuggestTrie(3)
+    # "ab" → 노드 2개 + 루트
+    assert trie.insert(("ab", "term", 3), ["ab"], max_nodes=3)
+    assert trie.nodes == 3
+    # "abc" 는 노드 1개만 더 필요 → 한도 초과라 안 넣음, trie 는 그대로
+    assert not trie.insert(("abc", "term", 2), ["abc"], max_nodes=3)
+    assert trie.nodes == 3 and len(trie.items) == 1
+    assert [t for t, _, _ in trie.lookup("a")] == ["ab"]
+    # 기존 경로만 쓰는 항목은 한도 안에서 들어감
+    assert trie.insert(("a", "term", 1), ["a"], max_nodes=3)
+    assert [t for t, _, _ in trie.lookup("a")] == ["ab", "a"]